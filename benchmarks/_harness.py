@@ -0,0 +1,35 @@
+import timeit
+from typing import Callable, Dict
+
+from tornado.httputil import HTTPServerRequest
+
+
+def result(name: str, value: float, unit: str) -> Dict[str, object]:
+    """
+    A single benchmark result. Lower values are better for every unit used in the suite.
+    """
+    return {"name": name, "value": value, "unit": unit}
+
+
+def ns_per_call(fn: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Best time of `repeat` runs, each calling fn for at least 0.2 seconds
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+class _Connection:
+    def set_close_callback(self, callback):
+        pass
+
+
+def make_handler(app, handler_class, uri: str, method: str = "GET", body: bytes = b""):
+    """
+    Instantiates a handler for a request that is not tied to a socket
+    """
+    request = HTTPServerRequest(
+        method=method, uri=uri, body=body, connection=_Connection()
+    )
+    return handler_class(app, request)
@@ -0,0 +1,161 @@
+"""
+The annotated request path: param parsing, JSON body validation, response serialization,
+and full requests over loopback compared with a plain `tornado.web.RequestHandler`
+"""
+
+import json
+import time
+from typing import List, Optional
+
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+from tornado.testing import bind_unused_port
+from tornado.web import RequestHandler, url
+
+from torn_open import AnnotatedHandler, Application, RequestModel, ResponseModel
+
+from benchmarks._harness import make_handler, ns_per_call, result
+
+
+class ItemRequest(RequestModel):
+    name: str
+    price: float
+    tags: List[str]
+
+
+class ItemResponse(ResponseModel):
+    item_id: int
+    name: str
+    price: float
+    tags: List[str]
+    page: int
+
+
+class ItemHandler(AnnotatedHandler):
+    async def get(self, item_id: int, page: Optional[int] = 1) -> ItemResponse:
+        return ItemResponse(
+            item_id=item_id, name="item", price=1.5, tags=["a"], page=page
+        )
+
+    async def post(self, item_id: int, item: ItemRequest) -> ItemResponse:
+        return ItemResponse(item_id=item_id, page=1, **item.dict())
+
+
+class PlainItemHandler(RequestHandler):
+    async def get(self, item_id: str):
+        page = int(self.get_query_argument("page", "1"))
+        self.set_header("Content-Type", "application/json")
+        self.write(
+            json.dumps(
+                {
+                    "item_id": int(item_id),
+                    "name": "item",
+                    "price": 1.5,
+                    "tags": ["a"],
+                    "page": page,
+                }
+            )
+        )
+
+    async def post(self, item_id: str):
+        item = json.loads(self.request.body)
+        self.set_header("Content-Type", "application/json")
+        self.write(json.dumps({"item_id": int(item_id), "page": 1, **item}))
+
+
+ITEM_BODY = json.dumps({"name": "item", "price": 1.5, "tags": ["a", "b"]}).encode()
+
+
+def make_app():
+    return Application(
+        [
+            url(r"/items/(?P<item_id>[^/]+)", ItemHandler),
+            url(r"/plain/items/(?P<item_id>[^/]+)", PlainItemHandler),
+        ],
+        api_spec_build="lazy",
+    )
+
+
+def run_in_process(app, repeat: int):
+    params_parsers = ItemHandler.handler_class_params.params_parsers
+    get_handler = make_handler(app, ItemHandler, "/items/1?page=2")
+    post_handler = make_handler(
+        app, ItemHandler, "/items/1", method="POST", body=ITEM_BODY
+    )
+    path_kwargs = {"item_id": "1"}
+    response = ItemResponse(item_id=1, name="item", price=1.5, tags=["a"], page=2)
+
+    return [
+        result(
+            "handler.collect_params.path_and_query",
+            ns_per_call(
+                lambda: params_parsers["get"]._collect_params(get_handler, path_kwargs),
+                repeat,
+            ),
+            "ns/op",
+        ),
+        result(
+            "handler.collect_params.json_body",
+            ns_per_call(
+                lambda: params_parsers["post"]._collect_params(
+                    post_handler, path_kwargs
+                ),
+                repeat,
+            ),
+            "ns/op",
+        ),
+        result(
+            "handler.encode_response",
+            ns_per_call(lambda: get_handler._encode_response("get", response), repeat),
+            "ns/op",
+        ),
+    ]
+
+
+async def _fetch_many(client, request_url: str, requests: int, **kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.fetch(request_url, **kwargs)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def run_loopback(app, requests: int):
+    sock, port = bind_unused_port()
+    server = HTTPServer(app)
+    server.add_sockets([sock])
+    base_url = f"http://127.0.0.1:{port}"
+    cases = [
+        ("annotated_get", f"{base_url}/items/1?page=2", {}),
+        ("plain_get", f"{base_url}/plain/items/1?page=2", {}),
+        (
+            "annotated_post",
+            f"{base_url}/items/1",
+            {"method": "POST", "body": ITEM_BODY},
+        ),
+        (
+            "plain_post",
+            f"{base_url}/plain/items/1",
+            {"method": "POST", "body": ITEM_BODY},
+        ),
+    ]
+
+    async def measure():
+        client = AsyncHTTPClient()
+        results = []
+        for name, request_url, kwargs in cases:
+            # Warm up connections and caches
+            await _fetch_many(client, request_url, 10, **kwargs)
+            us_per_request = await _fetch_many(client, request_url, requests, **kwargs)
+            results.append(result(f"loopback.{name}", us_per_request, "us/request"))
+        return results
+
+    try:
+        return IOLoop.current().run_sync(measure)
+    finally:
+        server.stop()
+
+
+def run(repeat: int = 5, requests: int = 500):
+    app = make_app()
+    return run_in_process(app, repeat) + run_loopback(app, requests)
@@ -0,0 +1,72 @@
+"""
+Routing of requests among 1000 rules, trying every rule in order compared with `trie_routing`
+"""
+
+from tornado.httputil import HTTPServerRequest
+from tornado.web import RequestHandler, url
+
+from torn_open import Application
+
+from benchmarks._harness import _Connection, ns_per_call, result
+
+ROUTES = 1000
+
+
+class RouteHandler(RequestHandler):
+    def get(self, **kwargs):
+        pass
+
+
+def rules(routes: int):
+    rules = []
+    for i in range(routes):
+        shape = i % 4
+        if shape == 0:
+            rules.append(url(rf"/api/v1/resource{i}", RouteHandler))
+        elif shape == 1:
+            rules.append(url(rf"/api/v1/resource{i}/(?P<item_id>[0-9]+)", RouteHandler))
+        elif shape == 2:
+            rules.append(
+                url(rf"/api/v2/resource{i}/(?P<name>[^/]+)/items", RouteHandler)
+            )
+        else:
+            rules.append(url(rf"/files{i}/(?P<path>.*)", RouteHandler))
+    return rules
+
+
+def paths(routes: int):
+    middle = routes // 2 - routes // 2 % 4
+    last = routes - 4
+    return [
+        ("first", "/api/v1/resource0"),
+        ("middle", f"/api/v1/resource{middle}"),
+        ("last", f"/api/v1/resource{last}"),
+        ("last_path_param", f"/api/v1/resource{last + 1}/42"),
+        ("not_found", "/missing"),
+    ]
+
+
+def app(routes: int, trie_routing: bool) -> Application:
+    return Application(
+        rules(routes),
+        api_spec_build="lazy",
+        trie_routing=trie_routing,
+    )
+
+
+def run(repeat: int = 5, routes: int = ROUTES):
+    results = []
+    for router, trie_routing in (("linear", False), ("trie", True)):
+        router_app = app(routes, trie_routing)
+        for name, path in paths(routes):
+            request = HTTPServerRequest(
+                method="GET", uri=path, connection=_Connection()
+            )
+            results.append(
+                result(
+                    f"routing.{router}.{routes}.{name}",
+                    ns_per_call(lambda: router_app.find_handler(request), repeat),
+                    "ns/op",
+                )
+            )
+    return results
@@ -0,0 +1,84 @@
+"""
+Spec generation time and memory for synthetic apps
+"""
+
+import time
+import tracemalloc
+from typing import List, Optional
+
+from tornado.web import url
+
+from torn_open import AnnotatedHandler, ClientError, RequestModel, ResponseModel
+from torn_open.api_spec import build_api_spec, register_handlers
+from torn_open.api_spec.core import PARAMETER_SCHEMAS
+from torn_open.api_spec import exception_finder
+
+from benchmarks._harness import result
+
+SIZES = (10, 100, 1000)
+
+
+class SyntheticRequest(RequestModel):
+    name: str
+    values: List[int]
+
+
+class SyntheticResponse(ResponseModel):
+    name: str
+    values: List[int]
+    page: int
+
+
+class SyntheticMethods:
+    async def get(
+        self, item_id: int, page: Optional[int] = 1, tags: List[str] = None
+    ) -> SyntheticResponse:
+        raise ClientError(status_code=404, error_type="not_found")
+
+    async def post(self, item_id: int, body: SyntheticRequest) -> SyntheticResponse:
+        raise ClientError(status_code=400, error_type="invalid")
+
+
+def make_rules(size: int):
+    rules = []
+    for i in range(size):
+        handler = type(
+            f"SyntheticHandler{i}",
+            (AnnotatedHandler,),
+            {
+                "get": SyntheticMethods.get,
+                "post": SyntheticMethods.post,
+                "__module__": __name__,
+            },
+        )
+        rules.append(url(rf"/items{i}/(?P<item_id>[^/]+)", handler))
+    return rules
+
+
+def _clear_caches():
+    PARAMETER_SCHEMAS.clear()
+    exception_finder._module_indexes.clear()
+
+
+def build(size: int):
+    return build_api_spec(register_handlers(make_rules(size))).to_dict()
+
+
+def run(sizes=SIZES):
+    results = []
+    for size in sizes:
+        _clear_caches()
+        start = time.perf_counter()
+        build(size)
+        elapsed = time.perf_counter() - start
+        results.append(result(f"spec.build.{size}_handlers", elapsed * 1000, "ms"))
+
+        _clear_caches()
+        tracemalloc.start()
+        build(size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(
+            result(f"spec.build_peak_memory.{size}_handlers", peak / 1024, "KiB")
+        )
+    return results
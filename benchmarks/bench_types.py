@@ -0,0 +1,44 @@
+"""
+`types.cast` per annotation kind
+"""
+
+from enum import Enum
+from typing import List, Optional, Tuple
+
+from torn_open import types
+
+from benchmarks._harness import ns_per_call, result
+
+
+class Colour(Enum):
+    red = "red"
+    blue = "blue"
+
+
+NUMBERS = ",".join(str(i) for i in range(100))
+
+CASES = [
+    ("int", int, "42"),
+    ("float", float, "4.2"),
+    ("bool", bool, "true"),
+    ("str", str, "value"),
+    ("optional_int", Optional[int], "42"),
+    ("enum", Colour, "red"),
+    ("list_str_100", List[str], NUMBERS),
+    ("list_int_100", List[int], NUMBERS),
+    ("list_enum", List[Colour], "red,blue,red"),
+    ("tuple_int_str", Tuple[int, str], "1,a"),
+    ("tuple_int_ellipsis_100", Tuple[int, ...], NUMBERS),
+    ("int_array_100", types.IntArray, NUMBERS),
+]
+
+
+def run(repeat: int = 5):
+    return [
+        result(
+            f"types.cast.{name}",
+            ns_per_call(lambda: types.cast(annotation, value), repeat),
+            "ns/op",
+        )
+        for name, annotation, value in CASES
+    ]
@@ -0,0 +1,69 @@
+"""
+Measures the time to import torn_open in a fresh interpreter, and checks that the spec generation
+stack is not imported.
+
+    python -m benchmarks.import_time --runs 20
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List
+
+from benchmarks._harness import result
+
+# Modules that should only be imported when a spec is built or served
+SPEC_MODULES = (
+    "apispec",
+    "yaml",
+    "torn_open.api_spec.builder",
+    "torn_open.api_spec.core",
+    "torn_open.api_spec.plugin",
+    "torn_open.api_spec.exception_finder",
+    "torn_open.api_spec.spec_cache",
+)
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import torn_open
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_import() -> dict:
+    return json.loads(subprocess.check_output([sys.executable, "-c", SCRIPT]))
+
+
+def spec_modules_imported(modules: List[str]) -> List[str]:
+    return sorted(
+        module
+        for module in modules
+        if any(
+            module == spec_module or module.startswith(f"{spec_module}.")
+            for spec_module in SPEC_MODULES
+        )
+    )
+
+
+def run(runs: int = 10):
+    measurements = [measure_import() for _ in range(runs)]
+    imported = spec_modules_imported(measurements[0]["modules"])
+    if imported:
+        raise AssertionError(f"spec modules imported with torn_open: {imported}")
+    seconds = statistics.median(m["seconds"] for m in measurements)
+    return [result("import.torn_open", seconds * 1000, "ms")]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
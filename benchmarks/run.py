@@ -0,0 +1,114 @@
+"""
+Runs the benchmark suite and writes the results as JSON.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare baseline.json --threshold 0.1
+
+With `--compare`, results are compared with a stored baseline, and the command exits with
+an error if any result is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from typing import Dict, List
+
+import pydantic
+import tornado
+
+import torn_open
+from benchmarks import (
+    bench_handlers,
+    bench_routing,
+    bench_spec,
+    bench_types,
+    import_time,
+)
+
+SUITES = {
+    "types": lambda quick: bench_types.run(repeat=3 if quick else 5),
+    "handlers": lambda quick: bench_handlers.run(
+        repeat=3 if quick else 5, requests=100 if quick else 500
+    ),
+    "spec": lambda quick: bench_spec.run(
+        sizes=bench_spec.SIZES[:2] if quick else bench_spec.SIZES
+    ),
+    "routing": lambda quick: bench_routing.run(repeat=3 if quick else 5),
+    "import": lambda quick: import_time.run(runs=3 if quick else 10),
+}
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "torn_open": torn_open.__version__,
+        "tornado": tornado.version,
+        "pydantic": pydantic.VERSION,
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[dict]:
+    """
+    Returns the results that are slower than the baseline by more than the threshold
+    """
+    baseline_values = {item["name"]: item for item in baseline}
+    regressions = []
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>8}")
+    for item in results:
+        base = baseline_values.get(item["name"])
+        if base is None or base["unit"] != item["unit"] or not base["value"]:
+            print(f"{item['name']:<48} {'-':>12} {item['value']:>12.1f}")
+            continue
+        change = item["value"] / base["value"] - 1
+        flag = " !" if change > threshold else ""
+        print(
+            f"{item['name']:<48} {base['value']:>12.1f} {item['value']:>12.1f}"
+            f" {change:>+8.1%}{flag}"
+        )
+        if change > threshold:
+            regressions.append(item)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        help="Suites to run, all suites by default",
+    )
+    parser.add_argument("--output", help="File the results are written to")
+    parser.add_argument("--compare", help="Baseline results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Fewer repeats and smaller apps"
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for suite in args.suite or SUITES:
+        results += SUITES[suite](args.quick)
+    report = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline["results"], args.threshold):
+            sys.exit(1)
+    elif not args.output:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -147,3 +147,13 @@ def test_error_response_model_with_path_param(
 
 def test_example_app_schema(app):
     pass
+
+
+def test_error_response_schema_lists_errors(paths):
+    responses = paths["/responses/404"]["post"]["responses"]
+    schema = responses["400"]["content"]["application/json"]["schema"]
+
+    errors = schema["properties"]["errors"]
+    assert errors["type"] == "array"
+    assert errors["items"]["required"] == ["loc", "type"]
+    assert set(errors["items"]["properties"]) == {"loc", "type", "msg", "value"}
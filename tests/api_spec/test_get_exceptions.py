@@ -1,7 +1,10 @@
 from functools import wraps
+from textwrap import dedent
+import os
 
 from torn_open.models import ClientError
-from torn_open.api_spec.exception_finder import get_exceptions
+from torn_open.api_spec.exception_finder import get_exceptions, _index_module
+from torn_open.api_spec.spec_cache import SpecCache
 
 
 def func_without_exceptions():
@@ -93,3 +96,44 @@ def test_find_doubly_decorated_func_exception():
     assert exception is ClientError
     assert args == []
     assert kwargs == {"status_code": 404, "error_type": "not_found"}
+
+
+def test_index_module():
+    source = dedent("""
+        @decorator
+        def func():
+            raise ClientError(status_code=404, error_type="not_found")
+
+        async def async_func():
+            raise ValueError
+        """)
+    index = _index_module(source)
+    assert index == {
+        "2": [["ClientError", [], {"status_code": 404, "error_type": "not_found"}]],
+        "6": [["ValueError", [], {}]],
+    }
+
+
+def test_get_exceptions_with_spec_cache(tmp_path):
+    spec_cache = SpecCache(str(tmp_path))
+    exceptions = [*get_exceptions(func_with_exception, spec_cache)]
+    assert len(exceptions) == 1
+    spec_cache.save()
+
+    spec_cache = SpecCache(str(tmp_path))
+    assert spec_cache.get(os.path.abspath(__file__), "raises") is not None
+    exceptions = [*get_exceptions(func_with_exception, spec_cache)]
+    exception, args, kwargs = exceptions[0]
+    assert exception is ClientError
+    assert kwargs == {"status_code": 404, "error_type": "not_found"}
+
+
+def test_index_module_ignores_constants_that_are_not_json():
+    source = dedent("""
+        def func():
+            raise ValueError(b"boom", 1j, ..., "message", code=b"code")
+        """)
+    index = _index_module(source)
+    assert index == {
+        "2": [["ValueError", [None, None, None, "message"], {"code": None}]]
+    }
@@ -1,3 +1,4 @@
+import gzip
 import json
 from enum import Enum
 from typing import Optional
@@ -71,3 +72,90 @@ async def test_retrieve_spec(http_client, base_url, spec):
 
     assert retrieved_spec.code == 200
     assert json.loads(retrieved_spec.body) == spec
+
+
+@pytest.mark.gen_test
+async def test_spec_etag(http_client, base_url):
+    retrieved_spec = await http_client.fetch(f"{base_url}/openapi.json")
+    etag = retrieved_spec.headers["Etag"]
+    assert retrieved_spec.headers["Cache-Control"] == "public, max-age=86400"
+
+    not_modified = await http_client.fetch(
+        f"{base_url}/openapi.json",
+        headers={"If-None-Match": etag},
+        raise_error=False,
+    )
+    assert not_modified.code == 304
+    assert not not_modified.body
+
+
+@pytest.mark.gen_test
+async def test_spec_gzip(http_client, base_url, spec):
+    uncompressed = await http_client.fetch(
+        f"{base_url}/openapi.json", decompress_response=False
+    )
+    compressed = await http_client.fetch(
+        f"{base_url}/openapi.json",
+        headers={"Accept-Encoding": "gzip"},
+        decompress_response=False,
+    )
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in uncompressed.headers
+    assert gzip.decompress(compressed.body) == uncompressed.body
+    assert json.loads(uncompressed.body) == spec
+
+
+@pytest.mark.gen_test
+async def test_spec_etag_per_encoding(http_client, base_url):
+    uncompressed = await http_client.fetch(
+        f"{base_url}/openapi.json", decompress_response=False
+    )
+    compressed = await http_client.fetch(
+        f"{base_url}/openapi.json",
+        headers={"Accept-Encoding": "gzip"},
+        decompress_response=False,
+    )
+    assert compressed.headers["Etag"] != uncompressed.headers["Etag"]
+
+    # The ETag of the gzipped spec does not validate the uncompressed spec
+    response = await http_client.fetch(
+        f"{base_url}/openapi.json",
+        headers={"If-None-Match": compressed.headers["Etag"]},
+        decompress_response=False,
+    )
+    assert response.code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, is_gzipped",
+    [
+        ("gzip;q=0", False),
+        ("gzip; q=0.0, identity", False),
+        ("deflate, gzip;q=0.5", True),
+        ("*", True),
+        ("*;q=0", False),
+        ("identity", False),
+    ],
+)
+@pytest.mark.gen_test
+async def test_spec_gzip_quality_values(
+    http_client, base_url, accept_encoding, is_gzipped
+):
+    response = await http_client.fetch(
+        f"{base_url}/openapi.json",
+        headers={"Accept-Encoding": accept_encoding},
+        decompress_response=False,
+    )
+
+    assert ("Content-Encoding" in response.headers) == is_gzipped
+
+
+@pytest.mark.gen_test
+async def test_retrieve_yaml_spec(http_client, base_url, app):
+    pytest.importorskip("yaml")
+    retrieved_spec = await http_client.fetch(f"{base_url}/openapi.yaml")
+
+    assert retrieved_spec.headers["Content-Type"].startswith("application/yaml")
+    assert retrieved_spec.body.decode() == app.api_spec.to_yaml()
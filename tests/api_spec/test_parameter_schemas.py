@@ -0,0 +1,65 @@
+from enum import Enum
+from typing import List, Optional
+
+import pytest
+from tornado.web import url
+
+from torn_open import Application, AnnotatedHandler
+from torn_open.api_spec import plugin
+from torn_open.api_spec.core import PARAMETER_SCHEMAS
+
+
+class Direction(Enum):
+    up = "up"
+    down = "down"
+
+
+@pytest.fixture
+def create_model_calls(monkeypatch):
+    PARAMETER_SCHEMAS.clear()
+    calls = []
+
+    def create_model(*args, **fields):
+        calls.append(sorted(fields))
+        return original(*args, **fields)
+
+    original = plugin.create_model
+    monkeypatch.setattr(plugin, "create_model", create_model)
+    return calls
+
+
+def make_app():
+    class FirstHandler(AnnotatedHandler):
+        def get(
+            self,
+            page: Optional[int] = 1,
+            direction: Direction = Direction.up,
+            ids: List[int] = None,
+        ):
+            pass
+
+    class SecondHandler(AnnotatedHandler):
+        def get(self, offset: Optional[int] = 1, direction: Direction = Direction.up):
+            pass
+
+    return Application([url(r"/first", FirstHandler), url(r"/second", SecondHandler)])
+
+
+def test_parameters_of_an_operation_are_built_together(create_model_calls):
+    make_app()
+    assert create_model_calls == [["p0", "p1", "p2"]]
+
+
+def test_parameter_schemas_are_memoized(create_model_calls):
+    first = make_app().api_spec.to_dict()
+    second = make_app().api_spec.to_dict()
+    assert len(create_model_calls) == 1
+    assert first == second
+
+
+def test_parameter_schema_titles(create_model_calls):
+    spec = make_app().api_spec.to_dict()
+    parameters = spec["paths"]["/second"]["get"]["parameters"]
+    assert parameters[0]["schema"]["title"] == "Offset"
+    assert parameters[0]["schema"]["default"] == 1
+    assert "Direction" in spec["components"]["schemas"]
@@ -0,0 +1,84 @@
+import os
+from enum import Enum
+
+from tornado.web import url
+
+from torn_open import Application, AnnotatedHandler, models
+from torn_open.api_spec.spec_cache import SpecCache, model_source_files
+from torn_open.models import ClientError, RequestModel, ResponseModel
+
+
+class Colour(Enum):
+    red = "red"
+    blue = "blue"
+
+
+class PaintRequest(RequestModel):
+    colour: Colour
+
+
+class PaintResponse(ResponseModel):
+    colour: Colour
+
+
+class PaintHandler(AnnotatedHandler):
+    def post(self, paint: PaintRequest) -> PaintResponse:
+        raise ClientError(status_code=404, error_type="not_found")
+
+
+def make_app(cache_dir):
+    return Application([url(r"/paint", PaintHandler)], api_spec_cache_dir=cache_dir)
+
+
+def test_model_source_files():
+    assert model_source_files(PaintResponse) == {
+        os.path.abspath(__file__),
+        os.path.abspath(models.__file__),
+    }
+
+
+def test_model_schema_is_cached(tmp_path):
+    spec_cache = SpecCache(str(tmp_path))
+    schema = spec_cache.model_schema(PaintResponse, PaintResponse.schema)
+    spec_cache.save()
+
+    def fail():
+        raise AssertionError("schema should be read from the cache")
+
+    spec_cache = SpecCache(str(tmp_path))
+    assert spec_cache.model_schema(PaintResponse, fail) == schema
+
+
+def test_model_schema_is_rebuilt_when_version_changes(tmp_path, monkeypatch):
+    spec_cache = SpecCache(str(tmp_path))
+    spec_cache.model_schema(PaintResponse, PaintResponse.schema)
+    spec_cache.save()
+
+    monkeypatch.setattr("torn_open.api_spec.spec_cache.CACHE_VERSION", "other")
+    calls = []
+
+    def build_schema():
+        calls.append(1)
+        return PaintResponse.schema()
+
+    SpecCache(str(tmp_path)).model_schema(PaintResponse, build_schema)
+    assert calls == [1]
+
+
+def test_spec_is_identical_with_cache(tmp_path):
+    expected = Application([url(r"/paint", PaintHandler)]).api_spec.to_dict()
+
+    cold = make_app(str(tmp_path)).api_spec.to_dict()
+    assert os.listdir(tmp_path)
+    warm = make_app(str(tmp_path)).api_spec.to_dict()
+
+    assert cold == expected
+    assert warm == expected
+    assert "404" in warm["paths"]["/paint"]["post"]["responses"]
+
+
+def test_failed_save_does_not_raise(tmp_path):
+    spec_cache = SpecCache(str(tmp_path))
+    spec_cache.set(os.path.abspath(__file__), "raises", {"1": [b"not json"]})
+    spec_cache.save()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,113 @@
+import pytest
+
+from torn_open.concurrency import AdaptiveConcurrencyLimit, ConcurrencyLimit
+from torn_open.simulation import simulate
+
+
+def run(concurrency_limit, latencies):
+    for latency in latencies:
+        assert concurrency_limit.try_acquire()
+        concurrency_limit.release(latency)
+
+
+def test_limit_grows_while_in_use_and_fast():
+    concurrency_limit = AdaptiveConcurrencyLimit(latency_target=0.1, initial_limit=4)
+    # Keep the limit in use
+    for _ in range(3):
+        concurrency_limit.try_acquire()
+
+    run(concurrency_limit, [0.01] * 20)
+
+    assert concurrency_limit.limit > 4
+
+
+def test_limit_does_not_grow_while_idle():
+    concurrency_limit = AdaptiveConcurrencyLimit(latency_target=0.1, initial_limit=4)
+
+    run(concurrency_limit, [0.01] * 20)
+
+    assert concurrency_limit.limit == 4
+
+
+def test_limit_backs_off_once_per_window_of_slow_executions():
+    concurrency_limit = AdaptiveConcurrencyLimit(
+        latency_target=0.1, initial_limit=10, backoff=0.5
+    )
+    for _ in range(5):
+        concurrency_limit.try_acquire()
+
+    # The executions in flight when the limit decreased do not decrease it again
+    for _ in range(5):
+        concurrency_limit.release(1.0)
+    assert concurrency_limit.limit == 5
+
+    run(concurrency_limit, [1.0])
+    assert concurrency_limit.limit == 2
+
+
+def test_limit_stays_within_bounds():
+    concurrency_limit = AdaptiveConcurrencyLimit(
+        latency_target=0.1, initial_limit=2, min_limit=2, max_limit=3
+    )
+    run(concurrency_limit, [1.0] * 10)
+    assert concurrency_limit.limit == 2
+
+    concurrency_limit.try_acquire()
+    run(concurrency_limit, [0.01] * 50)
+    assert concurrency_limit.limit == 3
+
+
+def test_invalid_adaptive_limit():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimit(latency_target=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimit(latency_target=0.1, initial_limit=5, max_limit=4)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimit(latency_target=0.1, backoff=1)
+
+
+SIMULATION = dict(arrival_rate=600, capacity=20, service_time=0.05, duration=30)
+
+
+def test_simulation_is_deterministic():
+    results = [
+        simulate(AdaptiveConcurrencyLimit(latency_target=0.075), **SIMULATION)
+        for _ in range(2)
+    ]
+
+    assert results[0].summary() == results[1].summary()
+    assert results[0].limits == results[1].limits
+
+
+def test_adaptive_limit_keeps_latency_near_target_under_overload():
+    unlimited = simulate(ConcurrencyLimit(10000), **SIMULATION)
+    adaptive = simulate(AdaptiveConcurrencyLimit(latency_target=0.075), **SIMULATION)
+
+    assert unlimited.latency(0.99) > 1
+    assert adaptive.latency(0.99) < 0.1
+    # Throughput stays close to the capacity of 400 requests per second
+    assert adaptive.throughput > 350
+
+
+def test_adaptive_limit_follows_capacity():
+    concurrency_limit = AdaptiveConcurrencyLimit(latency_target=0.075)
+    result = simulate(
+        concurrency_limit,
+        arrival_rate=300,
+        capacity=lambda now: 20 if now < 15 else 5,
+        service_time=0.05,
+        duration=30,
+    )
+
+    limit_before_drop = max(limit for time, limit in result.limits if time < 15)
+    assert limit_before_drop >= 15
+    assert concurrency_limit.limit <= 10
+    assert concurrency_limit.rejected == result.rejected > 0
+
+
+def test_simulation_with_queue():
+    concurrency_limit = ConcurrencyLimit(20, max_queue=10, max_wait=0.1)
+    result = simulate(concurrency_limit, **SIMULATION)
+
+    assert result.latency(0.99) <= 0.1 + 0.05
+    assert result.completed + result.rejected > 0
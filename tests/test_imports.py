@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+SCRIPT = """
+import json, sys
+import torn_open
+from torn_open import Application, AnnotatedHandler
+app = Application([("/", AnnotatedHandler)], api_spec_build="lazy")
+print(json.dumps(sorted(sys.modules)))
+"""
+
+SPEC_MODULES = (
+    "apispec",
+    "yaml",
+    "torn_open.api_spec.builder",
+    "torn_open.api_spec.plugin",
+    "torn_open.api_spec.exception_finder",
+)
+
+
+def test_spec_generation_is_not_imported_with_torn_open():
+    modules = json.loads(subprocess.check_output([sys.executable, "-c", SCRIPT]))
+
+    imported = [
+        module for module in modules if module.split(".")[0] in ("apispec", "yaml")
+    ]
+    imported += [module for module in SPEC_MODULES if module in modules]
+    assert imported == []
+
+
+def test_spec_builder_is_imported_on_first_use():
+    import torn_open.api_spec
+
+    assert callable(torn_open.api_spec.create_api_spec)
+    assert callable(torn_open.api_spec.build_api_spec)
@@ -0,0 +1,67 @@
+from enum import Enum
+from typing import List, Optional, Tuple
+
+import pytest
+
+from torn_open import types
+
+
+class Color(Enum):
+    red = 1
+    blue = 2
+
+
+@pytest.mark.parametrize(
+    "parameter_type, val, expected",
+    [
+        (int, "1", 1),
+        (Optional[float], "1.5", 1.5),
+        (bool, "on", True),
+        (Color, "red", Color.red),
+        (Optional[Color], "blue", Color.blue),
+        (List[int], "1,2,3", [1, 2, 3]),
+        (List[Color], "red,blue", [Color.red, Color.blue]),
+        (list, "a,b", ["a", "b"]),
+        (Tuple[int, ...], "1,2", (1, 2)),
+        (Tuple[int, str], "1,a", (1, "a")),
+        (tuple, "a,b", ("a", "b")),
+    ],
+)
+def test_cast(parameter_type, val, expected):
+    assert types.cast(parameter_type, val) == expected
+
+
+@pytest.mark.parametrize(
+    "parameter_type, val, error_type",
+    [
+        (int, "x", "invalid_value"),
+        (List[int], "1,x", "invalid_value"),
+        (Color, "green", "invalid_enum"),
+        (Tuple[int, int], "1,2,3", "invalid_tuple_length"),
+    ],
+)
+def test_cast_invalid_value(parameter_type, val, error_type):
+    with pytest.raises(types.ValidationError) as e:
+        types.cast(parameter_type, val)
+    assert e.value.type == error_type
+
+
+def test_compile_caster_is_memoized():
+    assert types.compile_caster(List[int]) is types.compile_caster(List[int])
+
+
+@pytest.mark.parametrize(
+    "cast_function, args, expected",
+    [
+        (types.cast_primitive, (int, "1"), 1),
+        (types.cast_list, (List[int], "1,2"), [1, 2]),
+        (types.cast_list_items, (int, ["1", "2"]), [1, 2]),
+        (types.cast_enum_list, (Color, ["red"]), [Color.red]),
+        (types.cast_tuple, (Tuple[int, str], "1,a"), (1, "a")),
+        (types.cast_ellipses_tuple, (["1", "2"], int), (1, 2)),
+        (types.cast_tuple_items, (["1", "a"], (int, str)), (1, "a")),
+    ],
+)
+def test_deprecated_cast_functions(cast_function, args, expected):
+    with pytest.warns(DeprecationWarning):
+        assert cast_function(*args) == expected
@@ -0,0 +1,227 @@
+import re
+
+import pytest
+
+from tornado.httputil import HTTPServerRequest
+from tornado.routing import HostMatches, PathMatches, Rule
+from tornado.web import RequestHandler, _ApplicationRouter, url
+
+from torn_open import Application
+from torn_open.router import TrieRouter, static_prefix
+
+
+class _Connection:
+    def set_close_callback(self, callback):
+        pass
+
+
+def make_handler_class(name):
+    class NamedHandler(RequestHandler):
+        def get(self, *args, **kwargs):
+            self.write(name)
+
+    NamedHandler.__name__ = name
+    return NamedHandler
+
+
+PATTERNS = [
+    r"/",
+    r"/users",
+    r"/users/(?P<user_id>[0-9]+)",
+    r"/users/me",
+    r"/users/(?P<user_id>[^/]+)/posts",
+    r"/users/(?P<user_id>[0-9]+)/posts/(?P<post_id>[0-9]+)",
+    r"/user(?P<suffix>s?)/all",
+    r"/api/v1/items",
+    r"/api/v1/items/(?P<item_id>\d+)",
+    r"/api/v1/item",
+    r"/api/v1.0/items",
+    r"/api/v1\.1/items",
+    r"/api/v2?/legacy",
+    r"/api/(?P<version>v[0-9]+)/items",
+    r"/static/(?P<path>.*)",
+    r"/files/.+\.txt",
+    r"/a|/b",
+    r"(?P<any>/.*)/catch",
+    r"/books/[a-z]+",
+    r"/books/(?:new|old)",
+    r"/x{2}/y",
+    r"/[/]z",
+    r"/(?i:caseless)",
+    re.compile(r"/Ignored", re.IGNORECASE),
+]
+
+PATHS = [
+    "/",
+    "",
+    "/users",
+    "/users/",
+    "/users/12",
+    "/users/me",
+    "/users/me/posts",
+    "/users/12/posts/3",
+    "/user/all",
+    "/users/all",
+    "/api/v1/items",
+    "/api/v1/items/7",
+    "/api/v1/item",
+    "/api/v1/itemsx",
+    "/api/v1x0/items",
+    "/api/v1.1/items",
+    "/api/v1x1/items",
+    "/api/v/legacy",
+    "/api/v2/legacy",
+    "/api/v7/items",
+    "/static/a/b.css",
+    "/files/a/b.txt",
+    "/a",
+    "/b",
+    "/c",
+    "/users/12/catch",
+    "/books/abc",
+    "/books/new",
+    "/books/",
+    "/xx/y",
+    "/x/y",
+    "//z",
+    "/CASELESS",
+    "/ignored",
+    "/missing/path",
+]
+
+
+def make_rules():
+    return [
+        Rule(PathMatches(pattern), make_handler_class(f"handler{index}"))
+        for index, pattern in enumerate(PATTERNS)
+    ]
+
+
+def route(router, path):
+    request = HTTPServerRequest(method="GET", uri=path, connection=_Connection())
+    delegate = router.find_handler(request)
+    if delegate is None:
+        return None
+    return delegate.handler_class.__name__, delegate.path_kwargs
+
+
+@pytest.mark.parametrize(
+    "pattern, prefix",
+    [
+        (r"/users/(?P<user_id>[0-9]+)$", "/users/"),
+        (r"^/users$", "/users"),
+        (r"/api/v1\.1/items", "/api/v1.1/items"),
+        (r"/api/v1.0/items", "/api/v1"),
+        (r"/api/v2?/legacy", "/api/v"),
+        (r"/books+", "/books"),
+        (r"/x{2}", "/"),
+        (r"/\d+", "/"),
+        (r"(?P<any>/.*)", ""),
+        (r"/a|/b", None),
+        (r"/(a|b)", "/"),
+        (r"/[|]", "/"),
+    ],
+)
+def test_static_prefix(pattern, prefix):
+    assert static_prefix(pattern) == prefix
+
+
+def test_trie_router_finds_the_same_handlers_as_tornado():
+    application = Application([], api_spec_build="lazy")
+    rules = make_rules()
+    linear_router = _ApplicationRouter(application, rules)
+    trie_router = TrieRouter(application, rules)
+
+    for path in PATHS:
+        assert route(trie_router, path) == route(linear_router, path), path
+
+
+def test_trie_router_keeps_the_first_matching_rule():
+    application = Application([], api_spec_build="lazy")
+    trie_router = TrieRouter(
+        application,
+        [
+            Rule(PathMatches(r"/(?P<name>.*)"), make_handler_class("catch_all")),
+            Rule(PathMatches(r"/users/me"), make_handler_class("me")),
+        ],
+    )
+
+    assert route(trie_router, "/users/me") == ("catch_all", {"name": b"users/me"})
+
+
+def test_trie_router_indexes_rules_added_later():
+    application = Application([], api_spec_build="lazy")
+    trie_router = TrieRouter(application, [])
+    assert route(trie_router, "/late") is None
+
+    trie_router.add_rules([(r"/late", make_handler_class("late"))])
+
+    assert route(trie_router, "/late") == ("late", {})
+
+
+class RootHandler(RequestHandler):
+    def get(self):
+        self.write("root")
+
+
+class UserHandler(RequestHandler):
+    def get(self, user_id):
+        self.write(f"user {user_id}")
+
+
+class MeHandler(RequestHandler):
+    def get(self):
+        self.write("me")
+
+
+class NestedHandler(RequestHandler):
+    def get(self):
+        self.write("nested")
+
+
+@pytest.fixture
+def app():
+    return Application(
+        [
+            url(r"/", RootHandler),
+            url(r"/users/(?P<user_id>[0-9]+)", UserHandler),
+            url(r"/users/me", MeHandler),
+            Rule(PathMatches(r"/nested/.*"), [(r"/nested/handler", NestedHandler)]),
+            Rule(HostMatches(r"other\.example"), [(r"/users/me", NestedHandler)]),
+        ],
+        api_spec_build="lazy",
+        trie_routing=True,
+        static_path="/tmp",
+    )
+
+
+def test_application_uses_trie_router(app):
+    assert isinstance(app.wildcard_router, TrieRouter)
+    assert app.default_router.rules[-1].target is app.wildcard_router
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/", "root"),
+        ("/users/12", "user 12"),
+        ("/users/me", "me"),
+        ("/nested/handler", "nested"),
+    ],
+)
+@pytest.mark.gen_test
+async def test_trie_routing(http_client, base_url, path, body):
+    response = await http_client.fetch(f"{base_url}{path}")
+    assert response.body.decode() == body
+
+
+@pytest.mark.gen_test
+async def test_trie_routing_not_found(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/users/", raise_error=False)
+    assert response.code == 404
+
+
+@pytest.mark.gen_test
+async def test_trie_routing_keeps_the_spec_routes(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/openapi.json")
+    assert response.code == 200
@@ -0,0 +1,129 @@
+import json
+from typing import List, Optional, Tuple
+
+import pytest
+
+from tornado.httputil import url_concat
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler
+from torn_open.types import IntArray, FloatArray
+from tests import assert_subset_dict
+
+
+@pytest.fixture
+def app():
+    class ListIntQueryParamHandler(AnnotatedHandler):
+        def get(self, ids: Optional[List[int]]):
+            self.write({"ids": ids})
+
+    class TupleQueryParamHandler(AnnotatedHandler):
+        def get(self, pair: Tuple[int, str]):
+            self.write({"pair": pair})
+
+    class IntArrayQueryParamHandler(AnnotatedHandler):
+        def get(self, ids: IntArray):
+            assert isinstance(ids, IntArray)
+            self.write({"ids": ids.tolist()})
+
+    class FloatArrayQueryParamHandler(AnnotatedHandler):
+        def get(self, values: FloatArray):
+            self.write({"values": values.tolist()})
+
+    return Application(
+        [
+            url(r"/list_int", ListIntQueryParamHandler),
+            url(r"/tuple", TupleQueryParamHandler),
+            url(r"/int_array", IntArrayQueryParamHandler),
+            url(r"/float_array", FloatArrayQueryParamHandler),
+        ]
+    )
+
+
+@pytest.fixture
+def paths(app):
+    return app.api_spec.to_dict()["paths"]
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("ids=1,2,3", [1, 2, 3]),
+        ("ids=1&ids=2&ids=3", [1, 2, 3]),
+        ("ids=1,2&ids=3", [1, 2, 3]),
+        ("", None),
+    ],
+)
+async def test_list_query_param_forms(http_client, base_url, query, expected):
+    response = await http_client.fetch(f"{base_url}/list_int?{query}")
+
+    assert json.loads(response.body) == {"ids": expected}
+
+
+@pytest.mark.gen_test
+async def test_invalid_list_query_param(http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/list_int?ids=1&ids=x", raise_error=False
+    )
+
+    assert response.code == 400
+    assert json.loads(response.body)["message"] == "invalid_value for ids: x"
+
+
+@pytest.mark.gen_test
+async def test_repeated_tuple_query_param(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/tuple?pair=1&pair=a")
+
+    assert json.loads(response.body) == {"pair": [1, "a"]}
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize("query", ["pair=1,a%20", "pair=%201&pair=a%20", "pair=1,a%01"])
+async def test_sequence_query_param_values_are_cleaned(http_client, base_url, query):
+    # Whitespace around values and control characters are removed as for single values
+    response = await http_client.fetch(f"{base_url}/tuple?{query}")
+
+    assert json.loads(response.body) == {"pair": [1, "a"]}
+
+
+@pytest.mark.gen_test
+async def test_array_query_params(http_client, base_url):
+    ids = list(range(5000))
+    url = url_concat(f"{base_url}/int_array", {"ids": ",".join(map(str, ids))})
+    response = await http_client.fetch(url)
+    assert json.loads(response.body) == {"ids": ids}
+
+    response = await http_client.fetch(f"{base_url}/float_array?values=1.5&values=2")
+    assert json.loads(response.body) == {"values": [1.5, 2.0]}
+
+
+@pytest.mark.gen_test
+async def test_invalid_array_query_param(http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/int_array?ids=1,{2 ** 64}", raise_error=False
+    )
+
+    assert response.code == 400
+
+
+def test_sequence_query_param_spec(paths):
+    parameter = paths["/list_int"]["get"]["parameters"][0]
+    assert_subset_dict(
+        parameter,
+        {
+            "name": "ids",
+            "style": "form",
+            "explode": False,
+            "schema": {"type": "array", "items": {"type": "integer"}},
+        },
+    )
+
+    parameter = paths["/int_array"]["get"]["parameters"][0]
+    assert_subset_dict(
+        parameter,
+        {
+            "required": True,
+            "style": "form",
+            "schema": {"type": "array", "items": {"type": "integer"}},
+        },
+    )
@@ -0,0 +1,286 @@
+import json
+from typing import List, Set
+
+import pytest
+
+import tornado.gen
+from tornado.web import url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    RequestModel,
+    ResponseModel,
+    cache,
+    limit_concurrency,
+)
+from torn_open.cache import ResponseCache
+from torn_open.models import Response
+
+
+class CountResponseModel(ResponseModel):
+    number: int
+    calls: int
+
+
+class CachedHandler(AnnotatedHandler):
+    calls = 0
+
+    @cache(ttl=60, max_entries=2, stale_while_revalidate=30)
+    async def get(self, number: int) -> CountResponseModel:
+        CachedHandler.calls += 1
+        return CountResponseModel(number=number, calls=CachedHandler.calls)
+
+
+class FilterRequestModel(RequestModel):
+    ids: Set[int]
+    tags: List[str]
+
+
+class FilterResponseModel(ResponseModel):
+    count: int
+    calls: int
+
+
+class CachedFilterHandler(AnnotatedHandler):
+    calls = 0
+
+    @cache(ttl=60)
+    async def post(self, body: FilterRequestModel) -> FilterResponseModel:
+        CachedFilterHandler.calls += 1
+        return FilterResponseModel(
+            count=len(body.ids) + len(body.tags), calls=CachedFilterHandler.calls
+        )
+
+
+class NameResponseModel(ResponseModel):
+    name: str
+
+
+class NamedHandler(AnnotatedHandler):
+    name = "base"
+
+    @cache(ttl=60)
+    async def get(self) -> NameResponseModel:
+        return NameResponseModel(name=f"{self.name} {self.request.path}")
+
+
+class AHandler(NamedHandler):
+    name = "a"
+
+
+class BHandler(NamedHandler):
+    name = "b"
+
+
+class StatusHandler(AnnotatedHandler):
+    @cache(ttl=60)
+    async def get(self, status: int) -> CountResponseModel:
+        return Response(CountResponseModel(number=status, calls=0), status_code=status)
+
+
+class RevalidatedHandler(AnnotatedHandler):
+    calls = []
+
+    @cache(ttl=60, stale_while_revalidate=30)
+    @limit_concurrency(max_in_flight=1)
+    async def get(self) -> CountResponseModel:
+        RevalidatedHandler.calls.append(
+            (self, self._finished, self.get.concurrency_limit.in_flight)
+        )
+        return CountResponseModel(number=0, calls=len(RevalidatedHandler.calls))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def response_cache():
+    response_cache = CachedHandler.get.response_cache
+    response_cache.clear()
+    response_cache.hits = response_cache.stale_hits = response_cache.misses = 0
+    response_cache.clock = Clock()
+    CachedHandler.calls = 0
+    return response_cache
+
+
+@pytest.fixture
+def app(response_cache):
+    return Application(
+        [
+            url(r"/cached", CachedHandler),
+            url(r"/filter", CachedFilterHandler),
+            url(r"/a", AHandler),
+            url(r"/b", BHandler),
+            url(r"/b/again", BHandler),
+            url(r"/status", StatusHandler),
+            url(r"/revalidated", RevalidatedHandler),
+        ]
+    )
+
+
+async def fetch(http_client, base_url, number):
+    response = await http_client.fetch(f"{base_url}/cached?number={number}")
+    return response, json.loads(response.body)
+
+
+@pytest.mark.gen_test
+async def test_cached_response(http_client, base_url, response_cache):
+    response, body = await fetch(http_client, base_url, 1)
+    assert body == {"number": 1, "calls": 1}
+    assert response.headers["Cache-Control"] == "max-age=60, stale-while-revalidate=30"
+    assert response.headers["Content-Type"].startswith("application/json")
+
+    response, body = await fetch(http_client, base_url, 1)
+    assert body == {"number": 1, "calls": 1}
+
+    response, body = await fetch(http_client, base_url, 2)
+    assert body == {"number": 2, "calls": 2}
+    assert response_cache.stats() == {
+        "hits": 1,
+        "stale_hits": 0,
+        "misses": 2,
+        "entries": 2,
+    }
+
+
+@pytest.mark.gen_test
+async def test_lru_eviction(http_client, base_url, response_cache):
+    for number in (1, 2, 1, 3):
+        await fetch(http_client, base_url, number)
+
+    assert list(response_cache.entries) == [
+        response_cache.key(CachedHandler, "/cached", {"number": 1}),
+        response_cache.key(CachedHandler, "/cached", {"number": 3}),
+    ]
+
+
+@pytest.mark.gen_test
+async def test_stale_while_revalidate(http_client, base_url, response_cache):
+    await fetch(http_client, base_url, 1)
+
+    response_cache.clock.now = 70
+    _, body = await fetch(http_client, base_url, 1)
+    assert body == {"number": 1, "calls": 1}
+    assert response_cache.stale_hits == 1
+
+    _, body = await fetch(http_client, base_url, 1)
+    assert body == {"number": 1, "calls": 2}
+
+    response_cache.clock.now = 200
+    _, body = await fetch(http_client, base_url, 1)
+    assert body == {"number": 1, "calls": 3}
+
+
+@pytest.mark.gen_test
+async def test_invalidate(http_client, base_url, response_cache):
+    await fetch(http_client, base_url, 1)
+    response_cache.invalidate(number=1)
+
+    _, body = await fetch(http_client, base_url, 1)
+    assert body == {"number": 1, "calls": 2}
+
+
+def test_cache_control_in_spec(app):
+    paths = app.api_spec.to_dict()["paths"]
+    headers = paths["/cached"]["get"]["responses"]["200"]["headers"]
+
+    assert headers["Cache-Control"]["schema"]["example"] == (
+        "max-age=60, stale-while-revalidate=30"
+    )
+
+
+def test_response_cache_key_for_unhashable_params():
+    key = ResponseCache.key(
+        CachedHandler, "/", {"ids": [1, 2], "filters": {"b": 1, "a": [2]}}
+    )
+    assert key == ResponseCache.key(
+        CachedHandler, "/", {"filters": {"a": [2], "b": 1}, "ids": [1, 2]}
+    )
+
+
+@pytest.mark.gen_test
+async def test_cached_response_for_set_and_list_fields(http_client, base_url):
+    CachedFilterHandler.post.response_cache.clear()
+    CachedFilterHandler.calls = 0
+
+    bodies = []
+    for ids in ([1, 2], [2, 1]):
+        response = await http_client.fetch(
+            f"{base_url}/filter",
+            method="POST",
+            body=json.dumps({"ids": ids, "tags": ["a"]}),
+        )
+        bodies.append(json.loads(response.body))
+
+    assert bodies == [{"count": 3, "calls": 1}, {"count": 3, "calls": 1}]
+
+
+def test_response_cache_key_for_sets():
+    assert ResponseCache.key(CachedHandler, "/", {"ids": {1, 2}}) == ResponseCache.key(
+        CachedHandler, "/", {"ids": frozenset([2, 1])}
+    )
+
+
+def test_response_cache_key_for_params_that_cannot_be_hashed():
+    assert ResponseCache.key(CachedHandler, "/", {"data": bytearray(b"x")}) is None
+
+
+@pytest.mark.gen_test
+async def test_cached_responses_of_shared_method(http_client, base_url):
+    NamedHandler.get.response_cache.clear()
+
+    names = []
+    for path in ("/a", "/b", "/b/again", "/a"):
+        response = await http_client.fetch(f"{base_url}{path}")
+        names.append(json.loads(response.body)["name"])
+
+    assert names == ["a /a", "b /b", "b /b/again", "a /a"]
+    assert NamedHandler.get.response_cache.stats()["entries"] == 3
+
+
+@pytest.mark.gen_test
+async def test_response_that_is_not_cached(http_client, base_url):
+    response_cache = StatusHandler.get.response_cache
+    response_cache.clear()
+
+    response = await http_client.fetch(
+        f"{base_url}/status?status=404", raise_error=False
+    )
+    assert response.code == 404
+    assert "Cache-Control" not in response.headers
+    assert len(response_cache.entries) == 0
+
+    response = await http_client.fetch(f"{base_url}/status?status=201")
+    assert response.headers["Cache-Control"] == "max-age=60"
+    assert len(response_cache.entries) == 1
+
+
+@pytest.mark.gen_test
+async def test_revalidation_handles_copy_of_request(http_client, base_url):
+    response_cache = RevalidatedHandler.get.response_cache
+    response_cache.clear()
+    response_cache.clock = Clock()
+    RevalidatedHandler.calls = []
+
+    await http_client.fetch(f"{base_url}/revalidated")
+    response_cache.clock.now = 70
+    response = await http_client.fetch(f"{base_url}/revalidated")
+    assert json.loads(response.body)["calls"] == 1
+
+    while len(RevalidatedHandler.calls) < 2:
+        await tornado.gen.sleep(0.01)
+    while response_cache._revalidating:
+        await tornado.gen.sleep(0.01)
+
+    (first, *_), (handler, is_finished, in_flight) = RevalidatedHandler.calls
+    assert handler is not first
+    assert not is_finished
+    assert in_flight == 1
+
+    response = await http_client.fetch(f"{base_url}/revalidated")
+    assert json.loads(response.body)["calls"] == 2
@@ -0,0 +1,188 @@
+import asyncio
+import json
+
+import pytest
+
+from tornado.web import url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    RequestModel,
+    ResponseModel,
+    limit_concurrency,
+    stream_json_body,
+)
+from torn_open.concurrency import ConcurrencyLimit
+
+
+class CountResponseModel(ResponseModel):
+    calls: int
+
+
+class Gate:
+    """
+    Keeps the executions of a handler in flight until it is opened
+    """
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.calls = 0
+
+    async def wait(self) -> int:
+        self.calls += 1
+        calls = self.calls
+        await self.event.wait()
+        return calls
+
+
+class LimitedHandler(AnnotatedHandler):
+    gate: Gate
+
+    @limit_concurrency(max_in_flight=1, max_queue=1, retry_after=3)
+    async def get(self) -> CountResponseModel:
+        return CountResponseModel(calls=await self.gate.wait())
+
+
+class ShortWaitHandler(AnnotatedHandler):
+    gate: Gate
+
+    @limit_concurrency(max_in_flight=1, max_queue=5, max_wait=0.05)
+    async def get(self) -> CountResponseModel:
+        return CountResponseModel(calls=await self.gate.wait())
+
+
+class UploadModel(RequestModel):
+    items: list
+
+
+@stream_json_body()
+class SharedLimitHandler(AnnotatedHandler):
+    gate: Gate
+    concurrency_limit = ConcurrencyLimit(1)
+
+    async def get(self) -> CountResponseModel:
+        return CountResponseModel(calls=await self.gate.wait())
+
+    async def post(self, req_body: UploadModel) -> CountResponseModel:
+        return CountResponseModel(calls=await self.gate.wait())
+
+
+HANDLERS = (LimitedHandler, ShortWaitHandler, SharedLimitHandler)
+
+
+@pytest.fixture
+def gate():
+    gate = Gate()
+    for handler in HANDLERS:
+        handler.gate = gate
+    for concurrency_limit in (
+        LimitedHandler.get.concurrency_limit,
+        ShortWaitHandler.get.concurrency_limit,
+        SharedLimitHandler.concurrency_limit,
+    ):
+        concurrency_limit.rejected = 0
+    return gate
+
+
+@pytest.fixture
+def app(gate):
+    return Application(
+        [
+            url(r"/limited", LimitedHandler),
+            url(r"/short_wait", ShortWaitHandler),
+            url(r"/shared", SharedLimitHandler),
+        ]
+    )
+
+
+async def fetch_concurrently(http_client, base_url, requests, gate, delay=0.1):
+    futures = [
+        asyncio.ensure_future(
+            http_client.fetch(f"{base_url}{path}", raise_error=False, **kwargs)
+        )
+        for path, kwargs in requests
+    ]
+    await asyncio.sleep(delay)
+    gate.event.set()
+    return await asyncio.gather(*futures)
+
+
+@pytest.mark.gen_test
+async def test_requests_beyond_queue_are_rejected(app, http_client, base_url, gate):
+    responses = await fetch_concurrently(
+        http_client, base_url, [("/limited", {})] * 3, gate
+    )
+
+    codes = sorted(response.code for response in responses)
+    assert codes == [200, 200, 503]
+    (rejected,) = [response for response in responses if response.code == 503]
+    assert rejected.headers["Retry-After"] == "3"
+    assert json.loads(rejected.body) == {
+        "type": "concurrency_limit_exceeded",
+        "message": "too many concurrent requests",
+    }
+    assert gate.calls == 2
+    assert LimitedHandler.get.concurrency_limit.stats() == {
+        "limit": 1,
+        "in_flight": 0,
+        "queued": 0,
+        "rejected": 1,
+    }
+
+
+@pytest.mark.gen_test
+async def test_requests_waiting_past_max_wait_are_rejected(
+    app, http_client, base_url, gate
+):
+    # Opened well after max_wait, so that pauses of the IOLoop do not delay the timeouts past it
+    responses = await fetch_concurrently(
+        http_client, base_url, [("/short_wait", {})] * 3, gate, delay=0.5
+    )
+
+    assert sorted(response.code for response in responses) == [200, 503, 503]
+    assert ShortWaitHandler.get.concurrency_limit.stats()["queued"] == 0
+
+
+@pytest.mark.gen_test
+async def test_class_limit_is_shared_by_methods(app, http_client, base_url, gate):
+    requests = [
+        ("/shared", {}),
+        ("/shared", {"method": "POST", "body": json.dumps({"items": [1]})}),
+    ]
+    responses = await fetch_concurrently(http_client, base_url, requests, gate)
+
+    assert sorted(response.code for response in responses) == [200, 503]
+    assert gate.calls == 1
+
+
+@pytest.mark.gen_test
+async def test_queued_requests_are_served_in_order():
+    concurrency_limit = ConcurrencyLimit(1, max_queue=2)
+    order = []
+
+    async def run(name):
+        assert await concurrency_limit.acquire()
+        order.append(name)
+        await asyncio.sleep(0)
+        concurrency_limit.release()
+
+    await asyncio.gather(run("a"), run("b"), run("c"))
+    assert order == ["a", "b", "c"]
+    assert concurrency_limit.stats()["in_flight"] == 0
+
+
+def test_concurrency_limit_in_api_spec(app):
+    paths = app.api_spec.to_dict()["paths"]
+
+    response = paths["/limited"]["get"]["responses"]["503"]
+    assert response["headers"]["Retry-After"]["schema"]["example"] == 3
+    schema = response["content"]["application/json"]["schema"]
+    assert schema["properties"]["type"]["enum"] == ["concurrency_limit_exceeded"]
+    assert "503" in paths["/shared"]["post"]["responses"]
+
+
+def test_invalid_concurrency_limit():
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(0)
+    with pytest.raises(ValueError):
+        ConcurrencyLimit(1, max_wait=0)
@@ -2,22 +2,50 @@ import pytest
 import json
 
 from tornado.web import url
-from torn_open import Application, AnnotatedHandler, ClientError
+from torn_open import Application, AnnotatedHandler, ClientError, RequestModel
+
+
+class ErrorRequestModel(RequestModel):
+    number: int
+    name: str
+
+
+class ResponseModelHandler(AnnotatedHandler):
+    async def get(self):
+        raise ClientError(
+            status_code=400,
+            error_type="invalid",
+            message="invalid",
+        )
+
+
+class DynamicErrorHandler(AnnotatedHandler):
+    async def get(self, number: int):
+        raise ClientError(
+            status_code=400,
+            error_type="invalid",
+            message=f"invalid {number}",
+        )
+
+    async def post(self, body: ErrorRequestModel):
+        pass
+
+
+# Defined without a source file, as in deployments of .pyc files only
+exec("""
+class SourcelessErrorHandler(AnnotatedHandler):
+    async def get(self):
+        raise ClientError(status_code=400, error_type="invalid", message="invalid")
+""")
 
 
 @pytest.fixture
 def app():
-    class ResponseModelHandler(AnnotatedHandler):
-        async def get(self):
-            raise ClientError(
-                status_code=400,
-                error_type="invalid",
-                message="invalid",
-            )
-
     app = Application(
         [
             url(r"/response_model", ResponseModelHandler),
+            url(r"/dynamic", DynamicErrorHandler),
+            url(r"/sourceless", SourcelessErrorHandler),  # noqa: F821
         ]
     )
 
@@ -36,3 +64,90 @@ async def test_response_model_handler(http_client, base_url):
         "type": "invalid",
         "message": "invalid",
     }
+
+
+@pytest.mark.gen_test
+async def test_constant_error_body_is_encoded_once(app, http_client, base_url):
+    url = f"{base_url}/response_model"
+
+    first = await http_client.fetch(url, raise_error=False)
+    second = await http_client.fetch(url, raise_error=False)
+
+    assert first.body == second.body
+    error_bodies = ResponseModelHandler.handler_class_params.error_bodies
+    assert list(error_bodies.values()) == [first.body]
+
+
+@pytest.mark.gen_test
+async def test_error_of_method_without_source(app, http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/sourceless", raise_error=False)
+
+    assert response.code == 400
+    assert json.loads(response.body) == {"type": "invalid", "message": "invalid"}
+    # Errors of methods whose source is not available are not known in advance
+    assert SourcelessErrorHandler.handler_class_params.error_bodies == {}  # noqa: F821
+
+
+@pytest.mark.gen_test
+async def test_dynamic_error_body_is_not_cached(app, http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/dynamic?number=1", raise_error=False
+    )
+    assert json.loads(response.body)["message"] == "invalid 1"
+
+    missing = await http_client.fetch(f"{base_url}/dynamic", raise_error=False)
+    assert json.loads(missing.body) == {
+        "type": "missing_argument",
+        "message": "number is required",
+    }
+
+    error_keys = [
+        key[1:] for key in DynamicErrorHandler.handler_class_params.error_bodies
+    ]
+    assert error_keys == [(400, "missing_argument", "number is required")]
+
+
+@pytest.mark.gen_test
+async def test_invalid_query_param_errors(http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/dynamic?number=x", raise_error=False
+    )
+
+    assert response.code == 400
+    assert json.loads(response.body) == {
+        "type": "invalid_value",
+        "message": "invalid_value for number: x",
+        "errors": [{"loc": ["query", "number"], "type": "invalid_value", "value": "x"}],
+    }
+
+
+@pytest.mark.gen_test
+async def test_invalid_request_body_errors(http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/dynamic",
+        method="POST",
+        body=json.dumps({"number": "x"}),
+        raise_error=False,
+    )
+
+    assert response.code == 400
+    body = json.loads(response.body)
+    assert body["type"] == "invalid_request_body"
+    assert body["message"] == "request body is invalid"
+    assert [(error["loc"], error["type"]) for error in body["errors"]] == [
+        (["body", "number"], "type_error.integer"),
+        (["body", "name"], "value_error.missing"),
+    ]
+
+
+@pytest.mark.gen_test
+async def test_request_body_that_is_not_an_object(http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/dynamic", method="POST", body="[1]", raise_error=False
+    )
+
+    assert response.code == 400
+    assert json.loads(response.body) == {
+        "type": "invalid_request_body",
+        "message": "request body must be a JSON object",
+    }
@@ -0,0 +1,199 @@
+import asyncio
+import gc
+import json
+import os
+import threading
+import time
+import weakref
+
+import pytest
+
+from tornado.web import url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    ClientError,
+    RequestModel,
+    ResponseModel,
+    cache,
+)
+from torn_open.executors import ProcessPool, ThreadPool, run_in_executor
+from torn_open.metrics import Metrics
+
+thread_pool = ThreadPool("blocking", max_workers=1)
+sync_pool = ThreadPool("sync", max_workers=2)
+process_pool = ProcessPool("cpu", max_workers=1)
+
+
+class WorkerResponse(ResponseModel):
+    thread: str
+    pid: int
+
+
+class SquareRequest(RequestModel):
+    numbers: list
+
+
+class SquareResponse(ResponseModel):
+    squares: list
+    pid: int
+
+
+def worker_response() -> WorkerResponse:
+    return WorkerResponse(thread=threading.current_thread().name, pid=os.getpid())
+
+
+class BlockingHandler(AnnotatedHandler):
+    @run_in_executor(thread_pool)
+    def get(self, delay: float = 0) -> WorkerResponse:
+        time.sleep(delay)
+        return worker_response()
+
+
+class SyncHandler(AnnotatedHandler):
+    def get(self, fail: bool = False) -> WorkerResponse:
+        if fail:
+            raise ClientError(status_code=400, error_type="failed")
+        return worker_response()
+
+    async def post(self) -> WorkerResponse:
+        return worker_response()
+
+
+class CachedSyncHandler(AnnotatedHandler):
+    @cache(ttl=60)
+    def get(self) -> WorkerResponse:
+        return worker_response()
+
+
+class SquareHandler(AnnotatedHandler):
+    @run_in_executor(process_pool)
+    def post(self, req_body: SquareRequest) -> SquareResponse:
+        if not req_body.numbers:
+            raise ClientError(status_code=400, error_type="no_numbers")
+        return SquareResponse(
+            squares=[number * number for number in req_body.numbers], pid=os.getpid()
+        )
+
+
+@pytest.fixture
+def app():
+    CachedSyncHandler.get.response_cache.clear()
+    return Application(
+        [
+            url(r"/blocking", BlockingHandler),
+            url(r"/sync", SyncHandler),
+            url(r"/cached", CachedSyncHandler),
+            url(r"/squares", SquareHandler),
+        ],
+        sync_method_executor=sync_pool,
+        metrics_route="/metrics",
+        api_spec_build="lazy",
+    )
+
+
+async def fetch_json(http_client, url, **kwargs):
+    response = await http_client.fetch(url, raise_error=False, **kwargs)
+    return response, json.loads(response.body)
+
+
+@pytest.mark.gen_test
+async def test_run_in_thread_pool(app, http_client, base_url):
+    _, body = await fetch_json(http_client, f"{base_url}/blocking")
+
+    assert body["thread"].startswith("torn_open-blocking")
+
+
+@pytest.mark.gen_test
+async def test_blocking_methods_do_not_stall_the_ioloop(app, http_client, base_url):
+    started_at = time.monotonic()
+    blocking = asyncio.ensure_future(
+        http_client.fetch(f"{base_url}/blocking?delay=0.3")
+    )
+    await asyncio.sleep(0.05)
+    _, body = await fetch_json(http_client, f"{base_url}/sync")
+    assert time.monotonic() - started_at < 0.3
+    await blocking
+
+    assert body["thread"].startswith("torn_open-sync")
+
+
+@pytest.mark.gen_test
+async def test_sync_method_executor(app, http_client, base_url):
+    _, body = await fetch_json(http_client, f"{base_url}/sync")
+    assert body["thread"].startswith("torn_open-sync")
+
+    # Coroutines keep running on the IOLoop
+    _, body = await fetch_json(http_client, f"{base_url}/sync", method="POST", body="")
+    assert body["thread"] == threading.current_thread().name
+
+    response, body = await fetch_json(http_client, f"{base_url}/sync?fail=true")
+    assert response.code == 400
+    assert body["type"] == "failed"
+
+    _, body = await fetch_json(http_client, f"{base_url}/cached")
+    assert body["thread"].startswith("torn_open-sync")
+
+
+@pytest.mark.gen_test
+async def test_run_in_process_pool(app, http_client, base_url):
+    _, body = await fetch_json(
+        http_client,
+        f"{base_url}/squares",
+        method="POST",
+        body=json.dumps({"numbers": [1, 2, 3]}),
+    )
+    assert body["squares"] == [1, 4, 9]
+    assert body["pid"] != os.getpid()
+
+    response, body = await fetch_json(
+        http_client,
+        f"{base_url}/squares",
+        method="POST",
+        body=json.dumps({"numbers": []}),
+    )
+    assert response.code == 400
+    assert body["type"] == "no_numbers"
+
+
+@pytest.mark.gen_test
+async def test_executor_metrics(app, http_client, base_url):
+    completed = thread_pool.completed
+    await asyncio.gather(
+        *[http_client.fetch(f"{base_url}/blocking?delay=0.05") for _ in range(3)]
+    )
+
+    stats = thread_pool.stats()
+    assert stats["completed"] == completed + 3
+    assert stats["pending"] == 0
+    assert stats["max_wait_time"] >= 0.05
+
+    response = await http_client.fetch(f"{base_url}/metrics")
+    lines = response.body.decode().splitlines()
+    assert 'torn_open_executor_queue_depth{executor="blocking"} 0' in lines
+    assert 'torn_open_executor_wait_seconds_count{executor="blocking"} 3' in lines
+    # Pools of the application are listed before they are used
+    assert 'torn_open_executor_queue_depth{executor="cpu"} 0' in lines
+
+
+def test_async_methods_cannot_run_in_executor():
+    class AsyncHandler(AnnotatedHandler):
+        @run_in_executor()
+        async def get(self) -> WorkerResponse:
+            return worker_response()
+
+    with pytest.raises(ValueError):
+        Application([url(r"/async", AsyncHandler)], api_spec_build="lazy")
+
+
+def test_pools_do_not_keep_metrics_alive():
+    pool = ThreadPool("observed", max_workers=1)
+    metrics = Metrics([], executor_pools=[pool])
+    metrics_reference = weakref.ref(metrics)
+
+    del metrics
+    gc.collect()
+    pool._notify(None)
+
+    assert metrics_reference() is None
+    assert pool._observers == []
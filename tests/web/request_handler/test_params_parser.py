@@ -0,0 +1,62 @@
+from typing import Optional
+
+import pytest
+
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler
+
+
+class NoParamsHandler(AnnotatedHandler):
+    async def get(self):
+        self.write({"called": True})
+
+
+class MixedParamsHandler(AnnotatedHandler):
+    async def get(self, path_param: int, query_param: Optional[int] = 1):
+        self.write({"path_param": path_param, "query_param": query_param})
+
+    async def delete(self, path_param: int):
+        self.write({"path_param": path_param})
+
+
+@pytest.fixture
+def app():
+    return Application(
+        [
+            url(r"/no_params", NoParamsHandler),
+            url(r"/mixed/(?P<path_param>[^/]+)", MixedParamsHandler),
+        ]
+    )
+
+
+def test_params_parser_skipped_for_method_without_params(app):
+    assert NoParamsHandler.handler_class_params.params_parsers == {"get": None}
+
+
+def test_params_parser_compiled_per_method(app):
+    params_parsers = MixedParamsHandler.handler_class_params.params_parsers
+    assert [name for name, _ in params_parsers["get"].param_parsers] == [
+        "path_param",
+        "query_param",
+    ]
+    assert [name for name, _ in params_parsers["delete"].param_parsers] == [
+        "path_param"
+    ]
+
+
+@pytest.mark.gen_test
+async def test_calling_handler_without_params(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/no_params")
+    assert response.code == 200
+
+
+@pytest.mark.gen_test
+async def test_calling_handler_with_compiled_params(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/mixed/2?query_param=3")
+    assert response.body == b'{"path_param": 2, "query_param": 3}'
+
+    response = await http_client.fetch(f"{base_url}/mixed/2")
+    assert response.body == b'{"path_param": 2, "query_param": 1}'
+
+    response = await http_client.fetch(f"{base_url}/mixed/x", raise_error=False)
+    assert response.code == 400
@@ -0,0 +1,116 @@
+import pytest
+
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler, ClientError, ResponseModel
+
+
+class NumberResponse(ResponseModel):
+    number: int
+
+
+class NumberHandler(AnnotatedHandler):
+    async def get(self, number: int) -> NumberResponse:
+        if number < 0:
+            raise ClientError(status_code=400, error_type="negative_number")
+        return NumberResponse(number=number)
+
+
+def _phases(header):
+    return [timing.split(";")[0] for timing in header.split(", ")]
+
+
+@pytest.fixture
+def recorded_timings():
+    return []
+
+
+@pytest.fixture
+def app(recorded_timings):
+    def hook(handler, timings):
+        recorded_timings.append((handler.get_status(), timings))
+
+    return Application(
+        [url("/number", NumberHandler)],
+        server_timing=True,
+        request_timing_hooks=[hook],
+    )
+
+
+@pytest.mark.gen_test
+async def test_server_timing_header(http_client, base_url, recorded_timings):
+    response = await http_client.fetch(f"{base_url}/number?number=1")
+
+    header = response.headers["Server-Timing"]
+    assert _phases(header) == ["prepare", "bind", "handler", "serialize"]
+    assert all(float(timing.split("dur=")[1]) >= 0 for timing in header.split(", "))
+
+    assert len(recorded_timings) == 1
+    status, timings = recorded_timings[0]
+    assert timings.method == "GET"
+    assert [phase for phase, _ in timings.phases] == _phases(header)
+    assert timings.total >= 0
+
+
+@pytest.mark.gen_test
+async def test_server_timing_header_on_client_error(
+    http_client, base_url, recorded_timings
+):
+    response = await http_client.fetch(
+        f"{base_url}/number?number=-1", raise_error=False
+    )
+
+    assert response.code == 400
+    assert _phases(response.headers["Server-Timing"]) == [
+        "prepare",
+        "bind",
+        "error",
+    ]
+    assert len(recorded_timings) == 1
+
+
+class TestRequestTimingDisabled:
+    @pytest.fixture
+    def app(self):
+        return Application([url("/number", NumberHandler)])
+
+    @pytest.mark.gen_test
+    async def test_no_server_timing_header(self, app, http_client, base_url):
+        response = await http_client.fetch(f"{base_url}/number?number=1")
+
+        assert "Server-Timing" not in response.headers
+        assert app.settings["request_timing"] is None
+
+
+class TestFailingHook:
+    @pytest.fixture
+    def app(self, recorded_timings):
+        def failing_hook(handler, timings):
+            raise RuntimeError("hook failed")
+
+        def hook(handler, timings):
+            recorded_timings.append((handler.get_status(), timings))
+
+        return Application(
+            [url("/number", NumberHandler)],
+            server_timing=True,
+            request_timing_hooks=[failing_hook, hook],
+        )
+
+    @pytest.mark.gen_test
+    async def test_response_is_sent(self, http_client, base_url, recorded_timings):
+        response = await http_client.fetch(f"{base_url}/number?number=1")
+
+        assert response.code == 200
+        assert len(recorded_timings) == 1
+
+    @pytest.mark.gen_test
+    async def test_error_response_is_sent(
+        self, http_client, base_url, recorded_timings
+    ):
+        response = await http_client.fetch(
+            f"{base_url}/number?number=-1", raise_error=False
+        )
+
+        assert response.code == 400
+        assert "Server-Timing" in response.headers
+        assert [status for status, _ in recorded_timings] == [400]
@@ -2,7 +2,7 @@ import pytest
 import json
 
 from tornado.web import url
-from torn_open import Application, AnnotatedHandler, ResponseModel
+from torn_open import Application, AnnotatedHandler, ResponseModel, Response
 
 
 @pytest.fixture
@@ -15,9 +15,21 @@ def app():
         async def get(self) -> MyResponseModel:
             return MyResponseModel(string="x", number=1)
 
+    class ResponseEnvelopeHandler(AnnotatedHandler):
+        async def post(self) -> MyResponseModel:
+            return Response(
+                MyResponseModel(string="y", number=2),
+                status_code=201,
+                headers={"Location": "/response_model/2"},
+            )
+
+        async def delete(self) -> MyResponseModel:
+            return Response(status_code=204)
+
     app = Application(
         [
             url(r"/response_model", ResponseModelHandler),
+            url(r"/response_envelope", ResponseEnvelopeHandler),
         ]
     )
 
@@ -31,5 +43,28 @@ async def test_response_model_handler(http_client, base_url):
     response = await http_client.fetch(url)
 
     assert response.code == 200
+    assert response.headers["Content-Type"] == "application/json; charset=UTF-8"
     body = json.loads(response.body)
     assert body == {"string": "x", "number": 1}
+
+
+@pytest.mark.gen_test
+async def test_response_envelope_handler(http_client, base_url):
+    url = f"{base_url}/response_envelope"
+
+    response = await http_client.fetch(url, method="POST", body="")
+
+    assert response.code == 201
+    assert response.headers["Location"] == "/response_model/2"
+    assert response.headers["Content-Type"] == "application/json; charset=UTF-8"
+    assert json.loads(response.body) == {"string": "y", "number": 2}
+
+
+@pytest.mark.gen_test
+async def test_empty_response_envelope_handler(http_client, base_url):
+    url = f"{base_url}/response_envelope"
+
+    response = await http_client.fetch(url, method="DELETE")
+
+    assert response.code == 204
+    assert not response.body
@@ -0,0 +1,93 @@
+import json
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from tornado.web import url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    ClientError,
+    ResponseModel,
+    stream_response,
+)
+
+
+class Row(ResponseModel):
+    number: int
+
+
+class NDJSONHandler(AnnotatedHandler):
+    async def get(self, count: int) -> AsyncIterator[Row]:
+        for number in range(count):
+            yield Row(number=number)
+
+
+class JSONArrayHandler(AnnotatedHandler):
+    @stream_response(media_type="application/json", batch_size=3)
+    def get(self, count: int) -> Iterator[Row]:
+        return (Row(number=number) for number in range(count))
+
+
+class FailingStreamHandler(AnnotatedHandler):
+    @stream_response(batch_size=10)
+    async def get(self) -> AsyncIterator[Row]:
+        raise ClientError(status_code=404, error_type="not_found")
+        yield Row(number=1)
+
+
+@pytest.fixture
+def app():
+    return Application(
+        [
+            url(r"/ndjson", NDJSONHandler),
+            url(r"/json_array", JSONArrayHandler),
+            url(r"/failing", FailingStreamHandler),
+        ]
+    )
+
+
+@pytest.fixture
+def paths(app):
+    return app.api_spec.to_dict()["paths"]
+
+
+@pytest.mark.gen_test
+async def test_ndjson_response_stream(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/ndjson?count=3")
+
+    assert response.code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    assert response.body == b'{"number": 0}\n{"number": 1}\n{"number": 2}\n'
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+async def test_json_array_response_stream(http_client, base_url, count):
+    response = await http_client.fetch(f"{base_url}/json_array?count={count}")
+
+    assert response.code == 200
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert json.loads(response.body) == [{"number": n} for n in range(count)]
+
+
+@pytest.mark.gen_test
+async def test_error_before_response_stream_starts(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/failing", raise_error=False)
+
+    assert response.code == 404
+    assert json.loads(response.body)["type"] == "not_found"
+
+
+def test_ndjson_response_stream_spec(paths):
+    content = paths["/ndjson"]["get"]["responses"]["200"]["content"]
+
+    assert content["application/x-ndjson"]["schema"]["title"] == "Row"
+
+
+def test_json_array_response_stream_spec(paths):
+    content = paths["/json_array"]["get"]["responses"]["200"]["content"]
+
+    schema = content["application/json"]["schema"]
+    assert schema["type"] == "array"
+    assert schema["items"]["title"] == "Row"
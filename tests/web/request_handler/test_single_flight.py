@@ -0,0 +1,174 @@
+import asyncio
+import json
+from typing import AsyncIterator
+
+import pytest
+
+from tornado.web import url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    ClientError,
+    ResponseModel,
+    cache,
+    single_flight,
+)
+from torn_open.single_flight import SingleFlight
+
+
+class CountResponseModel(ResponseModel):
+    number: int
+    calls: int
+
+
+class Gate:
+    """
+    Keeps the executions of a handler in flight until it is opened
+    """
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.calls = 0
+
+    async def wait(self) -> int:
+        self.calls += 1
+        calls = self.calls
+        await self.event.wait()
+        return calls
+
+
+class SingleFlightHandler(AnnotatedHandler):
+    gate: Gate
+
+    @single_flight(max_wait=5)
+    async def get(self, number: int) -> CountResponseModel:
+        calls = await self.gate.wait()
+        if number < 0:
+            raise ClientError(status_code=400, error_type="negative_number")
+        return CountResponseModel(number=number, calls=calls)
+
+
+class ShortWaitHandler(AnnotatedHandler):
+    gate: Gate
+
+    @single_flight(max_wait=0.05)
+    async def get(self) -> CountResponseModel:
+        calls = await self.gate.wait()
+        return CountResponseModel(number=0, calls=calls)
+
+
+class CachedSingleFlightHandler(AnnotatedHandler):
+    gate: Gate
+
+    @cache(ttl=60)
+    @single_flight()
+    async def get(self, number: int) -> CountResponseModel:
+        calls = await self.gate.wait()
+        return CountResponseModel(number=number, calls=calls)
+
+
+HANDLERS = (SingleFlightHandler, ShortWaitHandler, CachedSingleFlightHandler)
+
+
+@pytest.fixture
+def gate():
+    gate = Gate()
+    for handler in HANDLERS:
+        handler.gate = gate
+        flight = handler.get.single_flight
+        flight.executions = flight.coalesced = flight.timeouts = 0
+    CachedSingleFlightHandler.get.response_cache.clear()
+    return gate
+
+
+@pytest.fixture
+def app(gate):
+    return Application(
+        [
+            url(r"/single_flight", SingleFlightHandler),
+            url(r"/short_wait", ShortWaitHandler),
+            url(r"/cached", CachedSingleFlightHandler),
+        ]
+    )
+
+
+async def fetch_concurrently(http_client, base_url, paths, gate):
+    futures = [
+        asyncio.ensure_future(http_client.fetch(f"{base_url}{path}", raise_error=False))
+        for path in paths
+    ]
+    # Let the requests reach the handler before the execution finishes
+    await asyncio.sleep(0.1)
+    gate.event.set()
+    return await asyncio.gather(*futures)
+
+
+@pytest.mark.gen_test
+async def test_single_flight(app, http_client, base_url, gate):
+    paths = ["/single_flight?number=1"] * 3 + ["/single_flight?number=2"]
+    responses = await fetch_concurrently(http_client, base_url, paths, gate)
+
+    bodies = [json.loads(response.body) for response in responses]
+    assert bodies[:3] == [bodies[0]] * 3
+    assert bodies[0]["number"] == 1
+    assert bodies[3]["number"] == 2
+    assert gate.calls == 2
+    stats = SingleFlightHandler.get.single_flight.stats()
+    assert stats["executions"] == 2
+    assert stats["coalesced"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["ratio"] == 0.5
+
+
+@pytest.mark.gen_test
+async def test_single_flight_shares_errors(app, http_client, base_url, gate):
+    paths = ["/single_flight?number=-1"] * 2
+    responses = await fetch_concurrently(http_client, base_url, paths, gate)
+
+    assert [response.code for response in responses] == [400, 400]
+    assert json.loads(responses[1].body)["type"] == "negative_number"
+    assert gate.calls == 1
+
+
+@pytest.mark.gen_test
+async def test_single_flight_max_wait(app, http_client, base_url, gate):
+    responses = await fetch_concurrently(
+        http_client, base_url, ["/short_wait"] * 2, gate
+    )
+
+    assert [response.code for response in responses] == [200, 200]
+    assert gate.calls == 2
+    stats = ShortWaitHandler.get.single_flight.stats()
+    assert stats["timeouts"] == 1
+    assert stats["coalesced"] == 0
+
+
+@pytest.mark.gen_test
+async def test_single_flight_with_cache(app, http_client, base_url, gate):
+    responses = await fetch_concurrently(
+        http_client, base_url, ["/cached?number=1"] * 3, gate
+    )
+    response = await http_client.fetch(f"{base_url}/cached?number=1")
+
+    bodies = [json.loads(response.body) for response in [*responses, response]]
+    assert bodies == [{"number": 1, "calls": 1}] * 4
+    assert gate.calls == 1
+    assert CachedSingleFlightHandler.get.response_cache.stats()["hits"] == 1
+
+
+def test_single_flight_rejects_streamed_responses():
+    class StreamHandler(AnnotatedHandler):
+        @single_flight()
+        async def get(self) -> AsyncIterator[CountResponseModel]:
+            yield CountResponseModel(number=1, calls=1)
+
+    with pytest.raises(ValueError):
+        Application([url(r"/stream", StreamHandler)], api_spec_build="lazy")
+
+
+def test_single_flight_key_for_sets_and_unhashable_params():
+    key = SingleFlight.key(SingleFlightHandler, {"ids": {1, 2}, "tags": ["a"]})
+    assert key == SingleFlight.key(
+        SingleFlightHandler, {"tags": ("a",), "ids": frozenset([2, 1])}
+    )
+    assert SingleFlight.key(SingleFlightHandler, {"data": bytearray(b"x")}) is None
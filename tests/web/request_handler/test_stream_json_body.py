@@ -0,0 +1,86 @@
+import json
+from typing import List
+
+import pytest
+
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler, RequestModel, stream_json_body
+
+
+class UploadModel(RequestModel):
+    items: List[int]
+
+
+@stream_json_body(max_body_size=1024)
+class StreamedUploadHandler(AnnotatedHandler):
+    async def post(self, req_body: UploadModel):
+        self.write({"count": len(req_body.items)})
+
+
+@pytest.fixture
+def app():
+    return Application([url(r"/upload", StreamedUploadHandler)])
+
+
+@pytest.mark.gen_test
+async def test_streamed_json_body(http_client, base_url):
+    body = json.dumps({"items": list(range(100))})
+    response = await http_client.fetch(f"{base_url}/upload", method="POST", body=body)
+
+    assert response.code == 200
+    assert json.loads(response.body) == {"count": 100}
+
+
+@pytest.mark.gen_test
+async def test_streamed_json_body_in_chunks(http_client, base_url):
+    body = json.dumps({"items": list(range(100))}).encode()
+
+    async def body_producer(write):
+        for i in range(0, len(body), 16):
+            await write(body[i : i + 16])
+
+    response = await http_client.fetch(
+        f"{base_url}/upload", method="POST", body_producer=body_producer
+    )
+
+    assert response.code == 200
+    assert json.loads(response.body) == {"count": 100}
+
+
+@pytest.mark.gen_test
+async def test_invalid_streamed_json_body(http_client, base_url):
+    body = json.dumps({"items": ["x"]})
+    response = await http_client.fetch(
+        f"{base_url}/upload", method="POST", body=body, raise_error=False
+    )
+
+    assert response.code == 400
+
+
+@pytest.mark.gen_test
+async def test_streamed_json_body_too_large(http_client, base_url):
+    body = json.dumps({"items": list(range(1000))})
+    response = await http_client.fetch(
+        f"{base_url}/upload", method="POST", body=body, raise_error=False
+    )
+
+    assert response.code == 413
+    assert json.loads(response.body)["type"] == "request_body_too_large"
+
+
+@pytest.mark.gen_test
+async def test_chunked_streamed_json_body_too_large(http_client, base_url):
+    body = json.dumps({"items": list(range(1000))}).encode()
+
+    async def body_producer(write):
+        for i in range(0, len(body), 256):
+            await write(body[i : i + 256])
+
+    response = await http_client.fetch(
+        f"{base_url}/upload",
+        method="POST",
+        body_producer=body_producer,
+        raise_error=False,
+    )
+
+    assert response.code == 413
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler, ResponseModel, trusted_response
+
+
+class MyResponseModel(ResponseModel):
+    number: int
+    label: str = "default"
+
+
+class ValidatedHandler(AnnotatedHandler):
+    async def get(self, number: str) -> MyResponseModel:
+        return {"number": number}
+
+
+class TrustedMethodHandler(AnnotatedHandler):
+    @trusted_response
+    async def get(self, number: str) -> MyResponseModel:
+        return {"number": number}
+
+
+@trusted_response
+class TrustedClassHandler(AnnotatedHandler):
+    async def get(self, number: str) -> MyResponseModel:
+        return {"number": number}
+
+
+RULES = [
+    url(r"/validated", ValidatedHandler),
+    url(r"/trusted_method", TrustedMethodHandler),
+    url(r"/trusted_class", TrustedClassHandler),
+]
+
+
+@pytest.fixture
+def app():
+    return Application(RULES)
+
+
+@pytest.mark.gen_test
+async def test_untrusted_response_is_validated(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/validated?number=1")
+    assert json.loads(response.body) == {"number": 1, "label": "default"}
+
+    response = await http_client.fetch(
+        f"{base_url}/validated?number=x", raise_error=False
+    )
+    assert response.code == 500
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize("route", ["/trusted_method", "/trusted_class"])
+async def test_trusted_response_is_not_validated(http_client, base_url, route):
+    response = await http_client.fetch(f"{base_url}{route}?number=x")
+
+    assert response.code == 200
+    assert json.loads(response.body) == {"number": "x", "label": "default"}
+
+
+def test_trusted_response_is_documented(app):
+    paths = app.api_spec.to_dict()["paths"]
+    content = paths["/trusted_method"]["get"]["responses"]["200"]["content"]
+
+    assert content["application/json"]["schema"]["title"] == "MyResponseModel"
+
+
+class TestAppWideTrustedResponses:
+    @pytest.fixture
+    def app(self):
+        return Application(RULES, trusted_responses=True)
+
+    @pytest.mark.gen_test
+    async def test_trusted_responses_setting(self, http_client, base_url):
+        response = await http_client.fetch(f"{base_url}/validated?number=x")
+
+        assert response.code == 200
+
+
+class TestDebugMode:
+    @pytest.fixture
+    def app(self):
+        return Application(RULES, trusted_responses=True, debug=True, autoreload=False)
+
+    @pytest.mark.gen_test
+    async def test_trusted_response_validated_in_debug_mode(
+        self, http_client, base_url
+    ):
+        response = await http_client.fetch(
+            f"{base_url}/trusted_method?number=x", raise_error=False
+        )
+
+        assert response.code == 500
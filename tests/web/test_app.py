@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from tornado.web import url, RequestHandler
@@ -30,3 +32,51 @@ async def test_new_openapi_route(http_client, base_url):
 async def test_new_redoc_route(http_client, base_url):
     result = await http_client.fetch(f"{base_url}/new_redoc_route")
     assert result.code == 200
+
+
+class SpecBuildHandler(AnnotatedHandler):
+    async def get(self, number: int):
+        self.write({"number": number})
+
+
+def test_invalid_api_spec_build():
+    with pytest.raises(ValueError):
+        Application([], api_spec_build="never")
+
+
+class TestLazyApiSpecBuild:
+    @pytest.fixture
+    def app(self):
+        return Application([url("/number", SpecBuildHandler)], api_spec_build="lazy")
+
+    @pytest.mark.gen_test
+    async def test_handlers_ready_before_spec_is_built(
+        self, app, http_client, base_url
+    ):
+        result = await http_client.fetch(f"{base_url}/number?number=1")
+
+        assert result.body == b'{"number": 1}'
+        assert app._api_spec_future is None
+
+    @pytest.mark.gen_test
+    async def test_spec_built_on_first_request(self, app, http_client, base_url):
+        result = await http_client.fetch(f"{base_url}/openapi.json")
+
+        assert "/number" in json.loads(result.body)["paths"]
+        assert app.api_spec_future().done()
+
+
+class TestBackgroundApiSpecBuild:
+    @pytest.fixture
+    def app(self):
+        return Application(
+            [url("/number", SpecBuildHandler)], api_spec_build="background"
+        )
+
+    @pytest.mark.gen_test
+    async def test_spec_built_in_background(self, app, http_client, base_url):
+        assert app._api_spec_future is not None
+
+        result = await http_client.fetch(f"{base_url}/openapi.json")
+
+        assert json.loads(result.body)["paths"] == app.api_spec.to_dict()["paths"]
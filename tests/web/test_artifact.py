@@ -0,0 +1,104 @@
+import json
+import os
+from typing import List, Optional
+
+import pytest
+
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler, ResponseModel, cache
+from torn_open.__main__ import main
+from torn_open.artifact import MANIFEST_FILE, build_artifact
+
+
+class NumbersResponse(ResponseModel):
+    numbers: List[int]
+
+
+class NumbersHandler(AnnotatedHandler):
+    @cache(ttl=60)
+    async def get(
+        self, numbers: List[int], scale: Optional[int] = 1
+    ) -> NumbersResponse:
+        return NumbersResponse(numbers=[number * scale for number in numbers])
+
+
+def make_rules():
+    return [url("/numbers", NumbersHandler)]
+
+
+@pytest.fixture
+def artifact_dir(tmp_path):
+    build_artifact(make_rules(), str(tmp_path))
+    return str(tmp_path)
+
+
+class TestLoadArtifact:
+    @pytest.fixture
+    def app(self, artifact_dir):
+        return Application(make_rules(), api_spec_artifact=artifact_dir)
+
+    @pytest.mark.gen_test
+    async def test_handlers_are_loaded_from_artifact(self, app, http_client, base_url):
+        result = await http_client.fetch(f"{base_url}/numbers?numbers=1,2&scale=3")
+
+        assert json.loads(result.body) == {"numbers": [3, 6]}
+        assert app._api_spec_future is None
+
+    def test_response_caches_are_taken_from_methods(self, app):
+        params = NumbersHandler.handler_class_params
+        assert params.response_caches["get"] is NumbersHandler.get.response_cache
+
+    @pytest.mark.gen_test
+    async def test_spec_is_served_from_artifact(
+        self, app, artifact_dir, http_client, base_url
+    ):
+        result = await http_client.fetch(f"{base_url}/openapi.json")
+
+        with open(os.path.join(artifact_dir, "openapi.json"), "rb") as f:
+            assert result.body == f.read()
+        assert app._api_spec_future is None
+
+
+def test_stale_artifact(artifact_dir):
+    with pytest.raises(ValueError):
+        Application(
+            [url("/numbers/v2", NumbersHandler)], api_spec_artifact=artifact_dir
+        )
+
+
+def test_artifact_of_changed_handler_source(artifact_dir):
+    manifest_file = os.path.join(artifact_dir, MANIFEST_FILE)
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    assert list(manifest["sources"]) == [__name__]
+    manifest["sources"][__name__] = "0" * 40
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError, match="source of"):
+        Application(make_rules(), api_spec_artifact=artifact_dir)
+
+
+def test_artifact_from_another_version(artifact_dir):
+    manifest_file = os.path.join(artifact_dir, MANIFEST_FILE)
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    manifest["version"] = "0.0.0"
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError):
+        Application(make_rules(), api_spec_artifact=artifact_dir)
+
+
+def test_build_command(tmp_path, capsys):
+    main(["build", f"{__name__}:make_rules", "--output", str(tmp_path)])
+
+    assert "1 paths" in capsys.readouterr().out
+    with open(tmp_path / "openapi.json") as f:
+        assert "/numbers" in json.load(f)["paths"]
+
+
+def test_build_command_fails_on_invalid_target(tmp_path):
+    with pytest.raises(AttributeError):
+        main(["build", f"{__name__}:missing", "--output", str(tmp_path)])
@@ -0,0 +1,180 @@
+import asyncio
+import json
+from typing import List
+
+import pytest
+
+from tornado.web import RequestHandler, url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    ClientError,
+    RequestModel,
+    ResponseModel,
+    stream_json_body,
+)
+
+
+class ItemResponse(ResponseModel):
+    item_id: int
+    tags: List[str]
+
+
+class ItemHandler(AnnotatedHandler):
+    async def get(self, item_id: int, tags: List[str] = []) -> ItemResponse:
+        if item_id < 0:
+            raise ClientError(status_code=404, error_type="item_not_found")
+        return ItemResponse(item_id=item_id, tags=tags)
+
+
+class CountModel(RequestModel):
+    items: List[int]
+
+
+class CountResponse(ResponseModel):
+    count: int
+
+
+@stream_json_body(max_body_size=1024)
+class CountHandler(AnnotatedHandler):
+    async def post(self, req_body: CountModel) -> CountResponse:
+        return CountResponse(count=len(req_body.items))
+
+
+class SlowHandler(AnnotatedHandler):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get(self) -> CountResponse:
+        cls = SlowHandler
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        await asyncio.sleep(0.01)
+        cls.in_flight -= 1
+        return CountResponse(count=cls.max_in_flight)
+
+
+class PlainHandler(RequestHandler):
+    def get(self):
+        self.write("plain")
+
+
+@pytest.fixture
+def app():
+    return Application(
+        [
+            url(r"/items/(?P<item_id>[^/]+)", ItemHandler),
+            url(r"/count", CountHandler),
+            url(r"/slow", SlowHandler),
+            url(r"/plain", PlainHandler),
+        ],
+        batch_route="/batch",
+        batch_concurrency=2,
+        batch_max_requests=5,
+    )
+
+
+async def fetch_batch(http_client, base_url, requests, **kwargs):
+    return await http_client.fetch(
+        f"{base_url}/batch",
+        method="POST",
+        body=json.dumps({"requests": requests}),
+        raise_error=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.gen_test
+async def test_batch(app, http_client, base_url):
+    response = await fetch_batch(
+        http_client,
+        base_url,
+        [
+            {"path": "/items/1", "query": {"tags": ["a", "b"]}},
+            {"method": "post", "path": "/count", "body": {"items": [1, 2, 3]}},
+            {"path": "/items/-1"},
+        ],
+    )
+
+    assert response.code == 200
+    responses = json.loads(response.body)["responses"]
+    assert [r["status"] for r in responses] == [200, 200, 404]
+    assert responses[0]["body"] == {"item_id": 1, "tags": ["a", "b"]}
+    assert responses[0]["headers"]["Content-Type"].startswith("application/json")
+    assert responses[1]["body"] == {"count": 3}
+    assert responses[2]["body"] == {"type": "item_not_found", "message": None}
+
+
+@pytest.mark.gen_test
+async def test_batch_validation_error(app, http_client, base_url):
+    response = await fetch_batch(
+        http_client,
+        base_url,
+        [{"method": "POST", "path": "/count", "body": {"items": "x"}}],
+    )
+
+    (sub_response,) = json.loads(response.body)["responses"]
+    assert sub_response["status"] == 400
+    assert sub_response["body"]["type"] == "invalid_request_body"
+
+
+@pytest.mark.gen_test
+async def test_batch_only_routes_to_annotated_handlers(app, http_client, base_url):
+    response = await fetch_batch(
+        http_client,
+        base_url,
+        [{"path": "/plain"}, {"path": "/missing"}, {"path": "/batch"}],
+    )
+
+    responses = json.loads(response.body)["responses"]
+    assert [r["status"] for r in responses] == [404, 404, 404]
+    assert responses[0]["body"]["type"] == "not_found"
+
+
+@pytest.mark.gen_test
+async def test_batch_concurrency(app, http_client, base_url):
+    SlowHandler.max_in_flight = 0
+    response = await fetch_batch(http_client, base_url, [{"path": "/slow"}] * 5)
+
+    responses = json.loads(response.body)["responses"]
+    assert max(r["body"]["count"] for r in responses) == 2
+
+
+@pytest.mark.gen_test
+async def test_batch_max_requests(app, http_client, base_url):
+    response = await fetch_batch(http_client, base_url, [{"path": "/items/1"}] * 6)
+
+    assert response.code == 400
+    assert json.loads(response.body)["type"] == "too_many_batch_requests"
+
+
+@pytest.mark.gen_test
+async def test_batch_forwards_headers(app, http_client, base_url):
+    response = await fetch_batch(
+        http_client,
+        base_url,
+        [{"path": "/items/1"}],
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    (sub_response,) = json.loads(response.body)["responses"]
+    assert sub_response["body"] == {"item_id": 1, "tags": []}
+
+
+def test_batch_in_api_spec(app):
+    spec = app.api_spec.to_dict()
+
+    operation = spec["paths"]["/batch"]["post"]
+    request_schema = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert request_schema["title"] == "BatchRequest"
+    assert "definitions" not in request_schema
+    response_schema = operation["responses"]["200"]["content"]["application/json"]
+    assert response_schema["schema"]["title"] == "BatchResponse"
+    assert "BatchSubRequest" in spec["components"]["schemas"]
+    assert "BatchSubResponse" in spec["components"]["schemas"]
+    assert "400" in operation["responses"]
+
+
+def test_invalid_batch_concurrency():
+    with pytest.raises(ValueError):
+        Application([], batch_route="/batch", batch_concurrency=0)
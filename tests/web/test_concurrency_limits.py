@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from tornado.web import url
+from torn_open import (
+    AnnotatedHandler,
+    Application,
+    ResponseModel,
+    adaptive_concurrency,
+    limit_concurrency,
+    tags,
+)
+from torn_open.concurrency import AdaptiveConcurrencyLimit, ConcurrencyLimit
+
+
+class EmptyResponse(ResponseModel):
+    pass
+
+
+class ReportHandler(AnnotatedHandler):
+    @tags("reports")
+    async def get(self) -> EmptyResponse:
+        return EmptyResponse()
+
+    @tags("reports")
+    @limit_concurrency(max_in_flight=2)
+    async def post(self) -> EmptyResponse:
+        return EmptyResponse()
+
+
+class SearchHandler(AnnotatedHandler):
+    @adaptive_concurrency(latency_target=0.5, initial_limit=4)
+    async def get(self) -> EmptyResponse:
+        return EmptyResponse()
+
+
+class UnlimitedHandler(AnnotatedHandler):
+    async def get(self) -> EmptyResponse:
+        return EmptyResponse()
+
+
+REPORTS_LIMIT = AdaptiveConcurrencyLimit(latency_target=0.5, initial_limit=8)
+
+
+@pytest.fixture
+def app():
+    return Application(
+        [
+            url(r"/reports", ReportHandler),
+            url(r"/search", SearchHandler),
+            url(r"/unlimited", UnlimitedHandler),
+        ],
+        tag_concurrency_limits={"reports": REPORTS_LIMIT},
+        concurrency_limits_route="/limits",
+        api_spec_build="lazy",
+    )
+
+
+def test_tag_concurrency_limits(app):
+    concurrency_limits = ReportHandler.handler_class_params.concurrency_limits
+    assert concurrency_limits["get"] is REPORTS_LIMIT
+    assert concurrency_limits["post"] is ReportHandler.post.concurrency_limit
+    assert isinstance(concurrency_limits["post"], ConcurrencyLimit)
+
+    responses = app.api_spec.to_dict()["paths"]["/reports"]["get"]["responses"]
+    assert "503" in responses
+
+
+@pytest.mark.gen_test
+async def test_concurrency_limits_route(app, http_client, base_url):
+    await http_client.fetch(f"{base_url}/search")
+
+    response = await http_client.fetch(f"{base_url}/limits")
+
+    assert response.headers["Content-Type"].startswith("application/json")
+    limits = json.loads(response.body)["limits"]
+    assert [(limit["path"], limit["method"]) for limit in limits] == [
+        ("/reports", "get"),
+        ("/reports", "post"),
+        ("/search", "get"),
+    ]
+    search = limits[2]
+    assert search["limit"] == 4
+    assert search["in_flight"] == 0
+    assert search["latency_target"] == 0.5
+    assert limits[1]["limit"] == 2
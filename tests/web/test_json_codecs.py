@@ -0,0 +1,101 @@
+import json
+from enum import Enum
+
+import pytest
+
+from tornado.web import url
+from torn_open import (
+    Application,
+    AnnotatedHandler,
+    ClientError,
+    RequestModel,
+    ResponseModel,
+)
+from torn_open.json_codecs import StdlibJSONCodec, OrjsonCodec
+
+
+class Color(Enum):
+    red = "red"
+
+
+class MyRequestModel(RequestModel):
+    name: str
+    color: Color
+
+
+class MyResponseModel(ResponseModel):
+    name: str
+    color: Color
+
+
+class EchoHandler(AnnotatedHandler):
+    async def post(self, req_body: MyRequestModel) -> MyResponseModel:
+        if req_body.name == "error":
+            raise ClientError(status_code=409, error_type="conflict", message="x")
+        return MyResponseModel(name=req_body.name, color=req_body.color)
+
+
+class RecordingCodec(StdlibJSONCodec):
+    def __init__(self):
+        self.calls = []
+
+    def loads(self, data):
+        self.calls.append(("loads", type(data)))
+        return super().loads(data)
+
+    def dumps(self, obj, default=None):
+        self.calls.append(("dumps", type(obj)))
+        return super().dumps(obj, default=default)
+
+
+@pytest.fixture(params=["recording", "orjson"])
+def app(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        json_codec = OrjsonCodec()
+    else:
+        json_codec = RecordingCodec()
+    return Application([url(r"/echo", EchoHandler)], json_codec=json_codec)
+
+
+@pytest.mark.gen_test
+async def test_request_and_response_use_codec(app, http_client, base_url):
+    body = {"name": "x", "color": "red"}
+    response = await http_client.fetch(
+        f"{base_url}/echo", method="POST", body=json.dumps(body)
+    )
+
+    assert response.code == 200
+    assert json.loads(response.body) == body
+    if isinstance(app.settings["json_codec"], RecordingCodec):
+        assert app.settings["json_codec"].calls == [("loads", bytes), ("dumps", dict)]
+
+
+@pytest.mark.gen_test
+async def test_error_uses_codec(app, http_client, base_url):
+    body = {"name": "error", "color": "red"}
+    response = await http_client.fetch(
+        f"{base_url}/echo", method="POST", body=json.dumps(body), raise_error=False
+    )
+
+    assert response.code == 409
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert json.loads(response.body) == {"type": "conflict", "message": "x"}
+
+
+@pytest.mark.gen_test
+async def test_invalid_json_body(app, http_client, base_url):
+    response = await http_client.fetch(
+        f"{base_url}/echo", method="POST", body="{", raise_error=False
+    )
+
+    assert response.code == 400
+    assert json.loads(response.body)["type"] == "invalid_request_body"
+
+
+@pytest.mark.gen_test
+async def test_spec_uses_codec(app, http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/openapi.json")
+
+    assert response.headers["Content-Type"].startswith("application/json")
+    assert json.loads(response.body) == json.loads(json.dumps(app.api_spec.to_dict()))
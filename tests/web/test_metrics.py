@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+import tornado.process
+from tornado.web import url
+from torn_open import Application, AnnotatedHandler, ClientError, ResponseModel
+from torn_open.metrics import LATENCY_BUCKETS, Metrics
+
+
+class NumberResponse(ResponseModel):
+    number: int
+
+
+class NumberHandler(AnnotatedHandler):
+    async def get(self, number: int) -> NumberResponse:
+        if number < 0:
+            raise ClientError(status_code=400, error_type="negative_number")
+        if number == 0:
+            error_type = "zero"
+            raise ClientError(status_code=400, error_type=error_type)
+        return NumberResponse(number=number)
+
+
+class PageHandler(AnnotatedHandler):
+    async def get(self, page: int) -> NumberResponse:
+        return NumberResponse(number=page)
+
+
+@pytest.fixture
+def app():
+    return Application(
+        [
+            url("/numbers/(?P<number>[^/]+)", NumberHandler),
+            url("/other/numbers/(?P<number>[^/]+)", NumberHandler),
+            url("/pages", PageHandler),
+        ],
+        metrics_route="/metrics",
+        api_spec_build="lazy",
+    )
+
+
+async def fetch_metrics(http_client, base_url):
+    response = await http_client.fetch(f"{base_url}/metrics")
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    return response.body.decode().splitlines()
+
+
+@pytest.mark.gen_test
+async def test_request_counts(app, http_client, base_url):
+    for number in (1, 2, -1):
+        await http_client.fetch(f"{base_url}/numbers/{number}", raise_error=False)
+    await http_client.fetch(f"{base_url}/other/numbers/1")
+
+    lines = await fetch_metrics(http_client, base_url)
+
+    labels = 'path="/numbers/{number}",method="get"'
+    assert f'torn_open_requests_total{{{labels},status="200"}} 2' in lines
+    assert f'torn_open_requests_total{{{labels},status="400"}} 1' in lines
+    other_labels = 'path="/other/numbers/{number}",method="get"'
+    assert f'torn_open_requests_total{{{other_labels},status="200"}} 1' in lines
+    assert f"torn_open_request_duration_seconds_count{{{labels}}} 3" in lines
+    assert f'torn_open_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f'torn_open_response_size_bytes_bucket{{{labels},le="128"}} 3' in lines
+
+
+@pytest.mark.gen_test
+async def test_error_counts(app, http_client, base_url):
+    await http_client.fetch(f"{base_url}/numbers/-1", raise_error=False)
+    await http_client.fetch(f"{base_url}/numbers/0", raise_error=False)
+    await http_client.fetch(f"{base_url}/numbers/one", raise_error=False)
+    await http_client.fetch(f"{base_url}/pages", raise_error=False)
+
+    lines = await fetch_metrics(http_client, base_url)
+
+    labels = 'path="/numbers/{number}",method="get"'
+    assert f'torn_open_errors_total{{{labels},error_type="negative_number"}} 1' in lines
+    # Errors raised when parsing params have their own error type
+    assert f'torn_open_errors_total{{{labels},error_type="invalid_value"}} 1' in lines
+    page_labels = 'path="/pages",method="get"'
+    assert (
+        f'torn_open_errors_total{{{page_labels},error_type="missing_argument"}} 1'
+        in lines
+    )
+    # Error types that are not constants are counted as other
+    assert f'torn_open_errors_total{{{labels},error_type="other"}} 1' in lines
+
+
+@pytest.mark.gen_test
+async def test_error_types_are_found_on_first_error(app, http_client, base_url):
+    handler_class_params = NumberHandler.handler_class_params
+    assert "get" not in handler_class_params._known_errors
+
+    await http_client.fetch(f"{base_url}/numbers/1")
+    assert "get" not in handler_class_params._known_errors
+
+    await http_client.fetch(f"{base_url}/numbers/-1", raise_error=False)
+    assert "get" in handler_class_params._known_errors
+
+
+def test_metrics_of_forked_workers_are_aggregated(monkeypatch):
+    app = Application(
+        [url("/numbers/(?P<number>[^/]+)", NumberHandler)],
+        metrics_route="/metrics",
+        metrics_workers=2,
+        api_spec_build="lazy",
+    )
+    metrics: Metrics = app._metrics
+    operation = metrics.operations[0]
+
+    pid = os.fork()
+    if pid == 0:
+        # Worker 1 records a request and exits
+        monkeypatch.setattr(tornado.process, "task_id", lambda: 1)
+        offset = metrics._worker_size + operation.latency
+        metrics._observe(offset, LATENCY_BUCKETS, 0.5)
+        os._exit(0)
+    os.waitpid(pid, 0)
+    metrics._observe(operation.latency, LATENCY_BUCKETS, 0.5)
+
+    lines = metrics.render().decode().splitlines()
+    labels = 'path="/numbers/{number}",method="get"'
+    assert f"torn_open_request_duration_seconds_count{{{labels}}} 2" in lines
+    assert f"torn_open_request_duration_seconds_sum{{{labels}}} 1" in lines
@@ -1,22 +1,44 @@
 from tornado.web import url
 
-from torn_open.api_spec import tags, summary
-from torn_open.models import RequestModel, ResponseModel, ClientError, ServerError
+from torn_open.version import __version__
+
+from torn_open.api_spec import tags, summary, stream_response, trusted_response
+from torn_open.models import (
+    RequestModel,
+    ResponseModel,
+    Response,
+    ClientError,
+    ServerError,
+)
+from torn_open.cache import cache
+from torn_open.single_flight import single_flight
+from torn_open.concurrency import limit_concurrency, adaptive_concurrency
+from torn_open.executors import run_in_executor
 from torn_open.web import Application
-from torn_open.annotated_handler import AnnotatedHandler
+from torn_open.annotated_handler import AnnotatedHandler, stream_json_body
 
 __all__ = [
+    "__version__",
     # Tornado methods included for convenience
     "url",
     # Handler method decorators
     "tags",
     "summary",
+    "stream_response",
+    "trusted_response",
+    "cache",
+    "single_flight",
+    "limit_concurrency",
+    "adaptive_concurrency",
+    "run_in_executor",
     # Models
     "RequestModel",
     "ResponseModel",
+    "Response",
     "ClientError",
     "ServerError",
     # Web
     "AnnotatedHandler",
+    "stream_json_body",
     "Application",
 ]
@@ -0,0 +1,70 @@
+"""
+Command line interface of TornOpen
+
+    python -m torn_open build my_app:make_app --output build/api
+"""
+
+import argparse
+import importlib
+from typing import List, Optional
+
+from tornado.web import Application as BaseApplication
+
+from torn_open.artifact import build_artifact
+from torn_open.json_codecs import DEFAULT_JSON_CODEC
+
+
+def _load_target(target: str):
+    module_name, _, attribute = target.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"{target}: expected module:attribute")
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    if callable(obj) and not isinstance(obj, BaseApplication):
+        obj = obj()
+    return obj
+
+
+def build(args: argparse.Namespace):
+    obj = _load_target(args.target)
+    if isinstance(obj, BaseApplication):
+        rules = obj.default_router.rules
+        json_codec = obj.settings.get("json_codec", DEFAULT_JSON_CODEC)
+    else:
+        rules = obj
+        json_codec = DEFAULT_JSON_CODEC
+
+    api_spec = build_artifact(rules, args.output, json_codec, args.cache_dir)
+    paths = api_spec.to_dict()["paths"]
+    print(f"Wrote OpenAPI spec with {len(paths)} paths to {args.output}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m torn_open")
+    subparsers = parser.add_subparsers(dest="command")
+    # Set after creation, as add_subparsers only accepts required from Python 3.7
+    subparsers.required = True
+
+    build_parser = subparsers.add_parser(
+        "build",
+        help="Generate the OpenAPI spec and handler params tables of an application",
+    )
+    build_parser.add_argument(
+        "target",
+        help="module:attribute of an Application, a list of rules, or a factory returning either",
+    )
+    build_parser.add_argument(
+        "--output", required=True, help="Directory the artifact is written to"
+    )
+    build_parser.add_argument(
+        "--cache-dir", help="Directory for caching exception discovery and schemas"
+    )
+    build_parser.set_defaults(func=build)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
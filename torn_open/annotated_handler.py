@@ -1,11 +1,16 @@
+import datetime
 import inspect
-import json
+import time
 
 from typing import (
     Any,
     Callable,
     Dict,
+    FrozenSet,
+    List,
+    Optional,
     Pattern,
+    Tuple,
     Union,
 )
 
@@ -15,6 +20,88 @@ import pydantic
 
 from torn_open import types
 from torn_open import models
+from torn_open.cache import ResponseCache
+from torn_open.concurrency import ConcurrencyLimit
+from torn_open.executors import ExecutorPool
+from torn_open.single_flight import SingleFlight
+from torn_open.timing import RequestTiming, RequestTimings
+from torn_open.json_codecs import (
+    DEFAULT_JSON_CODEC,
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    JSONCodec,
+)
+
+# (status_code, error_type, message) of an error
+_ErrorKey = Tuple[int, str, Optional[str]]
+
+UNSUPPORTED_METHOD_ERROR: _ErrorKey = (405, "unsupported_method", None)
+INVALID_JSON_ERROR: _ErrorKey = (
+    400,
+    "invalid_request_body",
+    "request body is not valid json",
+)
+NON_OBJECT_JSON_ERROR: _ErrorKey = (
+    400,
+    "invalid_request_body",
+    "request body must be a JSON object",
+)
+INVALID_REQUEST_BODY_MESSAGE = "request body is invalid"
+CONCURRENCY_LIMIT_ERROR: _ErrorKey = (
+    503,
+    "concurrency_limit_exceeded",
+    "too many concurrent requests",
+)
+
+
+def _request_body_too_large_error(max_body_size: int) -> _ErrorKey:
+    return (
+        413,
+        "request_body_too_large",
+        f"request body exceeds {max_body_size} bytes",
+    )
+
+
+def _missing_argument_error(name: str) -> _ErrorKey:
+    return (400, "missing_argument", f"{name} is required")
+
+
+def _client_error(error: _ErrorKey) -> models.ClientError:
+    status_code, error_type, message = error
+    return models.ClientError(
+        status_code=status_code, error_type=error_type, message=message
+    )
+
+
+def _server_error(error: _ErrorKey) -> models.ServerError:
+    status_code, error_type, message = error
+    return models.ServerError(
+        status_code=status_code, error_type=error_type, message=message
+    )
+
+
+def _static_errors(method) -> FrozenSet[_ErrorKey]:
+    """
+    Errors with constant arguments raised by a handler method
+    """
+    # Imported on use, as it parses the method's source
+    from torn_open.api_spec.exception_finder import get_exceptions
+
+    errors = set()
+    for exception_class, _, kwargs in get_exceptions(method):
+        if not issubclass(exception_class, models.HTTPJsonError):
+            continue
+        status_code = kwargs.get("status_code")
+        error_type = kwargs.get("error_type")
+        message = kwargs.get("message")
+        if (
+            isinstance(status_code, int)
+            and isinstance(error_type, str)
+            and (message is None or isinstance(message, str))
+            and "errors" not in kwargs
+        ):
+            errors.add((status_code, error_type, message))
+    return frozenset(errors)
 
 
 class _HandlerClassParams:
@@ -28,6 +115,14 @@ class _HandlerClassParams:
         self.query_params = {}
         self.json_param = {}
         self.response_models = {}
+        self.response_streams = {}
+        self.trusted_responses = {}
+        self.response_caches = {}
+        self.single_flights = {}
+        self.concurrency_limits = {}
+        self.executor_pools = {}
+        self.params_parsers = {}
+        self._init_error_bodies()
 
         for http_method in handler_class.SUPPORTED_METHODS:
             http_method = http_method.lower()
@@ -40,6 +135,125 @@ class _HandlerClassParams:
             self._set_json_param_names(method)
             self._set_response_models(method)
 
+        for method_name in self.query_params:
+            self.params_parsers[method_name] = _HandlerParamsParser.compile(
+                self, method_name
+            )
+
+    # Tables that can be serialized and loaded instead of introspecting the handler
+    SERIALIZABLE_TABLES = (
+        "path_params",
+        "query_params",
+        "json_param",
+        "response_models",
+        "response_streams",
+        "trusted_responses",
+    )
+
+    def to_tables(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.SERIALIZABLE_TABLES}
+
+    @classmethod
+    def from_tables(
+        cls, handler_class, tables: Dict[str, Any]
+    ) -> "_HandlerClassParams":
+        """
+        Restores params from `to_tables`. Response caches, single flights, concurrency limits and executor pools
+        are taken from the handler methods and parsers are recompiled.
+        """
+        self = cls.__new__(cls)
+        self.handler_class = handler_class
+        for name in cls.SERIALIZABLE_TABLES:
+            setattr(self, name, tables[name])
+        self.response_caches = {
+            method_name: getattr(
+                getattr(handler_class, method_name), "response_cache", None
+            )
+            for method_name in self.response_models
+        }
+        self.single_flights = {
+            method_name: getattr(
+                getattr(handler_class, method_name), "single_flight", None
+            )
+            for method_name in self.response_models
+        }
+        self.concurrency_limits = {
+            method_name: _concurrency_limit(
+                handler_class, getattr(handler_class, method_name)
+            )
+            for method_name in self.response_models
+        }
+        self.executor_pools = {
+            method_name: getattr(
+                getattr(handler_class, method_name), "executor_pool", None
+            )
+            for method_name in self.response_models
+        }
+        self.params_parsers = {
+            method_name: _HandlerParamsParser.compile(self, method_name)
+            for method_name in self.query_params
+        }
+        self._init_error_bodies()
+        return self
+
+    def set_tag_concurrency_limits(
+        self, tag_concurrency_limits: Dict[str, ConcurrencyLimit]
+    ):
+        """
+        Sets the limit of the first tag of each method with a limit, for methods without a limit of their own
+        or of the handler class
+        """
+        for method_name, concurrency_limit in self.concurrency_limits.items():
+            if concurrency_limit is not None:
+                continue
+            method = getattr(self.handler_class, method_name)
+            for tag in getattr(method, "_openapi_tags", None) or ():
+                if tag in tag_concurrency_limits:
+                    self.concurrency_limits[method_name] = tag_concurrency_limits[tag]
+                    self._known_errors.pop(method_name, None)
+                    break
+
+    def set_sync_method_executor(self, executor_pool: ExecutorPool):
+        """
+        Sets the pool of synchronous methods without a pool of their own. Streamed responses are iterated on the IOLoop,
+        so methods returning them keep running there.
+        """
+        for method_name, method_executor_pool in self.executor_pools.items():
+            method = getattr(self.handler_class, method_name)
+            if (
+                method_executor_pool is None
+                and self.response_streams[method_name] is None
+                and not _is_async(method)
+            ):
+                self.executor_pools[method_name] = executor_pool
+
+    def _init_error_bodies(self):
+        # Encoded bodies of errors that do not depend on the request, by codec and error
+        self.error_bodies: Dict[Tuple[JSONCodec, int, str, Optional[str]], bytes] = {}
+        self._known_errors: Dict[str, FrozenSet[_ErrorKey]] = {}
+
+    def known_errors(self, method_name: str) -> FrozenSet[_ErrorKey]:
+        """
+        Errors with constant arguments that the method, or the parsing of its params, can raise.
+        Found on first use, as finding the errors raised by the method parses its source.
+        """
+        known_errors = self._known_errors.get(method_name)
+        if known_errors is None:
+            errors = {UNSUPPORTED_METHOD_ERROR}
+            params_parser = self.params_parsers.get(method_name)
+            if params_parser is not None:
+                errors |= params_parser.constant_errors
+            max_body_size = self.handler_class.max_json_body_size
+            if max_body_size is not None:
+                errors.add(_request_body_too_large_error(max_body_size))
+            if self.concurrency_limits.get(method_name) is not None:
+                errors.add(CONCURRENCY_LIMIT_ERROR)
+            method = getattr(self.handler_class, method_name, None)
+            if method_name in self.response_models and method is not None:
+                errors |= _static_errors(method)
+            known_errors = self._known_errors[method_name] = frozenset(errors)
+        return known_errors
+
     def _set_path_param_names(self, method, rule: Union[Pattern, str]):
         if isinstance(rule, str):
             return
@@ -119,98 +333,354 @@ class _HandlerClassParams:
             if signature.return_annotation != inspect._empty
             else None
         )
+        response_stream = None
+        if types.is_iterator(response_model):
+            item_types = getattr(response_model, "__args__", None)
+            response_model = item_types[0] if item_types else None
+            response_stream = _ResponseStream(
+                media_type=getattr(
+                    method, "_response_stream_media_type", NDJSON_MEDIA_TYPE
+                ),
+                batch_size=getattr(method, "_response_stream_batch_size", 1),
+            )
         self.response_models[method.__name__] = response_model
+        self.response_streams[method.__name__] = response_stream
+        self.trusted_responses[method.__name__] = getattr(
+            method, "_trusted_response", False
+        ) or getattr(self.handler_class, "_trusted_response", False)
 
+        response_cache = getattr(method, "response_cache", None)
+        if response_cache is not None and response_stream is not None:
+            raise ValueError(
+                f"{self.handler_class.__name__}.{method.__name__}:"
+                " streamed responses cannot be cached"
+            )
+        self.response_caches[method.__name__] = response_cache
 
-class _HandlerParamsParser:
-    def __init__(self, handler):
-        self.handler = handler
-        self.handler_class_params = handler.handler_class_params
+        single_flight = getattr(method, "single_flight", None)
+        if single_flight is not None and response_stream is not None:
+            raise ValueError(
+                f"{self.handler_class.__name__}.{method.__name__}:"
+                " streamed responses cannot be shared"
+            )
+        self.single_flights[method.__name__] = single_flight
+        self.concurrency_limits[method.__name__] = _concurrency_limit(
+            self.handler_class, method
+        )
 
-    def _collect_params(
-        self,
-        cls_http_method: Callable,
-        path_kwargs,
-    ) -> Dict[str, Any]:
-        method = cls_http_method.__name__
+        executor_pool = getattr(method, "executor_pool", None)
+        if executor_pool is not None and (
+            response_stream is not None or _is_async(method)
+        ):
+            raise ValueError(
+                f"{self.handler_class.__name__}.{method.__name__}:"
+                " only synchronous methods without streamed responses can run in an executor"
+            )
+        self.executor_pools[method.__name__] = executor_pool
 
-        path_kwargs = self._parse_path_params(path_kwargs)
-        query_kwargs = self._parse_query_params(method)
-        json_kwarg = {}
-        if self.handler_class_params.json_param[method]:
-            json_kwarg = self._parse_json_param(method)
 
-        return {
-            **path_kwargs,
-            **query_kwargs,
-            **json_kwarg,
-        }
+def _is_async(method) -> bool:
+    # Decorators wrap methods in synchronous functions
+    method = inspect.unwrap(method)
+    return inspect.iscoroutinefunction(method) or inspect.isasyncgenfunction(method)
+
+
+def _concurrency_limit(handler_class, method) -> Optional[ConcurrencyLimit]:
+    """
+    Limit of the method, or the limit shared by the methods of the handler class
+    """
+    concurrency_limit = getattr(method, "concurrency_limit", None)
+    if concurrency_limit is None:
+        concurrency_limit = handler_class.concurrency_limit
+    return concurrency_limit
+
+
+class _EncodedResponse:
+    """
+    Serialized response of a handler method. A status code of None keeps the status set by the handler.
+    """
+
+    __slots__ = ("status_code", "headers", "body")
+
+    def __init__(
+        self, status_code: Optional[int], headers: Dict[str, str], body: Optional[bytes]
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+
+def _is_model_class(annotation) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, pydantic.BaseModel)
+
+
+class _ResponseStream:
+    """
+    How the items of a method that returns an iterator are written
+    """
+
+    __slots__ = ("media_type", "batch_size")
+
+    def __init__(self, media_type: str, batch_size: int):
+        self.media_type = media_type
+        self.batch_size = batch_size
+
+    @property
+    def is_json_array(self) -> bool:
+        return self.media_type == JSON_MEDIA_TYPE
+
+
+async def _iterate(items):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
 
-    def _parse_path_params(self, path_kwargs) -> Dict[str, str]:
-        returned_path_kwargs = {}
-        for name, val in path_kwargs.items():
-            returned_path_kwargs[name] = self._parse_path_param(val, name)
-        return returned_path_kwargs
 
-    def _parse_path_param(self, val: Any, name: str):
-        parameter: inspect.Parameter = self.handler_class_params.path_params[name]
-        param_type = parameter.annotation
+def _completed_future() -> tornado.concurrent.Future:
+    future = tornado.concurrent.Future()
+    future.set_result(None)
+    return future
+
+
+class _InMemoryConnection:
+    """
+    HTTP connection of a request handled in-process, which collects the response in memory instead of writing it to a socket
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.status_code: Optional[int] = None
+        self.headers: Optional[tornado.httputil.HTTPHeaders] = None
+        self.chunks: List[bytes] = []
+        self.finished = tornado.concurrent.Future()
+
+    def set_close_callback(self, callback):
+        pass
+
+    def write_headers(
+        self, start_line, headers: tornado.httputil.HTTPHeaders, chunk: bytes = None
+    ):
+        self.status_code = start_line.code
+        self.headers = headers
+        if chunk:
+            self.chunks.append(chunk)
+        return _completed_future()
+
+    def write(self, chunk: bytes):
+        self.chunks.append(chunk)
+        return _completed_future()
+
+    def finish(self):
+        tornado.concurrent.future_set_result_unless_cancelled(self.finished, None)
+
+
+class _RevalidationConnection(_InMemoryConnection):
+    """
+    Connection of a copy of a request that refreshes a stale cached response in the background
+    """
+
+
+async def _handle_in_process(
+    delegate: tornado.httputil.HTTPMessageDelegate,
+    request: tornado.httputil.HTTPServerRequest,
+    body: bytes,
+):
+    """
+    Feeds the request to the handler as the HTTP server would, so that handlers streaming
+    their request body receive it too, and waits until the response is finished
+    """
+    start_line = tornado.httputil.RequestStartLine(
+        request.method, request.uri, request.version
+    )
+    prepared = delegate.headers_received(start_line, request.headers)
+    if prepared is not None:
+        await prepared
+    if body:
+        received = delegate.data_received(body)
+        if received is not None:
+            await received
+    delegate.finish()
+    await request.connection.finished
+
+
+def _client_error_from_validation_error(
+    location: str, name: str, e: types.ValidationError
+):
+    return models.ClientError(
+        status_code=400,
+        error_type=e.type,
+        message=f"{e.type} for {name}: {e.value}",
+        errors=[{"loc": [location, name], "type": e.type, "value": e.value}],
+    )
+
+
+def _compile_path_param(name: str, parameter: inspect.Parameter):
+    caster = types.compile_caster(parameter.annotation)
+
+    def parse_path_param(handler, path_kwargs):
         try:
-            return types.cast(param_type, val)
+            return caster(path_kwargs[name])
         except types.ValidationError as e:
-            raise models.ClientError(
-                status_code=400,
-                error_type=e.type,
-                message=f"{e.type} for {name}: {e.value}",
-            ) from e
+            raise _client_error_from_validation_error("path", name, e) from e
+
+    return parse_path_param
+
+
+def _compile_query_param(name: str, parameter: inspect.Parameter):
+    parameter_type = parameter.annotation
+    caster = types.compile_caster(parameter_type)
 
-    def _parse_query_params(self, http_method):
-        query_kwargs = {}
-        for name, parameter in self.handler_class_params.query_params[
-            http_method
-        ].items():
-            query_kwargs[name] = self._parse_query_param(name, parameter)
-        return query_kwargs
+    if parameter.default is not inspect._empty:
+        has_default, default = True, parameter.default
+    elif types.is_optional(parameter_type):
+        has_default, default = True, None
+    else:
+        has_default, default = False, None
+    missing_argument_error = _missing_argument_error(name)
 
-    def _parse_query_param(self, name, parameter):
-        parameter_type = parameter.annotation
+    if types.is_sequence(parameter_type):
 
-        query_kwarg = self.handler.get_query_argument(name, default=None)
+        def get_query_argument(handler):
+            # Repeated keys are joined into comma separated values, each
+            # stripped of whitespace and control characters like single values
+            return ",".join(handler.get_query_arguments(name))
+
+    else:
+
+        def get_query_argument(handler):
+            return handler.get_query_argument(name, default=None)
+
+    def parse_query_param(handler, path_kwargs):
+        query_kwarg = get_query_argument(handler)
 
         if query_kwarg:
             try:
-                return types.cast(parameter_type, query_kwarg)
+                return caster(query_kwarg)
             except types.ValidationError as e:
-                raise models.ClientError(
-                    status_code=400,
-                    error_type=e.type,
-                    message=f"{e.type} for {name}: {e.value}",
-                ) from e
-
-        if parameter.default != inspect._empty:
-            return parameter.default
-        elif types.is_optional(parameter_type):
-            return None
-        raise models.ClientError(
-            status_code=400,
-            error_type="missing_argument",
-            message=f"{name} is required",
-        )
+                raise _client_error_from_validation_error("query", name, e) from e
+
+        if has_default:
+            return default
+        raise _client_error(missing_argument_error)
+
+    return parse_query_param
 
-    def _parse_json_param(self, http_method):
-        param_name, parameter = self.handler_class_params.json_param[http_method]
-        request_model = parameter.annotation
-        request_dict = json.loads(self.handler.request.body)
+
+def _compile_json_param(parameter: inspect.Parameter):
+    request_model = parameter.annotation
+
+    def parse_json_param(handler, path_kwargs):
         try:
-            request_object = request_model(**request_dict)
+            request_dict = handler.json_codec.loads(handler._pop_json_body())
+        except ValueError as e:
+            raise _client_error(INVALID_JSON_ERROR) from e
+        if not isinstance(request_dict, dict):
+            raise _client_error(NON_OBJECT_JSON_ERROR)
+        try:
+            return request_model(**request_dict)
         except pydantic.error_wrappers.ValidationError as e:
             raise models.ClientError(
                 status_code=400,
                 error_type="invalid_request_body",
-                message=str(e.errors()),
+                message=INVALID_REQUEST_BODY_MESSAGE,
+                errors=[
+                    {
+                        "loc": ["body", *error["loc"]],
+                        "type": error["type"],
+                        "msg": error["msg"],
+                    }
+                    for error in e.errors()
+                ],
             )
 
-        return {param_name: request_object}
+    return parse_json_param
+
+
+class _HandlerParamsParser:
+    """
+    Precompiled parser for the params of a single http method of a handler.
+
+    Parsers are built once when the handler is registered, so that parsing a request
+    only involves a single pass over the declared params.
+    """
+
+    def __init__(
+        self,
+        param_parsers: Tuple[Tuple[str, Callable], ...],
+        constant_errors: FrozenSet[_ErrorKey] = frozenset(),
+        error_types: FrozenSet[str] = frozenset(),
+    ):
+        self.param_parsers = param_parsers
+        # Errors raised by the parsers that do not depend on the request
+        self.constant_errors = constant_errors
+        # error_type of every error raised by the parsers
+        self.error_types = error_types
+
+    @classmethod
+    def compile(
+        cls, handler_class_params: _HandlerClassParams, method_name: str
+    ) -> Optional["_HandlerParamsParser"]:
+        """
+        Returns None if the method declares no params, in which case parsing can be skipped
+        """
+        param_parsers = [
+            (name, _compile_path_param(name, parameter))
+            for name, parameter in handler_class_params.path_params.items()
+        ]
+        param_parsers += [
+            (name, _compile_query_param(name, parameter))
+            for name, parameter in handler_class_params.query_params[
+                method_name
+            ].items()
+        ]
+        constant_errors = {
+            _missing_argument_error(name)
+            for name, parameter in handler_class_params.query_params[
+                method_name
+            ].items()
+        }
+        json_param = handler_class_params.json_param[method_name]
+        if json_param:
+            param_name, parameter = json_param
+            param_parsers.append((param_name, _compile_json_param(parameter)))
+            constant_errors.add(INVALID_JSON_ERROR)
+            constant_errors.add(NON_OBJECT_JSON_ERROR)
+
+        if not param_parsers:
+            return None
+        error_types = {error_type for _, error_type, _ in constant_errors}
+        if handler_class_params.path_params or handler_class_params.query_params[
+            method_name
+        ]:
+            error_types |= types.CAST_ERROR_TYPES
+        return cls(
+            tuple(param_parsers), frozenset(constant_errors), frozenset(error_types)
+        )
+
+    def _collect_params(self, handler, path_kwargs) -> Dict[str, Any]:
+        return {
+            name: parse_param(handler, path_kwargs)
+            for name, parse_param in self.param_parsers
+        }
+
+
+def stream_json_body(max_body_size: Optional[int] = None):
+    """
+    Class decorator for AnnotatedHandlers that receive large json bodies.
+
+    The request body is read into a single buffer as it arrives instead of being buffered
+    by Tornado first, and requests larger than `max_body_size` bytes are rejected with a 413 error.
+    """
+
+    def decorator(cls):
+        cls = tornado.web.stream_request_body(cls)
+        cls.max_json_body_size = max_body_size
+        return cls
+
+    return decorator
 
 
 class AnnotatedHandler(tornado.web.RequestHandler):
@@ -219,10 +689,297 @@ class AnnotatedHandler(tornado.web.RequestHandler):
     string to the inherited handler overwrite this doc string.
     """
 
+    max_json_body_size: Optional[int] = None
+    # Limit of in-flight executions shared by the methods of the handler without their own limit
+    concurrency_limit: Optional[ConcurrencyLimit] = None
+    # error_type of the ClientError or ServerError raised by the handler method
+    _error_type: Optional[str] = None
+    # None when request timing is disabled
+    _request_timings: Optional[RequestTimings] = None
+    _json_body: Optional[bytearray] = None
+    _json_body_too_large = False
+
     @classmethod
     def _set_params(cls, rule: Pattern):
         cls.handler_class_params = _HandlerClassParams(cls, rule)
 
+    @classmethod
+    def _load_params(cls, tables: Dict[str, Any]):
+        cls.handler_class_params = _HandlerClassParams.from_tables(cls, tables)
+
+    def data_received(self, chunk: bytes):
+        """
+        Buffers streamed request bodies for handlers decorated with `stream_json_body`
+        """
+        if self._finished or self._json_body_too_large:
+            return
+        if self._json_body is None:
+            self._json_body = bytearray()
+
+        max_body_size = self.max_json_body_size
+        if (
+            max_body_size is not None
+            and len(self._json_body) + len(chunk) > max_body_size
+        ):
+            self._json_body_too_large = True
+            self._json_body = None
+            return
+        self._json_body += chunk
+
+    def _check_json_body_size(self):
+        max_body_size = self.max_json_body_size
+        content_length = self.request.headers.get("Content-Length")
+        if self._json_body_too_large or (
+            max_body_size is not None
+            and content_length is not None
+            and int(content_length) > max_body_size
+        ):
+            raise _client_error(_request_body_too_large_error(max_body_size))
+
+    def _pop_json_body(self):
+        if not tornado.web._has_stream_request_body(self.__class__):
+            return self.request.body
+        json_body, self._json_body = self._json_body, None
+        # Kept on the request, as for other handlers, so that the request can be handled again
+        # to revalidate cached responses
+        self.request.body = json_body or b""
+        return self.request.body
+
+    def _start_request_timings(self) -> Optional[RequestTimings]:
+        if self.settings.get("request_timing") is None:
+            return None
+        return RequestTimings(self.request.method)
+
+    def finish(self, chunk=None):
+        timings = self._request_timings
+        if timings is not None and not self._headers_written:
+            # Set here, as error responses clear the headers set before them
+            if self.settings["request_timing"].server_timing:
+                self.set_header("Server-Timing", timings.server_timing())
+        return super().finish(chunk)
+
+    def _record_request_timings(self, timings: RequestTimings):
+        request_timing: RequestTiming = self.settings["request_timing"]
+        request_timing.record(self, timings)
+
+    @property
+    def json_codec(self) -> JSONCodec:
+        return self.settings.get("json_codec", DEFAULT_JSON_CODEC)
+
+    def _build_response_model(self, method_name: str, data):
+        """
+        Builds the annotated response model from dicts returned by the handler method.
+        Trusted responses are built without validation, except in debug mode.
+        """
+        response_model = self.handler_class_params.response_models[method_name]
+        if not isinstance(data, dict) or not _is_model_class(response_model):
+            return data
+
+        is_trusted = self.handler_class_params.trusted_responses[
+            method_name
+        ] or self.settings.get("trusted_responses", False)
+        if is_trusted and not self.settings.get("debug", False):
+            return response_model.construct(**data)
+        return response_model(**data)
+
+    def _encode_response(self, method_name: str, result) -> _EncodedResponse:
+        status_code, headers = None, {}
+        if isinstance(result, models.Response):
+            status_code, headers = result.status_code, result.headers
+            result = result.model
+
+        result = self._build_response_model(method_name, result)
+        body = None
+        if isinstance(result, pydantic.BaseModel):
+            body = self.json_codec.dumps_model(result)
+        return _EncodedResponse(status_code, headers, body)
+
+    def _encode_error(self, e: models.HTTPJsonError) -> bytes:
+        """
+        Errors with constant arguments are encoded once per handler class and codec
+        """
+        json_codec = self.json_codec
+        if e.errors is not None:
+            return json_codec.dumps(e.json())
+
+        params = self.handler_class_params
+        key = (json_codec, e.status_code, e.type, e.message)
+        body = params.error_bodies.get(key)
+        if body is None:
+            body = json_codec.dumps(e.json())
+            if key[1:] in params.known_errors(self.request.method.lower()):
+                params.error_bodies[key] = body
+        return body
+
+    def _write_response(self, response: _EncodedResponse):
+        if response.status_code is not None:
+            self.set_status(response.status_code)
+        for name, value in response.headers.items():
+            self.set_header(name, value)
+        if response.body is not None:
+            self.set_header("Content-Type", self.json_codec.content_type)
+            self.write(response.body)
+
+    def _call(self, method_name: str, method, params: dict):
+        """
+        Calls the method, in its executor pool if it has one
+        """
+        executor_pool = self.handler_class_params.executor_pools.get(method_name)
+        if executor_pool is None:
+            return method(**params)
+        return executor_pool.run_method(self, method_name, params)
+
+    async def _call_method(
+        self, method_name: str, method, params: dict
+    ) -> Optional[_EncodedResponse]:
+        """
+        Returns the encoded response of the method, or None if it returned nothing or finished the request itself
+        """
+        result = self._call(method_name, method, params)
+        if inspect.isawaitable(result):
+            result = await result
+        if result is None or self._finished:
+            return None
+        return self._encode_response(method_name, result)
+
+    async def _call_single_flight(
+        self, method_name: str, method, params: dict, single_flight: SingleFlight
+    ) -> Optional[_EncodedResponse]:
+        key = single_flight.key(self.__class__, params)
+        if key is None:
+            return await self._call_method(method_name, method, params)
+        in_flight = single_flight.join(key)
+        if in_flight is None:
+            response, exception = None, None
+            try:
+                response = await self._call_method(method_name, method, params)
+                return response
+            except Exception as e:
+                exception = e
+                raise
+            finally:
+                single_flight.finish(key, response, exception)
+
+        try:
+            response, exception = await tornado.gen.with_timeout(
+                datetime.timedelta(seconds=single_flight.max_wait), in_flight
+            )
+        except tornado.util.TimeoutError:
+            single_flight.timeouts += 1
+            return await self._call_method(method_name, method, params)
+        if exception is not None:
+            single_flight.coalesced += 1
+            raise exception
+        if response is None:
+            # The output of the execution was written by the handler and cannot be shared
+            return await self._call_method(method_name, method, params)
+        single_flight.coalesced += 1
+        return response
+
+    async def _write_cached_response(
+        self,
+        method_name: str,
+        method,
+        params: dict,
+        response_cache: ResponseCache,
+        single_flight: Optional[SingleFlight],
+    ):
+        cache_key = response_cache.key(self.__class__, self.request.path, params)
+        if cache_key is None or isinstance(
+            self.request.connection, _RevalidationConnection
+        ):
+            # Params that cannot be hashed are not cached, and revalidations skip the stale response
+            response, is_stale = None, False
+        else:
+            response, is_stale = response_cache.get(cache_key)
+        is_cached = response is not None
+        if response is None:
+            if single_flight is not None:
+                response = await self._call_single_flight(
+                    method_name, method, params, single_flight
+                )
+            else:
+                response = await self._call_method(method_name, method, params)
+            if response is None:
+                return
+            if cache_key is not None and (
+                response.status_code is None or 200 <= response.status_code < 300
+            ):
+                response_cache.set(cache_key, response)
+                is_cached = True
+        elif is_stale and response_cache.start_revalidation(cache_key):
+            tornado.ioloop.IOLoop.current().spawn_callback(
+                self._revalidate_cached_response, response_cache, cache_key
+            )
+
+        if is_cached:
+            # Responses that are not cached here must not be cached downstream either
+            self.set_header("Cache-Control", response_cache.cache_control)
+        self._write_response(response)
+
+    async def _revalidate_cached_response(
+        self, response_cache: ResponseCache, cache_key
+    ):
+        """
+        Handles a copy of the request with a new handler, through the same routing, concurrency limits
+        and executor pools as other requests, which caches its response in place of the stale one
+        """
+        try:
+            connection = _RevalidationConnection(
+                getattr(self.request.connection, "context", None)
+            )
+            request = tornado.httputil.HTTPServerRequest(
+                method=self.request.method,
+                uri=self.request.uri,
+                version=self.request.version,
+                headers=tornado.httputil.HTTPHeaders(self.request.headers),
+                connection=connection,
+            )
+            delegate = self.application.find_handler(request)
+            await _handle_in_process(delegate, request, bytes(self.request.body))
+        except Exception:
+            tornado.log.app_log.error(
+                "Exception revalidating cached response", exc_info=True
+            )
+        finally:
+            response_cache.finish_revalidation(cache_key)
+
+    async def _write_response_stream(
+        self, method_name: str, items, response_stream: _ResponseStream
+    ):
+        json_codec = self.json_codec
+        is_json_array = response_stream.is_json_array
+        if is_json_array:
+            self.set_header("Content-Type", json_codec.content_type)
+            chunks = [b"["]
+        else:
+            self.set_header("Content-Type", response_stream.media_type)
+            chunks = []
+
+        count = 0
+        async for item in _iterate(items):
+            if is_json_array and count:
+                chunks.append(b",")
+            item = self._build_response_model(method_name, item)
+            if isinstance(item, pydantic.BaseModel):
+                chunks.append(json_codec.dumps_model(item))
+            else:
+                chunks.append(json_codec.dumps(item))
+            if not is_json_array:
+                chunks.append(b"\n")
+
+            count += 1
+            if count % response_stream.batch_size == 0:
+                self.write(b"".join(chunks))
+                chunks = []
+                # Wait for the batch to be written to the socket before producing more
+                await self.flush()
+
+        if is_json_array:
+            chunks.append(b"]")
+        if chunks:
+            self.write(b"".join(chunks))
+
     @tornado.gen.coroutine
     def _execute(self, transforms, *args, **kwargs):
         """
@@ -231,11 +988,13 @@ class AnnotatedHandler(tornado.web.RequestHandler):
         Executes this request with the given output transforms.
         """
         self._transforms = transforms
+        # None when request timing is disabled
+        timings = self._request_timings = self._start_request_timings()
+        # Set once a slot of the method's concurrency limit is acquired
+        concurrency_limit = None
         try:
             if self.request.method not in self.SUPPORTED_METHODS:
-                raise models.ClientError(
-                    status_code=405, error_type="unsupported_method"
-                )
+                raise _client_error(UNSUPPORTED_METHOD_ERROR)
 
             self.path_kwargs = dict(
                 (k, self.decode_argument(v, name=k)) for (k, v) in kwargs.items()
@@ -255,10 +1014,14 @@ class AnnotatedHandler(tornado.web.RequestHandler):
                 ]
             ):
                 self.check_xsrf_cookie()
+                if timings is not None:
+                    timings.mark("xsrf")
 
             result = self.prepare()
             if result is not None:
                 result = yield result
+            if timings is not None:
+                timings.mark("prepare")
             if self._prepared_future is not None:
                 # Tell the Application we've finished with prepare()
                 # and are ready for the body to arrive.
@@ -269,40 +1032,105 @@ class AnnotatedHandler(tornado.web.RequestHandler):
             if self._finished:
                 return
 
+            method_name = self.request.method.lower()
+            method_concurrency_limit = self.handler_class_params.concurrency_limits.get(
+                method_name
+            )
+            if method_concurrency_limit is not None:
+                # Rejected requests are answered before their body is read and parsed
+                is_acquired = yield method_concurrency_limit.acquire()
+                if not is_acquired:
+                    self.set_header(
+                        "Retry-After", str(method_concurrency_limit.retry_after)
+                    )
+                    raise _server_error(CONCURRENCY_LIMIT_ERROR)
+                concurrency_limit = method_concurrency_limit
+                acquired_at = time.monotonic()
+                if timings is not None:
+                    timings.mark("queue")
+
             if tornado.web._has_stream_request_body(self.__class__):
+                # Reject bodies that are declared to be too large before reading them
+                self._check_json_body_size()
                 # In streaming mode request.body is a Future that signals
                 # the body has been completely received.  The Future has no
                 # result; the data has been passed to self.data_received
                 # instead.
+                # Tornado 6 moved the Future from request.body to request._body_future.
                 try:
-                    yield self.request.body
+                    yield getattr(self.request, "_body_future", self.request.body)
                 except tornado.iostream.StreamClosedError:
                     return
+                self._check_json_body_size()
+                if timings is not None:
+                    timings.mark("body")
 
             # Added handling of annotated path, query and json params here
-            method = getattr(self, self.request.method.lower())
-            params_parser = _HandlerParamsParser(self)
-            params: dict = params_parser._collect_params(method, self.path_kwargs)
+            method = getattr(self, method_name)
+            params_parser = self.handler_class_params.params_parsers.get(method_name)
+            params: dict = (
+                params_parser._collect_params(self, self.path_kwargs)
+                if params_parser
+                else {}
+            )
+            if timings is not None:
+                timings.mark("bind")
             # End
 
-            result = method(**params)
-            if result is not None:
-                result = yield result
-            if all(
-                [
-                    result,
-                    isinstance(result, models.ResponseModel),
-                    not self._finished,
-                ]
-            ):
-                self.write(result.json())
+            response_cache = self.handler_class_params.response_caches.get(method_name)
+            single_flight = self.handler_class_params.single_flights.get(method_name)
+            if response_cache is not None:
+                yield self._write_cached_response(
+                    method_name, method, params, response_cache, single_flight
+                )
+                if timings is not None:
+                    timings.mark("cache")
+            elif single_flight is not None:
+                response = yield self._call_single_flight(
+                    method_name, method, params, single_flight
+                )
+                if timings is not None:
+                    timings.mark("single_flight")
+                if response is not None:
+                    self._write_response(response)
+            else:
+                result = self._call(method_name, method, params)
+                if inspect.isawaitable(result):
+                    result = yield result
+                if timings is not None:
+                    timings.mark("handler")
+                response_stream = self.handler_class_params.response_streams.get(
+                    method_name
+                )
+                if response_stream is not None:
+                    yield self._write_response_stream(
+                        method_name, result, response_stream
+                    )
+                    if timings is not None:
+                        timings.mark("stream")
+                elif result is not None and not self._finished:
+                    response = self._encode_response(method_name, result)
+                    if timings is not None:
+                        timings.mark("serialize")
+                    self._write_response(response)
             if self._auto_finish and not self._finished:
                 self.finish()
         except (models.ClientError, models.ServerError) as e:
+            self._error_type = e.type
+            if timings is not None:
+                timings.mark("error")
+            if self._headers_written:
+                # The error was raised midway through a streamed response, so
+                # the status can no longer be changed.
+                self._handle_request_exception(e)
+                return
             self.set_status(e.status_code)
-            self.write(e.json())
+            self.set_header("Content-Type", self.json_codec.content_type)
+            self.write(self._encode_error(e))
             self.finish()
         except Exception as e:
+            if timings is not None:
+                timings.mark("error")
             try:
                 self._handle_request_exception(e)
             except Exception:
@@ -318,3 +1146,8 @@ class AnnotatedHandler(tornado.web.RequestHandler):
                 # now (to unblock the HTTP server).  Note that this is not
                 # in a finally block to avoid GC issues prior to Python 3.4.
                 self._prepared_future.set_result(None)
+        finally:
+            if timings is not None:
+                self._record_request_timings(timings)
+            if concurrency_limit is not None:
+                concurrency_limit.release(time.monotonic() - acquired_at)
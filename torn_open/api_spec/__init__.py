@@ -1,8 +1,41 @@
-from torn_open.api_spec.decorators import tags, summary
-from torn_open.api_spec.create_api_spec import create_api_spec
+import importlib
+import sys
+
+from torn_open.api_spec.decorators import (
+    tags,
+    summary,
+    stream_response,
+    trusted_response,
+)
+from torn_open.routing import register_handlers
 
 __all__ = [
     "tags",
     "summary",
+    "stream_response",
+    "trusted_response",
     "create_api_spec",
+    "register_handlers",
+    "build_api_spec",
 ]
+
+# Spec generation pulls in apispec and the plugin, so it is only imported when a spec is first built
+_LAZY_ATTRIBUTES = ("create_api_spec", "build_api_spec")
+
+
+def _import_spec_builder():
+    module = importlib.import_module("torn_open.api_spec.builder")
+    for name in _LAZY_ATTRIBUTES:
+        globals()[name] = getattr(module, name)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        _import_spec_builder()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ is not supported
+    _import_spec_builder()
@@ -0,0 +1,42 @@
+from typing import Optional, Pattern, Union, Tuple, List
+
+from tornado.web import url
+from tornado.routing import Matcher
+
+from torn_open.annotated_handler import AnnotatedHandler
+from torn_open.api_spec.core import TornOpenAPISpec
+from torn_open.api_spec.plugin import TornOpenPlugin
+from torn_open.api_spec.spec_cache import SpecCache
+from torn_open.routing import register_handlers, _Rule
+
+
+def build_api_spec(
+    handlers: List[Tuple[Union[Matcher, Pattern], AnnotatedHandler]],
+    cache_dir: Optional[str] = None,
+) -> TornOpenAPISpec:
+    """
+    Arguments:
+        handlers: registered handlers, as returned by `register_handlers`
+        cache_dir: directory for persisting exception discovery and model schemas across restarts
+    """
+    spec_cache = SpecCache(cache_dir) if cache_dir else None
+    api_spec = TornOpenAPISpec(
+        title="tornado-server",
+        version="1.0.0",
+        openapi_version="3.0.0",
+        plugins=[TornOpenPlugin()],
+        spec_cache=spec_cache,
+    )
+    for matcher, target in handlers:
+        api_spec.path(
+            url_spec=url(matcher, target),
+            handler_class=target,
+            description=target.__doc__,
+        )
+    if spec_cache:
+        spec_cache.save()
+    return api_spec
+
+
+def create_api_spec(rules: List[_Rule]) -> TornOpenAPISpec:
+    return build_api_spec(register_handlers(rules))
@@ -1,7 +1,48 @@
+from typing import Dict, Hashable, Optional, Set
+
 from apispec.core import APISpec, Components
 
+from torn_open.api_spec.spec_cache import SpecCache
+
+
+class ParameterSchema:
+    """
+    Schema of a parameter annotation and default, without the title derived from the parameter name
+    """
+
+    __slots__ = ("schema", "has_title", "definitions")
+
+    def __init__(self, schema: dict, has_title: bool, definitions: Dict[str, dict]):
+        self.schema = schema
+        self.has_title = has_title
+        self.definitions = definitions
+
+
+# Parameter schemas memoized per process, keyed by (annotation, default)
+PARAMETER_SCHEMAS: Dict[Hashable, ParameterSchema] = {}
+
 
 class TornOpenComponents(Components):
+    def __init__(
+        self, plugins, openapi_version, spec_cache: Optional[SpecCache] = None
+    ):
+        super().__init__(plugins, openapi_version)
+        self.spec_cache = spec_cache
+        self.parameter_schemas = PARAMETER_SCHEMAS
+        self._registered_parameter_schemas: Set[Hashable] = set()
+
+    def register_parameter_schema(
+        self, key: Hashable, parameter_schema: ParameterSchema
+    ):
+        """
+        Registers the definitions referenced by a parameter schema, once per spec
+        """
+        if key in self._registered_parameter_schemas:
+            return
+        self._registered_parameter_schemas.add(key)
+        for component_id, component in parameter_schema.definitions.items():
+            self.schema(component_id, component)
+
     def schema(self, component_id, component, **kwargs):
         if self.schemas.get(component_id) == component:
             return self
@@ -9,8 +50,18 @@ class TornOpenComponents(Components):
         super().schema(component_id, component, **kwargs)
 
 class TornOpenAPISpec(APISpec):
-    def __init__(self, title, version, openapi_version, plugins=(), **options):
+    def __init__(
+        self,
+        title,
+        version,
+        openapi_version,
+        plugins=(),
+        spec_cache: Optional[SpecCache] = None,
+        **options
+    ):
         super().__init__(title, version, openapi_version, plugins, **options)
 
         # Override default Components used
-        self.components = TornOpenComponents(self.plugins, self.openapi_version)
+        self.components = TornOpenComponents(
+            self.plugins, self.openapi_version, spec_cache
+        )
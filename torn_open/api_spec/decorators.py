@@ -1,4 +1,7 @@
 from functools import wraps
+import inspect
+
+from torn_open.json_codecs import NDJSON_MEDIA_TYPE, JSON_MEDIA_TYPE
 
 
 # Decorators
@@ -92,3 +95,71 @@ def summary(summary_text):
         return wrapper
 
     return decorator
+
+
+def stream_response(media_type: str = NDJSON_MEDIA_TYPE, batch_size: int = 1):
+    """
+    Operations annotated as returning an `Iterator`, `AsyncIterator` or a generator of response models are streamed to the client item by item.
+    By default, items are written as newline delimited JSON and flushed one at a time.
+    The `stream_response` decorator changes how the items are written.
+
+    Arguments:
+        media_type: `application/x-ndjson` to write one JSON document per line, or `application/json` to write the items as a single JSON array
+        batch_size: Number of items written before the response is flushed to the client
+
+    ## Example
+    ```python
+    class ExportHandler(AnnotatedHandler):
+        @stream_response(media_type="application/json", batch_size=100)
+        async def get(self) -> AsyncIterator[MyResponseModel]:
+            async for row in fetch_rows():
+                yield MyResponseModel(**row)
+    ```
+    """
+    if media_type not in (NDJSON_MEDIA_TYPE, JSON_MEDIA_TYPE):
+        raise ValueError(f"unsupported media type {media_type} for streamed responses")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    def decorator(func):
+        func._response_stream_media_type = media_type
+        func._response_stream_batch_size = batch_size
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trusted_response(target):
+    """
+    Handler methods may return a dict of the fields of the annotated response model instead of the model itself.
+    By default, the dict is validated against the response model before it is serialized.
+    The `trusted_response` decorator marks the returned data as trusted, and the response model is built without validation.
+    It can decorate a single method, or an `AnnotatedHandler` class to trust all of its methods.
+    Set `trusted_responses=True` in the application settings to trust the responses of all handlers.
+
+    In debug mode, trusted responses are still validated.
+
+    ## Example
+    ```python
+    class UserHandler(AnnotatedHandler):
+        @trusted_response
+        async def get(self, user_id: int) -> UserResponseModel:
+            return await db.fetch_user(user_id)
+    ```
+    """
+    if inspect.isclass(target):
+        target._trusted_response = True
+        return target
+
+    target._trusted_response = True
+
+    @wraps(target)
+    def wrapper(*args, **kwargs):
+        return target(*args, **kwargs)
+
+    return wrapper
@@ -1,10 +1,29 @@
 from inspect import getclosurevars, getsource
 from collections import ChainMap
 from textwrap import dedent
+from typing import TYPE_CHECKING, Dict, List, Optional
 import ast
+import inspect
+import os
 
+if TYPE_CHECKING:
+    from torn_open.api_spec.spec_cache import SpecCache
 
-class _ExceptionsFinder(ast.NodeTransformer):
+
+def source_file(obj) -> Optional[str]:
+    try:
+        filename = inspect.getsourcefile(obj)
+    except TypeError:
+        return None
+    if filename is None or not os.path.isfile(filename):
+        return None
+    return os.path.abspath(filename)
+
+
+_JSON_CONSTANT_TYPES = (str, int, float, bool, type(None))
+
+
+class _ExceptionsFinder(ast.NodeVisitor):
     def __init__(self):
         self.nodes = []
 
@@ -19,37 +38,102 @@ def _get_wrapped_function(func):
     return func
 
 
-def get_exceptions(func):
+def _find_raises(node: ast.AST) -> List[list]:
+    """
+    Returns the name, constant args and constant kwargs of the exceptions raised within the node
+    """
+    v = _ExceptionsFinder()
+    v.visit(node)
+    raises = []
+    for exc in v.nodes:
+        if isinstance(exc, ast.Name):
+            name = exc.id
+        elif isinstance(exc, ast.Call) and isinstance(exc.func, ast.Name):
+            name = exc.func.id
+        else:
+            continue
+
+        args = [parse_constant_value(arg) for arg in getattr(exc, "args", [])]
+        kwargs = {
+            keyword.arg: parse_constant_value(keyword.value)
+            for keyword in getattr(exc, "keywords", [])
+        }
+        raises.append([name, args, kwargs])
+    return raises
+
+
+def _index_module(source: str) -> Dict[str, List[list]]:
+    """
+    Finds the raised exceptions of every function in a module with a single parse.
+    Functions are keyed by their first line, including decorators, as in `co_firstlineno`.
+    """
+    index = {}
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        first_line = min(
+            [node.lineno, *[decorator.lineno for decorator in node.decorator_list]]
+        )
+        index[str(first_line)] = _find_raises(node)
+    return index
+
+
+_module_indexes: Dict[str, Dict[str, List[list]]] = {}
+
+
+def _get_module_index(
+    filename: str, spec_cache: Optional["SpecCache"] = None
+) -> Dict[str, List[list]]:
+    index = _module_indexes.get(filename)
+    if index is None and spec_cache:
+        index = spec_cache.get(filename, "raises")
+    if index is None:
+        with open(filename, "r", encoding="utf-8") as f:
+            index = _index_module(f.read())
+    if spec_cache and spec_cache.get(filename, "raises") is None:
+        spec_cache.set(filename, "raises", index)
+    _module_indexes[filename] = index
+    return index
+
+
+def _get_raises(func, spec_cache: Optional["SpecCache"] = None) -> List[list]:
+    filename = source_file(func)
+    if filename is not None:
+        index = _get_module_index(filename, spec_cache)
+        raises = index.get(str(func.__code__.co_firstlineno))
+        if raises is not None:
+            return raises
+
+    # Fall back to parsing the function on its own
+    return _find_raises(ast.parse(dedent(getsource(func))))
+
+
+def get_exceptions(func, spec_cache: Optional["SpecCache"] = None):
     func = _get_wrapped_function(func)
 
     try:
         vars = ChainMap(*getclosurevars(func)[:3])
-        source = dedent(getsource(func))
-    except TypeError:
+        raises = _get_raises(func, spec_cache)
+    except (TypeError, OSError):
+        # Builtins, and functions whose source is not available, e.g. in deployments of .pyc files only
         return
 
-    v = _ExceptionsFinder()
-    v.visit(ast.parse(source))
-    results = []
-    for node in v.nodes:
-        if not isinstance(node, (ast.Call, ast.Name)):
-            continue
-
-        name = node.id if isinstance(node, ast.Name) else node.func.id
+    for name, args, kwargs in raises:
         if name in vars:
-            args = [parse_constant_value(arg) for arg in node.args]
-            kwargs = {
-                keyword.arg: parse_constant_value(keyword.value)
-                for keyword in node.keywords
-            }
             yield vars[name], args, kwargs
-            results.append((vars[name], args, kwargs))
 
 
 def parse_constant_value(keyword_value):
     if hasattr(keyword_value, "value"):
-        return keyword_value.value
+        value = keyword_value.value
     elif hasattr(keyword_value, "n"):
-        return keyword_value.n
+        value = keyword_value.n
     elif hasattr(keyword_value, "s"):
-        return keyword_value.s
+        value = keyword_value.s
+    else:
+        return None
+    # Only constants that can be cached as JSON are kept; expressions such as attributes,
+    # and constants such as bytes or ellipses are ignored
+    if not isinstance(value, _JSON_CONSTANT_TYPES):
+        return None
+    return value
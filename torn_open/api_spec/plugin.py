@@ -1,13 +1,17 @@
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import inspect
+import copy
 
 from pydantic import create_model
 
 from apispec import BasePlugin
-from torn_open.types import is_optional, GenericAliases
+from torn_open.types import is_optional, is_sequence, GenericAliases
 from torn_open.models import ClientError, ServerError
+from torn_open.annotated_handler import CONCURRENCY_LIMIT_ERROR
 from torn_open.api_spec.exception_finder import get_exceptions
-from torn_open.api_spec.core import TornOpenComponents
+from torn_open.api_spec.core import ParameterSchema, TornOpenComponents
+from torn_open.json_codecs import JSON_MEDIA_TYPE
+from torn_open.routing import get_path
 
 # utils
 def _is_implemented(method, handler):
@@ -41,40 +45,13 @@ class TornOpenPlugin(BasePlugin):
         operations.update(**Operations(url_spec, self.spec.components))
 
 
-# Path helper methods
-def get_path(url_spec):
-    path = replace_path_with_openapi_placeholders(url_spec)
-    path = right_strip_path(path)
-    return path
-
-
-def extract_and_sort_path_path_params(url_spec):
-    path_params = url_spec.regex.groupindex
-    path_params = {
-        k: v for k, v in sorted(path_params.items(), key=lambda item: item[1])
-    }
-    path_params = tuple(f"{{{param}}}" for param in path_params)
-    return path_params
-
-
-def replace_path_with_openapi_placeholders(url_spec):
-    path = url_spec.matcher._path
-    if url_spec.regex.groups == 0:
-        return path
-
-    path_params = extract_and_sort_path_path_params(url_spec)
-    return path % path_params
-
-
-def right_strip_path(path):
-    return path.rstrip("/*")
-
-
 # Path params
 def get_path_params(handler, components: TornOpenComponents):
-    path_params = handler.handler_class_params.path_params
+    path_params = list(handler.handler_class_params.path_params.values())
+    schemas = Schemas(path_params, components)
     parameters = [
-        PathParameter(parameter, components) for parameter in path_params.values()
+        PathParameter(parameter, components, schema)
+        for parameter, schema in zip(path_params, schemas)
     ]
     return parameters
 
@@ -83,42 +60,123 @@ def is_inspect_empty(obj):
     return obj is inspect._empty
 
 
-def Schema(parameter: inspect.Parameter, components: TornOpenComponents):
-
+def _annotation_and_default(parameter: inspect.Parameter):
     annotation = (
         parameter.annotation if not is_inspect_empty(parameter.annotation) else str
     )
     default = parameter.default if not is_inspect_empty(parameter.default) else ...
-    fields = {parameter.name: (annotation, default)}
+    return annotation, default
+
 
+def _schema_key(parameter: inspect.Parameter):
+    key = _annotation_and_default(parameter)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _referenced_definitions(schema, definitions: Dict[str, dict]) -> Dict[str, dict]:
+    referenced = {}
+    pending = [schema]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, list):
+            pending.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            component_id = ref.rsplit("/", 1)[-1]
+            if component_id in definitions and component_id not in referenced:
+                referenced[component_id] = definitions[component_id]
+                pending.append(definitions[component_id])
+        pending.extend(node.values())
+    return referenced
+
+
+def _build_parameter_schemas(annotations_and_defaults) -> list:
+    """
+    Builds the schemas of several parameters with a single model
+    """
+    fields = {
+        f"p{i}": annotation_and_default
+        for i, annotation_and_default in enumerate(annotations_and_defaults)
+    }
     model = create_model("_", **fields).schema(ref_template=SCHEMA_REF_TEMPLATE)
-    schema = model.get("properties", {}).get(parameter.name, {})
-    if schema.get("type") == "integer":
-        if schema.get("exclusiveMinimum") is not None:
-            schema["minimum"] = schema["exclusiveMinimum"]
-            schema["exclusiveMinimum"] = True
-    elif schema.get("type") == "array":
-        if isinstance(annotation, GenericAliases) and annotation.__origin__ in (
-            Tuple,
-            tuple,
-        ):
-            if len(schema["items"]) > 1:
-                schema["items"] = {"oneOf": schema["items"]}
-
-    schema = _clear_none_from_dict(schema)
-
-    referenced_schemas = model.pop("definitions", {})
-    if not referenced_schemas:
-        return schema
+    properties = model.get("properties", {})
+    definitions = model.get("definitions", {})
+
+    parameter_schemas = []
+    for field_name, (annotation, _) in fields.items():
+        schema = dict(properties.get(field_name, {}))
+        # Titles derived from the field name are replaced with the parameter name
+        has_title = schema.get("title") == field_name.title()
+        if has_title:
+            del schema["title"]
+        if schema.get("type") == "integer":
+            if schema.get("exclusiveMinimum") is not None:
+                schema["minimum"] = schema["exclusiveMinimum"]
+                schema["exclusiveMinimum"] = True
+        elif schema.get("type") == "array":
+            if isinstance(annotation, GenericAliases) and annotation.__origin__ in (
+                Tuple,
+                tuple,
+            ):
+                if len(schema["items"]) > 1:
+                    schema["items"] = {"oneOf": schema["items"]}
+
+        schema = _clear_none_from_dict(schema)
+        parameter_schemas.append(
+            ParameterSchema(
+                schema, has_title, _referenced_definitions(schema, definitions)
+            )
+        )
+    return parameter_schemas
+
+
+def Schemas(parameters: List[inspect.Parameter], components: TornOpenComponents):
+    """
+    Returns the schemas of parameters. Schemas missing from the cache shared by `components` are built together.
+    """
+    keys = [_schema_key(parameter) for parameter in parameters]
+    missing = []
+    for parameter, key in zip(parameters, keys):
+        if key is None or key not in components.parameter_schemas:
+            missing.append(_annotation_and_default(parameter))
+    built = iter(_build_parameter_schemas(missing) if missing else ())
+
+    schemas = []
+    for parameter, key in zip(parameters, keys):
+        if key is None:
+            parameter_schema = next(built)
+        else:
+            if key not in components.parameter_schemas:
+                components.parameter_schemas[key] = next(built)
+            parameter_schema = components.parameter_schemas[key]
+        components.register_parameter_schema(
+            key if key is not None else id(parameter_schema), parameter_schema
+        )
+
+        schema = copy.deepcopy(parameter_schema.schema)
+        if parameter_schema.has_title:
+            schema = {"title": parameter.name.title().replace("_", " "), **schema}
+        schemas.append(schema)
+    return schemas
 
-    for referenced_schema_id, referenced_schema in referenced_schemas.items():
-        components.schema(referenced_schema_id, referenced_schema)
 
-    return schema
+def Schema(parameter: inspect.Parameter, components: TornOpenComponents):
+    return Schemas([parameter], components)[0]
 
 
-def PathParameter(parameter: inspect.Parameter, components: TornOpenComponents):
-    return Parameter(parameter, "path", components, required=True)
+def PathParameter(
+    parameter: inspect.Parameter,
+    components: TornOpenComponents,
+    schema: Optional[dict] = None,
+):
+    return Parameter(parameter, "path", components, required=True, schema=schema)
 
 
 def Parameter(
@@ -126,14 +184,29 @@ def Parameter(
     param_type,
     components: TornOpenComponents,
     required: bool = None,
+    schema: Optional[dict] = None,
 ):
-    return {
+    parameter_spec = {
         "name": parameter.name,
         "in": param_type,
         "required": required
         if required is not None
         else not is_optional(parameter.annotation),
-        "schema": Schema(parameter, components),
+        "schema": schema if schema is not None else Schema(parameter, components),
+    }
+    if param_type == "query" and is_sequence(parameter.annotation):
+        parameter_spec.update(SequenceQueryParameterStyle())
+    return parameter_spec
+
+
+def SequenceQueryParameterStyle():
+    return {
+        "style": "form",
+        "explode": False,
+        "description": (
+            "Accepts comma separated values (`?ids=1,2`), repeated keys"
+            " (`?ids=1&ids=2`), or both"
+        ),
     }
 
 
@@ -167,11 +240,15 @@ class Operation:
         return getattr(self.method, "_openapi_summary", None)
 
     def _get_query_params(self):
-        parameters = self.handler.handler_class_params.query_params[
-            self.method.__name__
-        ].values()
+        parameters = list(
+            self.handler.handler_class_params.query_params[
+                self.method.__name__
+            ].values()
+        )
+        schemas = Schemas(parameters, self.components)
         return [
-            Parameter(parameter, "query", self.components) for parameter in parameters
+            Parameter(parameter, "query", self.components, schema=schema)
+            for parameter, schema in zip(parameters, schemas)
         ]
 
     def _get_operation_description(self):
@@ -189,7 +266,7 @@ class Operation:
             "summary": self._get_summary(),
             "description": self._get_operation_description(),
             "parameters": self._get_query_params(),
-            "requestBody": RequestBody(method, handler),
+            "requestBody": RequestBody(method, handler, components),
             "responses": Responses(method, handler, components),
         }
         self._schema = _clear_none_from_dict(operation)
@@ -198,22 +275,47 @@ class Operation:
         return self._schema
 
 
-def RequestBody(method: str, handler):
+def RequestBody(method: str, handler, components: TornOpenComponents):
     json_param = handler.handler_class_params.json_param[method]
     if not json_param:
         return None
     _, parameter = json_param
-    return {"content": {"application/json": {"schema": RequestBodySchema(parameter)}}}
+    return {
+        "content": {
+            "application/json": {"schema": RequestBodySchema(parameter, components)}
+        }
+    }
+
+
+def RequestBodySchema(parameter, components: TornOpenComponents):
+    schema = ModelSchema(parameter.annotation, components)
+    return _register_definitions(schema, components)
+
 
+def _register_definitions(schema, components: TornOpenComponents):
+    """
+    Moves the definitions of nested models into the components of the spec
+    """
+    referenced_schemas = schema.pop("definitions", {})
+    for referenced_schema_id, referenced_schema in referenced_schemas.items():
+        components.schema(referenced_schema_id, referenced_schema)
+    return schema
 
-def RequestBodySchema(parameter):
-    return parameter.annotation.schema(ref_template=SCHEMA_REF_TEMPLATE)
+
+def ModelSchema(model, components: TornOpenComponents):
+    def build_schema():
+        # pydantic memoizes schemas; copy so popping definitions does not alter them
+        return copy.deepcopy(model.schema(ref_template=SCHEMA_REF_TEMPLATE))
+
+    if components.spec_cache is None:
+        return build_schema()
+    return components.spec_cache.model_schema(model, build_schema)
 
 
 def Responses(method, handler, components):
     return {
         200: SuccessResponse(method, handler, components),
-        **_get_failure_responses(method, handler),
+        **_get_failure_responses(method, handler, components),
     }
 
 
@@ -246,43 +348,69 @@ def SuccessResponse(method, handler, components):
         return description
 
     response_model = handler.handler_class_params.response_models[method]
-    return {
+    response_stream = handler.handler_class_params.response_streams[method]
+    schema = SuccessResponseModelSchema(response_model, components)
+    media_type = JSON_MEDIA_TYPE
+    if response_stream is not None:
+        media_type = response_stream.media_type
+        if response_stream.is_json_array:
+            schema = {"type": "array", "items": schema} if schema else {"type": "array"}
+
+    success_response = {
         "description": get_success_response_description(response_model),
-        "content": {
-            "application/json": {
-                "schema": SuccessResponseModelSchema(response_model, components)
-            }
-        },
+        "content": {media_type: {"schema": schema}},
+    }
+    response_cache = handler.handler_class_params.response_caches[method]
+    if response_cache is not None:
+        success_response["headers"] = CacheControlHeader(response_cache)
+    return success_response
+
+
+def CacheControlHeader(response_cache):
+    return {
+        "Cache-Control": {
+            "description": "Responses are cached by the server",
+            "schema": {"type": "string", "example": response_cache.cache_control},
+        }
     }
 
 
 def SuccessResponseModelSchema(response_model, components):
-    schema = (
-        response_model.schema(ref_template=SCHEMA_REF_TEMPLATE)
-        if response_model
-        else None
-    )
+    schema = ModelSchema(response_model, components) if response_model else None
     if not schema:
         return schema
+    return _register_definitions(schema, components)
 
-    referenced_schemas = schema.pop("definitions", {})
-    if not referenced_schemas:
-        return schema
 
-    for referenced_schema_id, referenced_schema in referenced_schemas.items():
-        components.schema(referenced_schema_id, referenced_schema)
-    return schema
+def _get_failure_responses(
+    method, handler, components: TornOpenComponents
+) -> Dict[str, dict]:
+    http_method = getattr(handler, method, None)
+    exceptions = _retrieve_exceptions(http_method, components.spec_cache)
+    concurrency_limit = handler.handler_class_params.concurrency_limits[method]
+    if concurrency_limit is not None:
+        status_code, error_type, _ = CONCURRENCY_LIMIT_ERROR
+        exceptions.setdefault(status_code, []).append(error_type)
+    failed_responses = FailedResponses(exceptions)
+    if concurrency_limit is not None:
+        failed_responses[status_code]["headers"] = RetryAfterHeader(
+            concurrency_limit
+        )
+    return failed_responses
 
 
-def _get_failure_responses(method, handler) -> Dict[str, dict]:
-    http_method = getattr(handler, method, None)
-    exceptions = _retrieve_exceptions(http_method)
-    return FailedResponses(exceptions)
+def RetryAfterHeader(concurrency_limit):
+    return {
+        "Retry-After": {
+            "description": "Seconds to wait before retrying requests rejected by the concurrency limit",
+            "schema": {"type": "integer", "example": concurrency_limit.retry_after},
+        }
+    }
 
 
-def _retrieve_exceptions(http_method):
+def _retrieve_exceptions(http_method, spec_cache=None):
     error_codes_and_types = {}
-    for exception_class, _, kwargs in get_exceptions(http_method):
+    for exception_class, _, kwargs in get_exceptions(http_method, spec_cache):
         if exception_class not in (ClientError, ServerError):
             continue
         status_code = kwargs["status_code"]
@@ -317,6 +445,35 @@ def FailedResponse(error_types):
                         "message": {
                             "type": "string",
                         },
+                        "errors": {
+                            "type": "array",
+                            "description": "Invalid fields of validation errors",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "loc": {
+                                        "type": "array",
+                                        "items": {
+                                            "oneOf": [
+                                                {"type": "string"},
+                                                {"type": "integer"},
+                                            ]
+                                        },
+                                    },
+                                    "type": {
+                                        "type": "string",
+                                    },
+                                    "msg": {
+                                        "type": "string",
+                                    },
+                                    "value": {},
+                                },
+                                "required": [
+                                    "loc",
+                                    "type",
+                                ],
+                            },
+                        },
                     },
                     "required": [
                         "status_code",
@@ -0,0 +1,175 @@
+import copy
+import hashlib
+import json
+import os
+import sys
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Set
+
+import apispec
+import pydantic
+from tornado.log import app_log
+
+from torn_open.api_spec.exception_finder import source_file
+from torn_open.version import __version__
+
+CACHE_VERSION = "-".join(
+    [
+        __version__,
+        f"py{sys.version_info[0]}.{sys.version_info[1]}",
+        f"pydantic{pydantic.VERSION}",
+        f"apispec{apispec.__version__}",
+    ]
+)
+
+
+def _stamp(filename: str):
+    stat = os.stat(filename)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _sha1(filename: str) -> str:
+    with open(filename, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def model_source_files(model) -> Set[str]:
+    """
+    Source files of a model and of every model and enum it references
+    """
+    files = set()
+    seen = set()
+
+    def visit_type(annotation):
+        for arg in getattr(annotation, "__args__", None) or ():
+            visit_type(arg)
+        if not isinstance(annotation, type) or annotation in seen:
+            return
+        seen.add(annotation)
+        if not issubclass(annotation, (pydantic.BaseModel, Enum)):
+            return
+
+        for base in annotation.__mro__:
+            if base.__module__.split(".")[0] in ("pydantic", "enum", "builtins"):
+                continue
+            filename = source_file(base)
+            if filename:
+                files.add(filename)
+        if issubclass(annotation, pydantic.BaseModel):
+            for field in annotation.__fields__.values():
+                visit_field(field)
+
+    def visit_field(field):
+        visit_type(field.outer_type_)
+        visit_type(field.type_)
+        for sub_field in field.sub_fields or ():
+            visit_field(sub_field)
+
+    visit_type(model)
+    return files
+
+
+class SpecCache:
+    """
+    Persists results derived from source files in a cache directory.
+    Results are stored per source file, and are discarded when the file, or the version of torn_open,
+    pydantic, apispec or Python changes.
+    """
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, dict] = {}
+        self._dirty: Set[str] = set()
+
+    def _path(self, filename: str) -> str:
+        name = hashlib.sha1(filename.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _load(self, filename: str) -> Optional[dict]:
+        try:
+            with open(self._path(filename), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_VERSION or entry.get("path") != filename:
+            return None
+        return entry
+
+    def _entry(self, filename: str) -> dict:
+        if filename in self._entries:
+            return self._entries[filename]
+
+        stamp = _stamp(filename)
+        entry = self._load(filename)
+        if entry is not None and entry["stamp"] != stamp:
+            # Files can be touched without being changed, e.g. on checkouts
+            if entry["sha1"] == _sha1(filename):
+                entry["stamp"] = stamp
+                self._dirty.add(filename)
+            else:
+                entry = None
+        if entry is None:
+            entry = {
+                "version": CACHE_VERSION,
+                "path": filename,
+                "stamp": stamp,
+                "sha1": _sha1(filename),
+                "sections": {},
+            }
+        self._entries[filename] = entry
+        return entry
+
+    def stamp(self, filename: str):
+        return self._entry(filename)["stamp"]
+
+    def get(self, filename: str, section: str) -> Optional[Dict[str, Any]]:
+        return self._entry(filename)["sections"].get(section)
+
+    def set(self, filename: str, section: str, value: Dict[str, Any]):
+        self._entry(filename)["sections"][section] = value
+        self._dirty.add(filename)
+
+    def model_schema(self, model, build_schema: Callable[[], dict]) -> dict:
+        """
+        Returns the cached schema of a model, if none of the files the model depends on changed
+        """
+        filename = source_file(model)
+        if filename is None or "<locals>" in model.__qualname__:
+            return build_schema()
+
+        schemas = self.get(filename, "schemas") or {}
+        cached = schemas.get(model.__qualname__)
+        if cached is not None and all(
+            os.path.isfile(dependency) and self.stamp(dependency) == stamp
+            for dependency, stamp in cached["dependencies"].items()
+        ):
+            return copy.deepcopy(cached["schema"])
+
+        schema = build_schema()
+        schemas[model.__qualname__] = {
+            "schema": copy.deepcopy(schema),
+            "dependencies": {
+                dependency: self.stamp(dependency)
+                for dependency in model_source_files(model)
+            },
+        }
+        self.set(filename, "schemas", schemas)
+        return schema
+
+    def save(self):
+        for filename in self._dirty:
+            path = self._path(filename)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries[filename], f)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, ValueError):
+                # The cache is an optimisation, so a failed write must not stop the application
+                app_log.warning(
+                    "Could not write spec cache of %s", filename, exc_info=True
+                )
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        self._dirty.clear()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Pattern, Tuple, Union
+
+import pydantic
+from tornado.routing import Matcher
+
+from torn_open.annotated_handler import AnnotatedHandler
+from torn_open.json_codecs import DEFAULT_JSON_CODEC, JSONCodec
+from torn_open.routing import _gather_rules, register_handlers
+from torn_open.version import __version__
+
+if TYPE_CHECKING:
+    from torn_open.api_spec.core import TornOpenAPISpec
+
+ARTIFACT_FORMAT = 2
+MANIFEST_FILE = "manifest.json"
+HANDLERS_FILE = "handlers.pickle"
+JSON_SPEC_FILE = "openapi.json"
+YAML_SPEC_FILE = "openapi.yaml"
+# Loading an artifact unpickles handler params, so only versions that affect them are checked.
+# The spec is served as it was built, so the apispec version does not matter
+ARTIFACT_VERSION = "-".join(
+    [
+        __version__,
+        f"py{sys.version_info[0]}.{sys.version_info[1]}",
+        f"pydantic{pydantic.VERSION}",
+    ]
+)
+
+_Handlers = List[Tuple[Union[Matcher, Pattern], AnnotatedHandler]]
+
+
+def _handler_id(matcher, handler) -> List[str]:
+    return [
+        f"{handler.__module__}.{handler.__qualname__}",
+        getattr(matcher, "pattern", repr(matcher)),
+    ]
+
+
+def _source_hashes(handlers: _Handlers) -> Dict[str, str]:
+    """
+    sha1 of the source of the modules defining the handlers and their base classes, by module
+    """
+    # Imported on use, so that importing torn_open does not import the spec generation modules
+    from torn_open.api_spec.exception_finder import source_file
+
+    hashes = {}
+    for _, handler in handlers:
+        for cls in handler.__mro__:
+            if cls in AnnotatedHandler.__mro__ or cls.__module__ in hashes:
+                continue
+            filename = source_file(cls)
+            if filename is None:
+                continue
+            with open(filename, "rb") as f:
+                hashes[cls.__module__] = hashlib.sha1(f.read()).hexdigest()
+    return hashes
+
+
+def _write_file(filename: str, data: bytes):
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "wb") as f:
+        f.write(data)
+    os.replace(tmp_filename, filename)
+
+
+def _map_file(filename: str) -> Union[mmap.mmap, bytes]:
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_artifact(
+    rules,
+    output_dir: str,
+    json_codec: JSONCodec = DEFAULT_JSON_CODEC,
+    cache_dir: Optional[str] = None,
+) -> "TornOpenAPISpec":
+    """
+    Generates the OpenAPI spec of the rules and writes it to `output_dir`, with the params tables of every AnnotatedHandler.
+
+    Arguments:
+        rules: list of routes and handlers
+        output_dir: directory the artifact is written to
+        json_codec: codec used to encode the JSON spec
+        cache_dir: directory for persisting exception discovery and model schemas across builds
+    """
+    from torn_open.api_spec import build_api_spec
+
+    handlers = register_handlers(rules)
+    api_spec = build_api_spec(handlers, cache_dir)
+
+    os.makedirs(output_dir, exist_ok=True)
+    _write_file(
+        os.path.join(output_dir, JSON_SPEC_FILE), json_codec.dumps(api_spec.to_dict())
+    )
+    _write_file(
+        os.path.join(output_dir, YAML_SPEC_FILE), api_spec.to_yaml().encode("utf-8")
+    )
+    tables = [handler.handler_class_params.to_tables() for _, handler in handlers]
+    _write_file(
+        os.path.join(output_dir, HANDLERS_FILE),
+        pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL),
+    )
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "handlers": [_handler_id(matcher, handler) for matcher, handler in handlers],
+        "sources": _source_hashes(handlers),
+    }
+    _write_file(
+        os.path.join(output_dir, MANIFEST_FILE), json.dumps(manifest).encode("utf-8")
+    )
+    return api_spec
+
+
+class Artifact:
+    """
+    Artifact written by `build_artifact`. Files are memory mapped, and the spec is only copied when it is served.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"{path}: unsupported artifact format")
+        if manifest.get("version") != ARTIFACT_VERSION:
+            raise ValueError(
+                f"{path}: artifact was built with {manifest.get('version')},"
+                f" expected {ARTIFACT_VERSION}"
+            )
+        self.path = path
+        self.handler_ids: List[List[str]] = manifest["handlers"]
+        self.source_hashes: Dict[str, str] = manifest["sources"]
+        self.json_spec = _map_file(os.path.join(path, JSON_SPEC_FILE))
+        self.yaml_spec = _map_file(os.path.join(path, YAML_SPEC_FILE))
+
+    def serialize_json_spec(self) -> bytes:
+        return self.json_spec[:]
+
+    def serialize_yaml_spec(self) -> bytes:
+        return self.yaml_spec[:]
+
+    def _load_tables(self) -> List[Dict[str, Any]]:
+        return pickle.loads(_map_file(os.path.join(self.path, HANDLERS_FILE)))
+
+    def load_handlers(self, rules) -> _Handlers:
+        """
+        Sets the params tables of the AnnotatedHandlers of the rules from the artifact, instead of introspecting them
+        """
+        handlers = list(_gather_rules(rules))
+        handler_ids = [_handler_id(matcher, handler) for matcher, handler in handlers]
+        if handler_ids != self.handler_ids:
+            raise ValueError(
+                f"{self.path}: artifact is stale, the handlers of the application changed"
+            )
+        # The params tables are built from the signatures of the methods, which may have changed since the build
+        changed_modules = sorted(
+            module
+            for module, source_hash in _source_hashes(handlers).items()
+            if self.source_hashes.get(module) != source_hash
+        )
+        if changed_modules:
+            raise ValueError(
+                f"{self.path}: artifact is stale, the source of {', '.join(changed_modules)} changed"
+            )
+
+        for (_, handler), tables in zip(handlers, self._load_tables()):
+            handler._load_params(tables)
+        return handlers
@@ -0,0 +1,145 @@
+from typing import Any, Dict, List, Union
+from urllib.parse import urlencode
+
+import tornado.gen
+import tornado.locks
+from tornado.httputil import HTTPHeaders, HTTPServerRequest
+
+from torn_open.annotated_handler import (
+    AnnotatedHandler,
+    _handle_in_process,
+    _InMemoryConnection,
+)
+from torn_open.json_codecs import JSON_MEDIA_TYPE
+from torn_open.models import ClientError, RequestModel, ResponseModel
+
+# Headers of the batch request that describe its own body or encoding, and are not passed to sub-requests
+_BATCH_ONLY_HEADERS = (
+    "Content-Length",
+    "Content-Type",
+    "Content-Encoding",
+    "Transfer-Encoding",
+    "Accept-Encoding",
+    "If-None-Match",
+)
+
+
+class BatchSubRequest(RequestModel):
+    method: str = "GET"
+    path: str
+    query: Dict[str, Union[List[str], str]] = {}
+    body: Any = None
+
+
+class BatchRequest(RequestModel):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(ResponseModel):
+    status: int
+    headers: Dict[str, str]
+    body: Any = None
+
+
+class BatchResponse(ResponseModel):
+    responses: List[BatchSubResponse]
+
+
+class BatchHandler(AnnotatedHandler):
+    """
+    Runs several requests to the AnnotatedHandlers of the application in one call.
+    Requests are routed and handled in-process, concurrently, and their responses are returned in the same order.
+    """
+
+    def initialize(self, concurrency: int, max_requests: int):
+        self.concurrency = concurrency
+        self.max_requests = max_requests
+
+    async def post(self, batch: BatchRequest) -> BatchResponse:
+        if len(batch.requests) > self.max_requests:
+            raise ClientError(
+                status_code=400,
+                error_type="too_many_batch_requests",
+                message="batch has more requests than allowed",
+            )
+
+        semaphore = tornado.locks.Semaphore(self.concurrency)
+
+        async def dispatch(sub_request: BatchSubRequest) -> BatchSubResponse:
+            async with semaphore:
+                return await self._dispatch(sub_request)
+
+        responses = await tornado.gen.multi(
+            [dispatch(sub_request) for sub_request in batch.requests]
+        )
+        return BatchResponse.construct(responses=responses)
+
+    def _sub_request(
+        self, sub_request: BatchSubRequest, connection: _InMemoryConnection
+    ) -> HTTPServerRequest:
+        uri = sub_request.path
+        if sub_request.query:
+            uri = f"{uri}?{urlencode(sub_request.query, doseq=True)}"
+
+        headers = HTTPHeaders()
+        for name, value in self.request.headers.get_all():
+            if name not in _BATCH_ONLY_HEADERS:
+                headers.add(name, value)
+        body = b""
+        if sub_request.body is not None:
+            body = self.json_codec.dumps(sub_request.body)
+            headers["Content-Type"] = self.json_codec.content_type
+            headers["Content-Length"] = str(len(body))
+
+        return HTTPServerRequest(
+            method=sub_request.method.upper(),
+            uri=uri,
+            version=self.request.version,
+            headers=headers,
+            body=body,
+            connection=connection,
+        )
+
+    async def _dispatch(self, sub_request: BatchSubRequest) -> BatchSubResponse:
+        connection = _InMemoryConnection(
+            getattr(self.request.connection, "context", None)
+        )
+        request = self._sub_request(sub_request, connection)
+        body, request.body = request.body, b""
+
+        delegate = self.application.find_handler(request)
+        handler_class = getattr(delegate, "handler_class", None)
+        if not (
+            isinstance(handler_class, type)
+            and issubclass(handler_class, AnnotatedHandler)
+            and not issubclass(handler_class, BatchHandler)
+        ):
+            return self._not_found()
+
+        await _handle_in_process(delegate, request, body)
+        return self._sub_response(connection)
+
+    def _sub_response(self, connection: _InMemoryConnection) -> BatchSubResponse:
+        headers = dict(connection.headers.get_all())
+        body = b"".join(connection.chunks)
+        data = None
+        if body:
+            if headers.get("Content-Type", "").startswith(JSON_MEDIA_TYPE):
+                data = self.json_codec.loads(body)
+            else:
+                data = body.decode("utf-8", errors="replace")
+        return BatchSubResponse.construct(
+            status=connection.status_code, headers=headers, body=data
+        )
+
+    def _not_found(self) -> BatchSubResponse:
+        error = ClientError(
+            status_code=404,
+            error_type="not_found",
+            message="path is not routed to an AnnotatedHandler",
+        )
+        return BatchSubResponse.construct(
+            status=error.status_code,
+            headers={"Content-Type": self.json_codec.content_type},
+            body=error.json(),
+        )
@@ -0,0 +1,190 @@
+import array
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+def _freeze(value) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, array.array)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, BaseModel):
+        return type(value), _freeze(value.dict())
+    return value
+
+
+def _freeze_key(value) -> Optional[Hashable]:
+    """
+    Returns the frozen value, or None if it holds values that cannot be hashed
+    """
+    key = _freeze(value)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class _CacheEntry:
+    __slots__ = ("response", "expires_at")
+
+    def __init__(self, response, expires_at: float):
+        self.response = response
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses, keyed by the handler class, path and parsed params of a handler method
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int = 1024,
+        stale_while_revalidate: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+        self.clock = clock
+        self.entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._revalidating = set()
+
+        cache_control = f"max-age={int(ttl)}"
+        if stale_while_revalidate:
+            cache_control += f", stale-while-revalidate={int(stale_while_revalidate)}"
+        self.cache_control = cache_control
+
+    @staticmethod
+    def key(
+        handler_class: type, path: str, params: Dict[str, Any]
+    ) -> Optional[Hashable]:
+        """
+        Returns the key of the params of a request to the path, or None if they cannot be cached.
+        Handler classes sharing a cached method, and routes sharing a handler class, are cached apart.
+        """
+        params_key = _freeze_key(params)
+        if params_key is None:
+            return None
+        return handler_class, path, params_key
+
+    def get(self, key: Hashable) -> Tuple[Optional[Any], bool]:
+        """
+        Returns the cached response and whether it is stale
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        now = self.clock()
+        if now < entry.expires_at:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry.response, False
+        if now < entry.expires_at + self.stale_while_revalidate:
+            self.entries.move_to_end(key)
+            self.stale_hits += 1
+            return entry.response, True
+
+        del self.entries[key]
+        self.misses += 1
+        return None, False
+
+    def set(self, key: Hashable, response):
+        self.entries[key] = _CacheEntry(response, self.clock() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def start_revalidation(self, key: Hashable) -> bool:
+        """
+        Returns False if the entry is already being revalidated
+        """
+        if key in self._revalidating:
+            return False
+        self._revalidating.add(key)
+        return True
+
+    def finish_revalidation(self, key: Hashable):
+        self._revalidating.discard(key)
+
+    def invalidate(self, **params):
+        """
+        Removes the responses cached for the params, for every handler class and path.
+        All params of the method must be given.
+        """
+        params_key = _freeze_key(params)
+        if params_key is None:
+            return
+        for key in [key for key in self.entries if key[2] == params_key]:
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+        }
+
+
+def cache(ttl: float, max_entries: int = 1024, stale_while_revalidate: float = 0):
+    """
+    Caches the serialized responses of an `AnnotatedHandler` method, keyed by the handler class, the request path,
+    and the path, query and json params of the method.
+    Only 2xx responses returned by the method are cached and sent with a `Cache-Control` header;
+    output written with `self.write` is not.
+    Stale responses are refreshed by handling a copy of the request in the background,
+    subject to the concurrency limits and executor pools of the method.
+
+    Arguments:
+        ttl: Seconds a response is served from the cache
+        max_entries: Maximum number of cached responses; the least recently used response is evicted first
+        stale_while_revalidate: Seconds an expired response is still served while it is refreshed in the background
+
+    The cache is available as the `response_cache` attribute of the decorated method.
+    Use `MyHandler.get.response_cache.invalidate(**params)` or `MyHandler.get.response_cache.clear()` to invalidate it,
+    and `MyHandler.get.response_cache.stats()` for hit and miss counters.
+
+    ## Example
+    ```python
+    class PriceHandler(AnnotatedHandler):
+        @cache(ttl=60, stale_while_revalidate=30)
+        async def get(self, product_id: int) -> PriceResponseModel:
+            ...
+    ```
+    """
+
+    def decorator(func):
+        func.response_cache = ResponseCache(
+            ttl,
+            max_entries=max_entries,
+            stale_while_revalidate=stale_while_revalidate,
+        )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
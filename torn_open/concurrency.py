@@ -0,0 +1,268 @@
+import datetime
+from collections import deque
+from functools import wraps
+from typing import Deque, Dict, Optional
+
+import tornado.gen
+import tornado.util
+from tornado.concurrent import Future
+
+
+class ConcurrencyLimit:
+    """
+    Caps the number of in-flight executions of handler methods, with a bounded queue of requests waiting for a slot
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int = 0,
+        max_wait: Optional[float] = None,
+        retry_after: int = 1,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        if max_wait is not None and max_wait <= 0:
+            raise ValueError("max_wait must be positive")
+        self.limit = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: Deque[Future] = deque()
+
+    def try_acquire(self) -> bool:
+        """
+        Takes a slot if one is free and no request is waiting for one
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        return False
+
+    async def acquire(self) -> bool:
+        """
+        Waits for a slot. Returns False if the queue is full or the wait exceeds `max_wait`
+        """
+        if self.try_acquire():
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter = Future()
+        self._waiters.append(waiter)
+        if self.max_wait is None:
+            await waiter
+            return True
+        try:
+            await tornado.gen.with_timeout(
+                datetime.timedelta(seconds=self.max_wait), waiter
+            )
+        except tornado.util.TimeoutError:
+            # The slot may have been handed over after the deadline passed
+            if waiter.done():
+                return True
+            self._waiters.remove(waiter)
+            self.rejected += 1
+            return False
+        return True
+
+    def release(self, latency: Optional[float] = None):
+        """
+        Frees the slot of an execution that took `latency` seconds
+        """
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        # Slots are handed over to waiters in order, so that new requests cannot overtake them
+        while self._waiters and self.in_flight < self.limit:
+            self.in_flight += 1
+            self._waiters.popleft().set_result(None)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "rejected": self.rejected,
+        }
+
+
+class AdaptiveConcurrencyLimit(ConcurrencyLimit):
+    """
+    Concurrency limit adjusted from the latency of executions, with additive increase and multiplicative decrease.
+
+    While the limit is in use, i.e. at least half of it is in flight, it grows by about one per `limit` executions
+    faster than `latency_target`. An execution slower than `latency_target` multiplies it by `backoff`;
+    executions that were already in flight then do not decrease it again.
+    """
+
+    def __init__(
+        self,
+        latency_target: float,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 1000,
+        backoff: float = 0.9,
+        max_queue: int = 0,
+        max_wait: Optional[float] = None,
+        retry_after: int = 1,
+    ):
+        if latency_target <= 0:
+            raise ValueError("latency_target must be positive")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            )
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        super().__init__(
+            initial_limit,
+            max_queue=max_queue,
+            max_wait=max_wait,
+            retry_after=retry_after,
+        )
+        self.latency_target = latency_target
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.estimate = float(initial_limit)
+        # Executions in flight when the limit was last decreased
+        self._cooldown = 0
+
+    def release(self, latency: Optional[float] = None):
+        if latency is not None:
+            self._update(latency)
+        super().release(latency)
+
+    def _update(self, latency: float):
+        if latency > self.latency_target:
+            if self._cooldown == 0:
+                self.estimate = max(self.min_limit, self.estimate * self.backoff)
+                self._cooldown = self.in_flight
+        elif self.in_flight * 2 >= self.limit:
+            self.estimate = min(self.max_limit, self.estimate + 1 / self.estimate)
+        if self._cooldown:
+            self._cooldown -= 1
+        self.limit = int(self.estimate)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **super().stats(),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency_target": self.latency_target,
+        }
+
+
+def limit_concurrency(
+    max_in_flight: int,
+    max_queue: int = 0,
+    max_wait: Optional[float] = None,
+    retry_after: int = 1,
+):
+    """
+    Caps the number of concurrent executions of an `AnnotatedHandler` method, so that a slow method cannot take up
+    the capacity of the process. Requests that find the queue full, or that wait longer than `max_wait`, are rejected
+    with a 503 `concurrency_limit_exceeded` error and a `Retry-After` header before their body is read.
+    The 503 response is documented in the spec.
+
+    Arguments:
+        max_in_flight: Maximum number of executions of the method at a time
+        max_queue: Maximum number of requests waiting for an execution to finish
+        max_wait: Seconds a request waits in the queue before it is rejected. Requests wait without a deadline if None
+        retry_after: Seconds sent in the `Retry-After` header of rejected requests
+
+    To share a limit between all the methods of a handler, set the `concurrency_limit` attribute of the handler class
+    to a `torn_open.concurrency.ConcurrencyLimit`. The limit is available as the `concurrency_limit` attribute of the
+    decorated method, and `MyHandler.get.concurrency_limit.stats()` returns the number of requests in flight,
+    queued and rejected.
+
+    ## Example
+    ```python
+    class ReportHandler(AnnotatedHandler):
+        @limit_concurrency(max_in_flight=4, max_queue=16, max_wait=2)
+        async def get(self, report_id: int) -> ReportResponseModel:
+            ...
+    ```
+    """
+
+    def decorator(func):
+        func.concurrency_limit = ConcurrencyLimit(
+            max_in_flight,
+            max_queue=max_queue,
+            max_wait=max_wait,
+            retry_after=retry_after,
+        )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def adaptive_concurrency(
+    latency_target: float,
+    initial_limit: int = 10,
+    min_limit: int = 1,
+    max_limit: int = 1000,
+    backoff: float = 0.9,
+    max_queue: int = 0,
+    max_wait: Optional[float] = None,
+    retry_after: int = 1,
+):
+    """
+    Caps the number of concurrent executions of an `AnnotatedHandler` method like `limit_concurrency`, with a limit
+    that follows the latency of the method: it grows while executions are faster than `latency_target`, and shrinks
+    when they are slower, so that throughput stays near the capacity of the method without requests queueing up.
+
+    Arguments:
+        latency_target: Seconds above which an execution is considered slowed down by overload
+        initial_limit: Limit before any execution finished
+        min_limit: Lowest limit
+        max_limit: Highest limit
+        backoff: Factor the limit is multiplied by when an execution is slower than `latency_target`
+        max_queue: Maximum number of requests waiting for an execution to finish
+        max_wait: Seconds a request waits in the queue before it is rejected. Requests wait without a deadline if None
+        retry_after: Seconds sent in the `Retry-After` header of rejected requests
+
+    To share an adaptive limit between methods, set the `concurrency_limit` attribute of a handler class, or pass
+    limits by tag to `Application` with `tag_concurrency_limits`, to a `torn_open.concurrency.AdaptiveConcurrencyLimit`.
+    Use `torn_open.simulation.simulate` to tune the arguments against a model of the method's load.
+
+    ## Example
+    ```python
+    class SearchHandler(AnnotatedHandler):
+        @adaptive_concurrency(latency_target=0.2, max_queue=50, max_wait=1)
+        async def get(self, query: str) -> SearchResponseModel:
+            ...
+    ```
+    """
+
+    def decorator(func):
+        func.concurrency_limit = AdaptiveConcurrencyLimit(
+            latency_target,
+            initial_limit=initial_limit,
+            min_limit=min_limit,
+            max_limit=max_limit,
+            backoff=backoff,
+            max_queue=max_queue,
+            max_wait=max_wait,
+            retry_after=retry_after,
+        )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,201 @@
+import inspect
+import os
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tornado.ioloop import IOLoop
+
+# Called with the pool when its queue changes, and with the seconds a task waited when it starts
+ExecutorObserver = Callable[["ExecutorPool", Optional[float]], None]
+
+
+def _call_timed(func, args, kwargs) -> Tuple[float, Any, Optional[BaseException]]:
+    """
+    Runs in the pool, and returns the time the call started with its result or exception
+    """
+    started_at = time.monotonic()
+    try:
+        return started_at, func(*args, **kwargs), None
+    except Exception as e:
+        return started_at, None, e
+
+
+def _call_unbound(handler_class, method_name: str, params: Dict[str, Any]):
+    # Handlers cannot be sent to other processes, so methods run there without one
+    return getattr(handler_class, method_name)(None, **params)
+
+
+class ExecutorPool:
+    """
+    Pool of workers that run handler methods off the IOLoop. The executor is created on first use,
+    so that pools can be declared at import time and processes can be forked before it is started.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.name = name
+        self.max_workers = max_workers
+        self.pending = 0
+        self.completed = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        # References to the observers, which return None once a weakly held observer is collected
+        self._observers: List[Callable[[], Optional[ExecutorObserver]]] = []
+        self._executor: Optional[Executor] = None
+
+    def _create_executor(self) -> Executor:
+        raise NotImplementedError
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    @property
+    def queued(self) -> int:
+        """
+        Tasks waiting for a worker
+        """
+        return max(0, self.pending - self.max_workers)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs func in the pool, and records how long it waited for a worker
+        """
+        submitted_at = time.monotonic()
+        self.pending += 1
+        self._notify(None)
+        try:
+            started_at, result, exception = await IOLoop.current().run_in_executor(
+                self.executor, _call_timed, func, args, kwargs
+            )
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        wait_time = max(0.0, started_at - submitted_at)
+        self.wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        self._notify(wait_time)
+        if exception is not None:
+            raise exception
+        return result
+
+    def run_method(self, handler, method_name: str, params: Dict[str, Any]):
+        return self.run(getattr(handler, method_name), **params)
+
+    def add_observer(self, observer: ExecutorObserver):
+        """
+        Calls observer when the queue of the pool changes. Bound methods are held weakly,
+        so that pools declared at import time do not keep the objects observing them alive.
+        """
+        if inspect.ismethod(observer):
+            reference = weakref.WeakMethod(observer)
+        else:
+
+            def reference():
+                return observer
+
+        self._observers.append(reference)
+
+    def _notify(self, wait_time: Optional[float]):
+        for reference in list(self._observers):
+            observer = reference()
+            if observer is None:
+                self._observers.remove(reference)
+            else:
+                observer(self, wait_time)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": self.pending,
+            "queued": self.queued,
+            "completed": self.completed,
+            "wait_time": self.wait_time,
+            "max_wait_time": self.max_wait_time,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class ThreadPool(ExecutorPool):
+    """
+    Runs handler methods in threads, for methods that call blocking clients.
+    Methods run with their handler, but must return their response instead of writing it with `self.write`,
+    as the handler is not thread safe.
+    """
+
+    def __init__(self, name: str = "default", max_workers: Optional[int] = None):
+        # Default of ThreadPoolExecutor
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        super().__init__(name, max_workers)
+
+    def _create_executor(self) -> Executor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"torn_open-{self.name}"
+        )
+
+
+class ProcessPool(ExecutorPool):
+    """
+    Runs handler methods in processes, for CPU bound methods.
+    The params of the method and its response or error are pickled, and the method is called with `self` set to None,
+    so it may only use its params. Handler classes, and the models of their params and responses, must be importable.
+    """
+
+    def __init__(self, name: str = "process", max_workers: Optional[int] = None):
+        super().__init__(name, max_workers or os.cpu_count() or 1)
+
+    def _create_executor(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def run_method(self, handler, method_name: str, params: Dict[str, Any]):
+        return self.run(_call_unbound, type(handler), method_name, params)
+
+
+default_thread_pool = ThreadPool()
+
+
+def run_in_executor(pool: Optional[ExecutorPool] = None):
+    """
+    Runs a synchronous `AnnotatedHandler` method in a pool, so that blocking calls do not stall the IOLoop
+    and the other requests of the process.
+
+    Arguments:
+        pool: A `torn_open.executors.ThreadPool`, or a `torn_open.executors.ProcessPool` for CPU bound methods.
+            Defaults to `torn_open.executors.default_thread_pool`
+
+    Set `sync_method_executor` on `Application` to run every synchronous method that is not decorated in a pool.
+    The number of tasks waiting for a worker and the time they waited are served with the metrics of the application.
+
+    ## Example
+    ```python
+    reports_pool = ProcessPool("reports", max_workers=4)
+
+    class ReportHandler(AnnotatedHandler):
+        @run_in_executor(reports_pool)
+        def post(self, report: ReportRequestModel) -> ReportResponseModel:
+            return render_report(report)
+    ```
+    """
+    if pool is None:
+        pool = default_thread_pool
+
+    def decorator(func):
+        func.executor_pool = pool
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,15 +1,124 @@
-from typing import Callable, Union
+from concurrent.futures import Future
+import gzip
+import hashlib
+from typing import Callable, List, Optional, Tuple
 
+from tornado import gen
 from tornado.web import RequestHandler
 
+SPEC_CACHE_CONTROL = "public, max-age=86400"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an `Accept-Encoding` header accepts gzip, taking quality values such as `gzip;q=0` into account
+    """
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    for name in ("gzip", "x-gzip", "*"):
+        if name in qualities:
+            return qualities[name] > 0
+    return False
+
+
+class SpecDocument:
+    """
+    Serialized OpenAPI spec, built on first use and reused for every request
+    """
+
+    def __init__(
+        self,
+        serialize: Callable[[], bytes],
+        content_type: str,
+        api_spec_future: Callable[[], Future],
+    ):
+        self.serialize = serialize
+        self.content_type = content_type
+        self.api_spec_future = api_spec_future
+        self.body: Optional[bytes] = None
+        self.gzipped_body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        # The gzipped body is another representation, so caches must not answer one with the other
+        self.gzipped_etag: Optional[str] = None
+
+    def build(self) -> "SpecDocument":
+        if self.body is None:
+            body = self.serialize()
+            self.gzipped_body = gzip.compress(body)
+            digest = hashlib.sha1(body).hexdigest()
+            self.etag = f'"{digest}"'
+            self.gzipped_etag = f'"{digest}-gzip"'
+            self.body = body
+        return self
+
 
 class OpenAPISpecHandler(RequestHandler):
-    def initialize(self, get_spec: Callable[[], Union[dict, str]], *args, **kwargs):
+    def initialize(self, spec_document: SpecDocument, *args, **kwargs):
+        super().initialize(*args, **kwargs)
+        self.spec_document = spec_document
+
+    is_gzipped = False
+
+    def compute_etag(self) -> Optional[str]:
+        if self.is_gzipped:
+            return self.spec_document.gzipped_etag
+        return self.spec_document.etag
+
+    @gen.coroutine
+    def get(self):
+        # Wait for specs that are built in the background
+        yield self.spec_document.api_spec_future()
+        spec_document = self.spec_document.build()
+        self.is_gzipped = _accepts_gzip(self.request.headers.get("Accept-Encoding", ""))
+        self.set_header("Content-Type", spec_document.content_type)
+        self.set_header("Cache-Control", SPEC_CACHE_CONTROL)
+        self.set_header("Vary", "Accept-Encoding")
+        self.set_etag_header()
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+
+        if self.is_gzipped:
+            self.set_header("Content-Encoding", "gzip")
+            self.write(spec_document.gzipped_body)
+        else:
+            self.write(spec_document.body)
+
+
+class MetricsHandler(RequestHandler):
+    def initialize(self, metrics, *args, **kwargs):
+        super().initialize(*args, **kwargs)
+        self.metrics = metrics
+
+    def get(self):
+        self.set_header("Content-Type", METRICS_CONTENT_TYPE)
+        self.write(self.metrics.render())
+
+
+class ConcurrencyLimitsHandler(RequestHandler):
+    def initialize(self, operations: List[Tuple[str, str, object]], *args, **kwargs):
         super().initialize(*args, **kwargs)
-        self.spec = get_spec()
+        self.operations = operations
 
     def get(self):
-        self.write(self.spec)
+        limits = [
+            {"path": path, "method": method, **concurrency_limit.stats()}
+            for path, method, concurrency_limit in self.operations
+        ]
+        json_codec = self.settings["json_codec"]
+        self.set_header("Content-Type", json_codec.content_type)
+        self.write(json_codec.dumps({"limits": limits}))
 
 
 class RedocHandler(RequestHandler):
@@ -0,0 +1,87 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+ROOT_KEY = "__root__"
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class JSONCodec:
+    """
+    Encodes and decodes JSON for request bodies, responses, errors and the OpenAPI spec.
+    Subclass this class and pass an instance to `torn_open.web.Application` to use another JSON library.
+    """
+
+    content_type = f"{JSON_MEDIA_TYPE}; charset=UTF-8"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        raise NotImplementedError
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        raise NotImplementedError
+
+    def dumps_model(self, model: BaseModel) -> bytes:
+        data = model.dict()
+        if model.__custom_root_type__:
+            data = data[ROOT_KEY]
+        return self.dumps(data, default=model.__json_encoder__)
+
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    JSON codec backed by Python's `json` module. This is the default codec.
+    """
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return json.dumps(obj, default=default or pydantic_encoder).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSON codec backed by [orjson](https://github.com/ijl/orjson). Requires `orjson` to be installed.
+    """
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return self._orjson.dumps(
+            obj,
+            default=default or pydantic_encoder,
+            option=self._orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class UjsonCodec(JSONCodec):
+    """
+    JSON codec backed by [ujson](https://github.com/ultrajson/ultrajson). Requires `ujson>=5` to be installed.
+    """
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._ujson.loads(data)
+
+    def dumps(self, obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        return self._ujson.dumps(
+            obj,
+            default=default or pydantic_encoder,
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+
+DEFAULT_JSON_CODEC = StdlibJSONCodec()
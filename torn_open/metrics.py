@@ -0,0 +1,357 @@
+from bisect import bisect_left
+from http import HTTPStatus
+from multiprocessing.sharedctypes import RawArray
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+import tornado.process
+from tornado.routing import Matcher
+from tornado.web import RequestHandler, url
+
+from torn_open.annotated_handler import AnnotatedHandler
+from torn_open.executors import ExecutorPool
+from torn_open.routing import get_path
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (128, 1024, 8192, 65536, 524288, 4194304)
+STATUS_CODES = tuple(sorted(int(status) for status in HTTPStatus))
+OTHER = "other"
+# Error types counted per operation; further error types are counted as other
+MAX_ERROR_TYPES = 32
+
+_STATUS_INDEXES = {status: index for index, status in enumerate(STATUS_CODES)}
+_OTHER_STATUS = len(STATUS_CODES)
+
+
+def _histogram_size(buckets) -> int:
+    # One counter per bucket, one for +Inf, and the sum of observed values
+    return len(buckets) + 2
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _error_types(handler: AnnotatedHandler, method_name: str) -> List[str]:
+    """
+    Error types raised by the parsing of the params of a method, by the limits of the handler, and by the method
+    """
+    handler_class_params = handler.handler_class_params
+    error_types = {
+        error_type
+        for _, error_type, _ in handler_class_params.known_errors(method_name)
+    }
+    params_parser = handler_class_params.params_parsers.get(method_name)
+    if params_parser is not None:
+        error_types |= params_parser.error_types
+    return sorted(error_types)[:MAX_ERROR_TYPES]
+
+
+class _Operation:
+    """
+    Offsets of the counters of an operation, relative to the counters of a worker
+    """
+
+    __slots__ = (
+        "path",
+        "method",
+        "handler",
+        "_error_types",
+        "statuses",
+        "errors",
+        "latency",
+        "request_size",
+        "response_size",
+        "size",
+    )
+
+    def __init__(self, path: str, method: str, handler: AnnotatedHandler, offset: int):
+        self.path = path
+        self.method = method
+        self.handler = handler
+        self._error_types: Optional[Dict[str, int]] = None
+        self.statuses = offset
+        self.errors = self.statuses + len(STATUS_CODES) + 1
+        self.latency = self.errors + MAX_ERROR_TYPES + 1
+        self.request_size = self.latency + _histogram_size(LATENCY_BUCKETS)
+        self.response_size = self.request_size + _histogram_size(SIZE_BUCKETS)
+        self.size = self.response_size + _histogram_size(SIZE_BUCKETS) - self.statuses
+
+    @property
+    def error_types(self) -> Dict[str, int]:
+        """
+        Indexes of the error counters by error type. Found on the first error, as finding the errors raised
+        by the method parses its source; every worker finds the same indexes.
+        """
+        if self._error_types is None:
+            self._error_types = {
+                error_type: index
+                for index, error_type in enumerate(
+                    _error_types(self.handler, self.method)
+                )
+            }
+        return self._error_types
+
+
+_Route = Tuple[Pattern, Dict[str, _Operation]]
+
+
+class Metrics:
+    """
+    Request metrics of the AnnotatedHandlers of an application, per operation, and metrics of the executor pools
+    their methods run in.
+
+    Counters are preallocated in shared memory when the application is created, so that workers forked
+    afterwards, e.g. with `tornado.process.fork_processes`, record into the same memory.
+    Each worker writes to its own set of counters, which are summed when the metrics are rendered.
+    """
+
+    def __init__(
+        self,
+        handlers: List[Tuple[Union[Matcher, Pattern], AnnotatedHandler]],
+        workers: int = 1,
+        executor_pools: Sequence[ExecutorPool] = (),
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.operations: List[_Operation] = []
+        self._routes: Dict[type, List[_Route]] = {}
+
+        offset = 0
+        for matcher, handler in handlers:
+            url_spec = url(matcher, handler)
+            path = get_path(url_spec)
+            operations = {}
+            for method_name in handler.handler_class_params.response_models:
+                operation = _Operation(path, method_name, handler, offset)
+                offset += operation.size
+                operations[method_name] = operation
+                self.operations.append(operation)
+            self._routes.setdefault(handler, []).append((url_spec.regex, operations))
+
+        # Offsets of the queue depth gauge of each pool, followed by the histogram of wait times
+        self._executor_pools: Dict[ExecutorPool, int] = {}
+        for executor_pool in executor_pools:
+            if executor_pool in self._executor_pools:
+                continue
+            self._executor_pools[executor_pool] = offset
+            offset += 1 + _histogram_size(LATENCY_BUCKETS)
+            executor_pool.add_observer(self.observe_executor)
+
+        self._worker_size = offset
+        self._values = RawArray("d", max(offset, 1) * workers)
+
+    def _find_operation(self, handler: RequestHandler) -> Optional[_Operation]:
+        routes = self._routes.get(type(handler))
+        if routes is None:
+            return None
+        if len(routes) == 1:
+            operations = routes[0][1]
+        else:
+            # The handler class is routed from several paths
+            path = handler.request.path
+            operations = next(
+                (operations for regex, operations in routes if regex.match(path)),
+                None,
+            )
+            if operations is None:
+                return None
+        return operations.get(handler.request.method.lower())
+
+    def observe(self, handler: RequestHandler):
+        """
+        Records a finished request
+        """
+        operation = self._find_operation(handler)
+        if operation is None:
+            return
+
+        values = self._values
+        base = ((tornado.process.task_id() or 0) % self.workers) * self._worker_size
+
+        status = _STATUS_INDEXES.get(handler.get_status(), _OTHER_STATUS)
+        values[base + operation.statuses + status] += 1
+
+        error_type = (
+            handler._error_type if isinstance(handler, AnnotatedHandler) else None
+        )
+        if error_type is not None:
+            error = operation.error_types.get(error_type, MAX_ERROR_TYPES)
+            values[base + operation.errors + error] += 1
+
+        self._observe(
+            base + operation.latency, LATENCY_BUCKETS, handler.request.request_time()
+        )
+        request_size = handler.request.headers.get("Content-Length")
+        if request_size is not None:
+            self._observe(
+                base + operation.request_size, SIZE_BUCKETS, int(request_size)
+            )
+        response_size = handler._headers.get("Content-Length")
+        if response_size is not None:
+            self._observe(
+                base + operation.response_size, SIZE_BUCKETS, int(response_size)
+            )
+
+    def observe_executor(self, executor_pool: ExecutorPool, wait_time: Optional[float]):
+        """
+        Records the queue depth of a pool, and the time a task waited for a worker once it started
+        """
+        offset = self._executor_pools[executor_pool]
+        base = ((tornado.process.task_id() or 0) % self.workers) * self._worker_size
+        self._values[base + offset] = executor_pool.queued
+        if wait_time is not None:
+            self._observe(base + offset + 1, LATENCY_BUCKETS, wait_time)
+
+    def _observe(self, offset: int, buckets: Tuple[float, ...], value: float):
+        values = self._values
+        values[offset + bisect_left(buckets, value)] += 1
+        values[offset + len(buckets) + 1] += value
+
+    def _totals(self) -> List[float]:
+        values = self._values
+        size = self._worker_size
+        totals = list(values[0:size])
+        for worker in range(1, self.workers):
+            start = worker * size
+            for index, value in enumerate(values[start : start + size]):
+                totals[index] += value
+        return totals
+
+    def render(self) -> bytes:
+        """
+        Renders the metrics in the Prometheus text format
+        """
+        totals = self._totals()
+        requests = []
+        errors = []
+        latency = []
+        request_size = []
+        response_size = []
+        for operation in self.operations:
+            labels = f'path="{_escape(operation.path)}",method="{operation.method}"'
+            for index, status in enumerate(STATUS_CODES + (OTHER,)):
+                count = totals[operation.statuses + index]
+                if count:
+                    requests.append(
+                        f'torn_open_requests_total{{{labels},status="{status}"}}'
+                        f" {_format_value(count)}"
+                    )
+            error_counts = totals[
+                operation.errors : operation.errors + MAX_ERROR_TYPES + 1
+            ]
+            if any(error_counts):
+                error_types = list(operation.error_types)
+                for index, count in enumerate(error_counts):
+                    if count:
+                        error_type = (
+                            error_types[index] if index < len(error_types) else OTHER
+                        )
+                        errors.append(
+                            f"torn_open_errors_total{{{labels},"
+                            f'error_type="{_escape(error_type)}"}} {_format_value(count)}'
+                        )
+            latency += self._render_histogram(
+                "torn_open_request_duration_seconds",
+                labels,
+                totals,
+                operation.latency,
+                LATENCY_BUCKETS,
+            )
+            request_size += self._render_histogram(
+                "torn_open_request_size_bytes",
+                labels,
+                totals,
+                operation.request_size,
+                SIZE_BUCKETS,
+            )
+            response_size += self._render_histogram(
+                "torn_open_response_size_bytes",
+                labels,
+                totals,
+                operation.response_size,
+                SIZE_BUCKETS,
+            )
+
+        queue_depth = []
+        wait_time = []
+        for executor_pool, offset in self._executor_pools.items():
+            labels = f'executor="{_escape(executor_pool.name)}"'
+            queue_depth.append(
+                f"torn_open_executor_queue_depth{{{labels}}}"
+                f" {_format_value(totals[offset])}"
+            )
+            wait_time += self._render_histogram(
+                "torn_open_executor_wait_seconds",
+                labels,
+                totals,
+                offset + 1,
+                LATENCY_BUCKETS,
+            )
+
+        lines = [
+            "# HELP torn_open_requests_total Requests handled, by status code",
+            "# TYPE torn_open_requests_total counter",
+            *requests,
+            "# HELP torn_open_errors_total ClientErrors and ServerErrors raised, by error type",
+            "# TYPE torn_open_errors_total counter",
+            *errors,
+            "# HELP torn_open_request_duration_seconds Time to handle requests",
+            "# TYPE torn_open_request_duration_seconds histogram",
+            *latency,
+            "# HELP torn_open_request_size_bytes Size of request bodies",
+            "# TYPE torn_open_request_size_bytes histogram",
+            *request_size,
+            "# HELP torn_open_response_size_bytes Size of response bodies",
+            "# TYPE torn_open_response_size_bytes histogram",
+            *response_size,
+        ]
+        if self._executor_pools:
+            lines += [
+                "# HELP torn_open_executor_queue_depth Tasks waiting for a worker of the executor pool",
+                "# TYPE torn_open_executor_queue_depth gauge",
+                *queue_depth,
+                "# HELP torn_open_executor_wait_seconds Time tasks waited for a worker of the executor pool",
+                "# TYPE torn_open_executor_wait_seconds histogram",
+                *wait_time,
+            ]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _render_histogram(
+        name: str, labels: str, totals: List[float], offset: int, buckets
+    ) -> List[str]:
+        counts = totals[offset : offset + len(buckets) + 1]
+        count = sum(counts)
+        if not count:
+            return []
+        lines = []
+        cumulative = 0.0
+        for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+            lines.append(
+                f'{name}_bucket{{{labels},le="{le}"}} {_format_value(cumulative)}'
+            )
+        total = totals[offset + len(buckets) + 1]
+        lines.append(f"{name}_sum{{{labels}}} {_format_value(total)}")
+        lines.append(f"{name}_count{{{labels}}} {_format_value(count)}")
+        return lines
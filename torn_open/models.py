@@ -1,3 +1,5 @@
+from typing import Any, Dict, List, Optional, Union
+
 from pydantic import BaseModel
 
 
@@ -9,28 +11,81 @@ class ResponseModel(BaseModel):
     pass
 
 
+class Response:
+    """
+    Envelope for returning a ResponseModel, or a dict of its fields, with a custom status code and headers
+    """
+
+    __slots__ = ("model", "status_code", "headers")
+
+    def __init__(
+        self,
+        model: Optional[Union[ResponseModel, Dict[str, Any]]] = None,
+        *,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.model = model
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _restore_error(error_class, attributes: Dict[str, Any]) -> "HTTPJsonError":
+    error = error_class.__new__(error_class)
+    error.__dict__.update(attributes)
+    return error
+
+
 class HTTPJsonError(Exception):
-    def __init__(self, status_code: int, error_type: str, message: str = None):
+    def __init__(
+        self,
+        status_code: int,
+        error_type: str,
+        message: str = None,
+        errors: Optional[List[Dict[str, Any]]] = None,
+    ):
         self.status_code = status_code
         self.type = error_type
         self.message = message
+        self.errors = errors
+
+    def __reduce__(self):
+        # The arguments are keyword only, so errors raised in process pools are unpickled from their attributes
+        return _restore_error, (self.__class__, self.__dict__)
 
     def json(self):
-        return {
+        data = {
             "type": self.type,
             "message": self.message,
         }
+        if self.errors is not None:
+            data["errors"] = self.errors
+        return data
 
 
 class ClientError(HTTPJsonError):
-    def __init__(self, *, status_code: int, error_type: str, message: str = None):
+    def __init__(
+        self,
+        *,
+        status_code: int,
+        error_type: str,
+        message: str = None,
+        errors: Optional[List[Dict[str, Any]]] = None,
+    ):
         if status_code < 400 or status_code > 499:
             raise ValueError(f"invalid {status_code} for ClientError")
-        super().__init__(status_code, error_type, message)
+        super().__init__(status_code, error_type, message, errors)
 
 
 class ServerError(HTTPJsonError):
-    def __init__(self, *, status_code: int, error_type: str, message: str = None):
+    def __init__(
+        self,
+        *,
+        status_code: int,
+        error_type: str,
+        message: str = None,
+        errors: Optional[List[Dict[str, Any]]] = None,
+    ):
         if status_code < 500 or status_code > 599:
             raise ValueError(f"invalid {status_code} for ClientError")
-        super().__init__(status_code, error_type, message)
+        super().__init__(status_code, error_type, message, errors)
@@ -0,0 +1,186 @@
+"""
+Router that finds the candidate rules of a path in a trie of the static prefixes of their patterns,
+instead of trying the regex of every rule in order.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from tornado.routing import PathMatches, Rule
+from tornado.web import _ApplicationRouter
+
+_SPECIAL_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
+# Characters after a literal that make it optional or repeated
+_QUANTIFIERS = frozenset("*?{")
+# Flags under which the literal text of a pattern does not match itself
+_UNINDEXED_FLAGS = re.IGNORECASE | re.VERBOSE
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A ] right after [ or [^ is a literal
+            if pattern[index + 1 : index + 2] == "^":
+                index += 1
+            if pattern[index + 1 : index + 2] == "]":
+                index += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        index += 1
+    return False
+
+
+def static_prefix(pattern: str) -> Optional[str]:
+    """
+    Returns the literal text that every path matched by the pattern starts with,
+    or None if the pattern has alternatives at its top level
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+
+    prefix = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1 : index + 2]
+            # Escapes such as \d or \w are character classes
+            if not escaped or escaped.isalnum():
+                break
+            literal, width = escaped, 2
+        elif char in _SPECIAL_CHARACTERS:
+            break
+        else:
+            literal, width = char, 1
+        if pattern[index + width : index + width + 1] in _QUANTIFIERS:
+            break
+        prefix.append(literal)
+        index += width
+    return "".join(prefix)
+
+
+class _TrieNode:
+    __slots__ = ("children", "partials", "lengths")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Indexes of the rules by the rest of their prefix after the last full segment,
+        # which the next segment of the path must start with
+        self.partials: Dict[str, List[int]] = {}
+        self.lengths: List[int] = []
+
+    def add_partial(self, partial: str, index: int):
+        self.partials.setdefault(partial, []).append(index)
+        if len(partial) not in self.lengths:
+            self.lengths.append(len(partial))
+            self.lengths.sort()
+
+    def match_partials(self, segment: str, indexes: List[int]):
+        for length in self.lengths:
+            if length > len(segment):
+                return
+            matching = self.partials.get(segment[:length])
+            if matching:
+                indexes.extend(matching)
+
+
+class _RuleIndex:
+    """
+    Trie of the static prefixes of path rules, split into segments. Rules without a usable prefix,
+    or with another kind of matcher, are candidates for every path.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self.size = len(rules)
+        self.root = _TrieNode()
+        self.unindexed: List[int] = []
+        for index, rule in enumerate(rules):
+            prefix = None
+            if isinstance(rule.matcher, PathMatches):
+                regex = rule.matcher.regex
+                if not regex.flags & _UNINDEXED_FLAGS:
+                    prefix = static_prefix(regex.pattern)
+            if not prefix:
+                self.unindexed.append(index)
+                continue
+
+            *segments, partial = prefix.split("/")
+            node = self.root
+            for segment in segments:
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _TrieNode()
+                node = child
+            node.add_partial(partial, index)
+
+    def candidates(self, path: str) -> List[Rule]:
+        """
+        Rules that may match the path, in their order
+        """
+        indexes = list(self.unindexed)
+        node = self.root
+        segments = path.split("/")
+        last = len(segments) - 1
+        for position, segment in enumerate(segments):
+            if node.lengths:
+                node.match_partials(segment, indexes)
+            if position == last:
+                break
+            node = node.children.get(segment)
+            if node is None:
+                break
+
+        if len(indexes) > 1:
+            indexes.sort()
+        rules = self.rules
+        return [rules[index] for index in indexes]
+
+
+class TrieRouter(_ApplicationRouter):
+    """
+    Application router that only tries the rules whose pattern can match the path of the request.
+    Rules are still tried in order, so the first matching rule handles the request, as with Tornado's router.
+    """
+
+    def __init__(self, application, rules=None):
+        self._index: Optional[_RuleIndex] = None
+        super().__init__(application, rules)
+
+    def add_rules(self, rules):
+        super().add_rules(rules)
+        self._index = None
+
+    def find_handler(self, request, **kwargs):
+        index = self._index
+        # Rebuilt if rules were appended to the list without `add_rules`
+        if index is None or index.size != len(self.rules):
+            index = self._index = _RuleIndex(self.rules)
+
+        for rule in index.candidates(request.path):
+            target_params = rule.matcher.match(request)
+            if target_params is not None:
+                if rule.target_kwargs:
+                    target_params["target_kwargs"] = rule.target_kwargs
+                delegate = self.get_target_delegate(
+                    rule.target, request, **target_params
+                )
+                if delegate is not None:
+                    return delegate
+        return None
@@ -5,8 +5,6 @@ from tornado.web import url, RequestHandler, Application
 from tornado.routing import URLSpec, Rule, RuleRouter, Matcher
 
 from torn_open.annotated_handler import AnnotatedHandler
-from torn_open.api_spec.core import TornOpenAPISpec
-from torn_open.api_spec.plugin import TornOpenPlugin
 
 _TornadoRule = Union[
     URLSpec,
@@ -85,19 +83,44 @@ def _gather_rules(
             yield from _gather_rules(target.rules)
 
 
-def create_api_spec(rules: List[_Rule]):
-    api_spec = TornOpenAPISpec(
-        title="tornado-server",
-        version="1.0.0",
-        openapi_version="3.0.0",
-        plugins=[TornOpenPlugin()],
-    )
+def register_handlers(
+    rules: List[_Rule],
+) -> List[Tuple[Union[Matcher, Pattern], AnnotatedHandler]]:
+    """
+    Builds the params tables that AnnotatedHandlers need to parse requests
+    """
+    handlers = []
     for matcher, target in _gather_rules(rules):
         _assert_only_named_path_params(matcher)
         target._set_params(matcher)
-        api_spec.path(
-            url_spec=url(matcher, target),
-            handler_class=target,
-            description=target.__doc__,
-        )
-    return api_spec
+        handlers.append((matcher, target))
+    return handlers
+
+
+# Path helper methods
+def get_path(url_spec):
+    path = replace_path_with_openapi_placeholders(url_spec)
+    path = right_strip_path(path)
+    return path
+
+
+def extract_and_sort_path_path_params(url_spec):
+    path_params = url_spec.regex.groupindex
+    path_params = {
+        k: v for k, v in sorted(path_params.items(), key=lambda item: item[1])
+    }
+    path_params = tuple(f"{{{param}}}" for param in path_params)
+    return path_params
+
+
+def replace_path_with_openapi_placeholders(url_spec):
+    path = url_spec.matcher._path
+    if url_spec.regex.groups == 0:
+        return path
+
+    path_params = extract_and_sort_path_path_params(url_spec)
+    return path % path_params
+
+
+def right_strip_path(path):
+    return path.rstrip("/*")
@@ -0,0 +1,164 @@
+"""
+Deterministic simulation of a concurrency limit in front of a method with a fixed capacity.
+Time is simulated, so a run takes milliseconds and gives the same result for the same seed.
+
+    result = simulate(
+        AdaptiveConcurrencyLimit(latency_target=0.1),
+        arrival_rate=500,
+        capacity=20,
+        service_time=0.05,
+        duration=60,
+    )
+"""
+
+import heapq
+import random
+from collections import deque
+from typing import Callable, Deque, List, Tuple, Union
+
+from torn_open.concurrency import ConcurrencyLimit
+
+# A constant, or a function of the simulated time in seconds
+Schedule = Union[float, Callable[[float], float]]
+
+_ARRIVAL = 0
+_COMPLETION = 1
+
+
+def _at(schedule: Schedule, now: float) -> float:
+    return schedule(now) if callable(schedule) else schedule
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * percentile))
+    return values[index]
+
+
+class SimulationResult:
+    """
+    Outcome of `simulate`. Latencies include the time requests waited in the queue.
+    """
+
+    def __init__(
+        self,
+        duration: float,
+        latencies: List[float],
+        rejected: int,
+        limits: List[Tuple[float, int]],
+    ):
+        self.duration = duration
+        self.latencies = latencies
+        self.completed = len(latencies)
+        self.rejected = rejected
+        # Time and value of every change of the limit
+        self.limits = limits
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.duration
+
+    def latency(self, percentile: float) -> float:
+        return _percentile(self.latencies, percentile)
+
+    def summary(self) -> dict:
+        return {
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "throughput": self.throughput,
+            "p50": self.latency(0.5),
+            "p99": self.latency(0.99),
+            "final_limit": self.limits[-1][1],
+        }
+
+
+def simulate(
+    concurrency_limit: ConcurrencyLimit,
+    *,
+    arrival_rate: Schedule,
+    capacity: Schedule,
+    service_time: Schedule,
+    duration: float,
+    seed: int = 0,
+) -> SimulationResult:
+    """
+    Runs requests arriving at a positive `arrival_rate` per second, following a Poisson process, through the limit.
+
+    The method executes `capacity` requests at a time in `service_time` seconds each; executions beyond the capacity
+    share it, and take proportionally longer. Each argument can be a function of the simulated time, to model
+    load spikes or a degraded dependency. Requests that the limit rejects, because its queue is full or they waited
+    longer than its `max_wait`, are counted as rejected.
+
+    Arguments:
+        concurrency_limit: Limit under test. Its counters are updated by the simulation
+        arrival_rate: Requests per second
+        capacity: Number of executions the method handles without slowing down
+        service_time: Seconds an execution takes within the capacity
+        duration: Simulated seconds during which requests arrive
+        seed: Seed of the arrival times
+    """
+    rng = random.Random(seed)
+    # Time, sequence number to order simultaneous events, kind, arrival and start times of the request
+    events: List[Tuple[float, int, int, float, float]] = []
+    sequence = 0
+
+    def schedule(time: float, kind: int, arrived_at: float, started_at: float):
+        nonlocal sequence
+        heapq.heappush(events, (time, sequence, kind, arrived_at, started_at))
+        sequence += 1
+
+    queue: Deque[float] = deque()
+    latencies: List[float] = []
+    rejected = 0
+    limits = [(0.0, concurrency_limit.limit)]
+
+    def reject():
+        nonlocal rejected
+        rejected += 1
+        concurrency_limit.rejected += 1
+
+    def start(now: float, arrived_at: float):
+        # The execution is slowed down by the executions already in flight beyond the capacity
+        load = max(1.0, concurrency_limit.in_flight / _at(capacity, now))
+        schedule(now + _at(service_time, now) * load, _COMPLETION, arrived_at, now)
+
+    def start_queued(now: float):
+        while queue:
+            arrived_at = queue[0]
+            max_wait = concurrency_limit.max_wait
+            if max_wait is not None and now - arrived_at > max_wait:
+                queue.popleft()
+                reject()
+                continue
+            if not concurrency_limit.try_acquire():
+                return
+            queue.popleft()
+            start(now, arrived_at)
+
+    schedule(rng.expovariate(_at(arrival_rate, 0.0)), _ARRIVAL, 0.0, 0.0)
+    while events:
+        now, _, kind, arrived_at, started_at = heapq.heappop(events)
+        if kind == _ARRIVAL:
+            if now >= duration:
+                continue
+            next_arrival = now + rng.expovariate(_at(arrival_rate, now))
+            schedule(next_arrival, _ARRIVAL, 0.0, 0.0)
+            start_queued(now)
+            if not queue and concurrency_limit.try_acquire():
+                start(now, now)
+            elif len(queue) < concurrency_limit.max_queue:
+                queue.append(now)
+            else:
+                reject()
+        else:
+            latencies.append(now - arrived_at)
+            # As in handlers, the limit observes the execution time, without the wait in the queue
+            concurrency_limit.release(now - started_at)
+            start_queued(now)
+
+        if concurrency_limit.limit != limits[-1][1]:
+            limits.append((now, concurrency_limit.limit))
+
+    return SimulationResult(duration, latencies, rejected, limits)
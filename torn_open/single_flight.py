@@ -0,0 +1,103 @@
+from functools import wraps
+from typing import Any, Dict, Hashable, Optional
+
+from tornado.concurrent import Future
+
+from torn_open.cache import _freeze_key
+
+
+class SingleFlight:
+    """
+    In-flight executions of a handler method, keyed by the handler class and the parsed params of the method
+    """
+
+    def __init__(self, max_wait: float):
+        if max_wait <= 0:
+            raise ValueError("max_wait must be positive")
+        self.max_wait = max_wait
+        self.in_flight: Dict[Hashable, Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    @staticmethod
+    def key(handler_class: type, params: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Returns the key of the params, or None if they cannot be coalesced
+        """
+        params_key = _freeze_key(params)
+        if params_key is None:
+            return None
+        return handler_class, params_key
+
+    def join(self, key: Hashable) -> Optional[Future]:
+        """
+        Returns the future of the execution in flight for the key,
+        or None if there is none and the caller is to execute the method and `finish` it
+        """
+        future = self.in_flight.get(key)
+        if future is None:
+            self.in_flight[key] = Future()
+            self.executions += 1
+        return future
+
+    def finish(self, key: Hashable, response, exception: Optional[BaseException]):
+        """
+        Shares the encoded response, or the exception raised by the method, with the requests waiting for it
+        """
+        future = self.in_flight.pop(key)
+        # The outcome is set as a result, so that exceptions nobody waited for are not logged
+        future.set_result((response, exception))
+
+    def ratio(self) -> float:
+        """
+        Share of requests that were served by the execution of another request
+        """
+        requests = self.executions + self.coalesced
+        return self.coalesced / requests if requests else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "in_flight": len(self.in_flight),
+            "ratio": self.ratio(),
+        }
+
+
+def single_flight(max_wait: float = 5):
+    """
+    Coalesces concurrent identical requests to an `AnnotatedHandler` method: while the method is executing for a
+    set of path, query and json params, requests with the same params wait for it and share its serialized response,
+    or its `ClientError` or `ServerError`. Use it for methods without side effects, such as `get`.
+    Only responses returned by the method are shared; requests whose execution wrote its output with `self.write`
+    execute the method themselves.
+
+    Arguments:
+        max_wait: Seconds a request waits for the execution in flight before executing the method itself
+
+    Combined with `cache`, only requests that miss the cache are coalesced, which avoids a thundering herd when an entry
+    expires. The executions are available as the `single_flight` attribute of the decorated method, and
+    `MyHandler.get.single_flight.stats()` returns counters of executions and coalesced requests, and their ratio.
+
+    ## Example
+    ```python
+    class PriceHandler(AnnotatedHandler):
+        @cache(ttl=60)
+        @single_flight(max_wait=2)
+        async def get(self, product_id: int) -> PriceResponseModel:
+            ...
+    ```
+    """
+
+    def decorator(func):
+        func.single_flight = SingleFlight(max_wait)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,73 @@
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from tornado.log import app_log
+from tornado.web import RequestHandler
+
+
+class RequestTimings:
+    """
+    Durations of the phases of a request handled by an `AnnotatedHandler`, in seconds.
+
+    Phases are recorded in the order they run, and only if they run:
+
+    - `xsrf`: XSRF cookie check
+    - `prepare`: `RequestHandler.prepare`
+    - `queue`: waiting for a slot of the method's concurrency limit
+    - `body`: waiting for streamed request bodies
+    - `bind`: parsing and validating path, query and json params
+    - `handler`: the handler method
+    - `cache`: serving from, or filling, the response cache, including the handler method on misses
+    - `single_flight`: the handler method, or waiting for the execution in flight with the same params
+    - `serialize`: building and encoding the response model
+    - `stream`: iterating over, encoding and writing streamed responses
+    - `error`: the handler method raised a `ClientError` or `ServerError`
+    """
+
+    __slots__ = ("method", "phases", "_last")
+
+    def __init__(self, method: str):
+        self.method = method
+        self.phases: List[Tuple[str, float]] = []
+        self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        """
+        Records the time since the previous mark as the duration of phase
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return sum(duration for _, duration in self.phases)
+
+    def server_timing(self) -> str:
+        """
+        Value of the `Server-Timing` header, with durations in milliseconds
+        """
+        return ", ".join(
+            f"{phase};dur={duration * 1000:.3f}" for phase, duration in self.phases
+        )
+
+
+TimingHook = Callable[[RequestHandler, RequestTimings], None]
+
+
+class RequestTiming:
+    """
+    Request timing settings of an `Application`
+    """
+
+    def __init__(self, server_timing: bool, hooks: Sequence[TimingHook]):
+        self.server_timing = server_timing
+        self.hooks = tuple(hooks)
+
+    def record(self, handler: RequestHandler, timings: RequestTimings):
+        for hook in self.hooks:
+            # A failing hook must not affect the response, nor the other hooks
+            try:
+                hook(handler, timings)
+            except Exception:
+                app_log.exception("Exception in request timing hook %r", hook)
@@ -1,13 +1,23 @@
 from sys import version_info
+import array
 import functools
+import warnings
 from typing import (
     Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
     List,
     Union,
     Tuple,
     Optional,
 )
 from enum import EnumMeta
+import collections.abc
 
 python_minor_version = version_info[1]
 if python_minor_version < 7:
@@ -27,6 +37,53 @@ OptionalType = Optional[type]
 OptionalList = Optional[List]
 GenericAliases = (_SpecialGenericAlias, _GenericAlias)
 AllPrimitives = (int, float, str, bool)
+BulkPrimitives = (int, float)
+
+
+class _Array(array.array):
+    """
+    Base class for memory compact list annotations. Subclasses are instances of `array.array`
+    """
+
+    item_type: type
+    item_typecode: str
+    item_schema: dict
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value):
+        return cls(cls.item_typecode, value)
+
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        field_schema.update(type="array", items=cls.item_schema)
+
+
+class IntArray(_Array):
+    """
+    Annotation for lists of 64-bit integers, stored as an `array.array`
+    """
+
+    item_type = int
+    item_typecode = "q"
+    item_schema = {"type": "integer"}
+
+
+class FloatArray(_Array):
+    """
+    Annotation for lists of floats, stored as an `array.array`
+    """
+
+    item_type = float
+    item_typecode = "d"
+    item_schema = {"type": "number"}
+
+
+# error_type of the ValidationErrors raised by casters
+CAST_ERROR_TYPES = frozenset({"invalid_value", "invalid_enum", "invalid_tuple_length"})
 
 
 class ValidationError(Exception):
@@ -55,6 +112,37 @@ def is_generic(parameter_type, types):
 
 is_list = functools.partial(is_generic, types=(list, List))
 is_tuple = functools.partial(is_generic, types=(tuple, Tuple))
+is_iterator = functools.partial(
+    is_generic,
+    types=(
+        Iterator,
+        Iterable,
+        Generator,
+        AsyncIterator,
+        AsyncIterable,
+        AsyncGenerator,
+        collections.abc.Iterator,
+        collections.abc.Iterable,
+        collections.abc.Generator,
+        collections.abc.AsyncIterator,
+        collections.abc.AsyncIterable,
+        collections.abc.AsyncGenerator,
+    ),
+)
+
+
+def is_array(parameter_type):
+    return isinstance(parameter_type, type) and issubclass(parameter_type, _Array)
+
+
+def is_sequence(parameter_type):
+    """
+    Sequence params can be passed as comma separated values, repeated keys, or both
+    """
+    parameter_type = retrieve_type(parameter_type)
+    return (
+        is_list(parameter_type) or is_tuple(parameter_type) or is_array(parameter_type)
+    )
 
 
 def is_ellipses_tuple(parameter_type):
@@ -68,97 +156,245 @@ def is_primitive(parameter_type: type):
 
 
 def cast(parameter_type: Union[type, OptionalType, OptionalList], val: Any):
+    return compile_caster(parameter_type)(val)
+
+
+CASTER_CACHE_SIZE = 1024
+
+
+def compile_caster(
+    parameter_type: Union[type, OptionalType, OptionalList],
+) -> Callable[[Any], Any]:
+    """
+    Resolves the shape of an annotation once and returns a callable that casts a single value.
+    Casters are memoized by annotation; unhashable annotations are compiled on every call.
+    """
+    try:
+        return _compile_caster_cached(parameter_type)
+    except TypeError:
+        return _compile_caster(parameter_type)
+
+
+def _compile_caster(parameter_type):
     parameter_type = retrieve_type(parameter_type)
 
     if is_list(parameter_type):
-        return cast_list(parameter_type, val)
+        return _compile_list_caster(parameter_type)
 
     if is_tuple(parameter_type):
-        return cast_tuple(parameter_type, val)
+        return _compile_tuple_caster(parameter_type)
+
+    if is_array(parameter_type):
+        return _compile_array_caster(parameter_type)
 
     if isinstance(parameter_type, EnumMeta):
-        return cast_enum(parameter_type, val)
+        return functools.partial(cast_enum, parameter_type)
 
     # Handle primitive params
+    if parameter_type is bool:
+        return cast_bool
     if is_primitive(parameter_type):
-        return cast_primitive(parameter_type, val)
+        return _compile_primitive_caster(parameter_type)
+    return _identity
+
+
+_compile_caster_cached = functools.lru_cache(maxsize=CASTER_CACHE_SIZE)(_compile_caster)
+
+
+def _identity(val):
     return val
 
 
-def retrieve_type(parameter_type):
-    if is_optional(parameter_type):
-        parameter_type = parameter_type.__args__[0]
+def _compile_primitive_caster(parameter_type):
+    def cast_primitive(val):
+        try:
+            return parameter_type(val)
+        except ValueError as e:
+            raise ValidationError("invalid_value", val) from e
 
-    if isinstance(parameter_type, tuple):
-        parameter_type = parameter_type[0]
+    return cast_primitive
 
-    return parameter_type
 
+def _compile_list_caster(parameter_type):
+    if not getattr(parameter_type, "__args__", None):
+        inner_type = str
+    else:
+        inner_type = parameter_type.__args__[0]
 
-def cast_primitive(parameter_type, val):
-    if parameter_type is bool:
-        return cast_bool(val)
+    if not isinstance(inner_type, EnumMeta) and not is_primitive(inner_type):
+        return _split
 
-    try:
-        return parameter_type(val)
-    except ValueError as e:
-        raise ValidationError("invalid_value", val) from e
+    cast_items = _compile_items_caster(inner_type)
 
+    def cast_list(val):
+        return cast_items(val.split(","))
 
-def cast_bool(val):
-    val = str(val).lower()
-    if val in ("1", "true", "on"):
-        return True
+    return cast_list
 
-    elif val in ("0", "false", "off"):
-        return False
 
+def _split(val):
+    return val.split(",")
 
-def cast_list(parameter_type: Union[type, OptionalType, OptionalList], val: str):
-    val_list: List = val.split(",")
+
+def _compile_items_caster(inner_type):
+    """
+    Returns a callable that casts a list of values to inner_type.
+    Values of bulk types are cast in a single pass with `map`.
+    """
+    if inner_type is str:
+        return _identity
+
+    cast_item = compile_caster(inner_type)
+    if inner_type not in BulkPrimitives:
+
+        def cast_items(values):
+            return [cast_item(value) for value in values]
+
+        return cast_items
+
+    def cast_bulk_items(values):
+        try:
+            return list(map(inner_type, values))
+        except ValueError:
+            # Cast item by item to raise a ValidationError for the invalid value
+            for value in values:
+                cast_item(value)
+            raise
+
+    return cast_bulk_items
+
+
+def _compile_array_caster(parameter_type):
+    cast_items = _compile_items_caster(parameter_type.item_type)
+
+    def cast_array(val):
+        items = cast_items(val.split(","))
+        try:
+            return parameter_type(parameter_type.item_typecode, items)
+        except OverflowError as e:
+            raise ValidationError("invalid_value", val) from e
+
+    return cast_array
+
+
+def _compile_tuple_caster(parameter_type):
     if not getattr(parameter_type, "__args__", None):
-        inner_type = str
-    else:
-        inner_type = parameter_type.__args__[0]
-    if isinstance(inner_type, EnumMeta):
-        return cast_enum_list(inner_type, val_list)
-    return cast_list_items(inner_type, val_list)
+        return _split_tuple
+
+    inner_types = parameter_type.__args__
+    if is_ellipses_tuple(parameter_type):
+        cast_items = _compile_items_caster(inner_types[0])
+
+        def cast_ellipses_tuple(val):
+            return tuple(cast_items(val.split(",")))
+
+        return cast_ellipses_tuple
+
+    cast_items = tuple(compile_caster(inner_type) for inner_type in inner_types)
+
+    def cast_tuple(val):
+        values = val.split(",")
+        if len(values) != len(cast_items):
+            raise ValidationError("invalid_tuple_length", values)
+        return tuple([cast_item(value) for cast_item, value in zip(cast_items, values)])
+
+    return cast_tuple
+
+
+def _split_tuple(val):
+    return tuple(val.split(","))
+
+
+def _warn_deprecated(name: str):
+    warnings.warn(
+        f"torn_open.types.{name} is deprecated, use torn_open.types.compile_caster",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
+
+def cast_primitive(parameter_type, val):
+    """
+    Deprecated; use `compile_caster(parameter_type)(val)`
+    """
+    _warn_deprecated("cast_primitive")
+    return compile_caster(parameter_type)(val)
+
+
+def cast_list(parameter_type: Union[type, OptionalType, OptionalList], val: str):
+    """
+    Deprecated; use `compile_caster(parameter_type)(val)`
+    """
+    _warn_deprecated("cast_list")
+    return compile_caster(parameter_type)(val)
 
 
 def cast_list_items(parameter_type: type, val: List):
+    """
+    Deprecated; use `compile_caster(List[parameter_type])` on the comma separated values
+    """
+    _warn_deprecated("cast_list_items")
     if not is_primitive(parameter_type):
         return val
-    return [cast(parameter_type, item) for item in val]
+    return _compile_items_caster(parameter_type)(val)
 
 
 def cast_enum_list(enum: EnumMeta, val: List[Any]):
-    return [cast_enum(enum, item) for item in val]
+    """
+    Deprecated; use `compile_caster(List[enum])` on the comma separated values
+    """
+    _warn_deprecated("cast_enum_list")
+    return _compile_items_caster(enum)(val)
 
 
 def cast_tuple(parameter_type: Union[type, OptionalType, OptionalList], val: str):
-    val_list: List = val.split(",")
-    if type(parameter_type) is type:
-        return tuple(val_list)
-
-    inner_types = parameter_type.__args__
-    if is_ellipses_tuple(parameter_type):
-        return cast_ellipses_tuple(val_list, inner_types[0])
-    return cast_tuple_items(val_list, inner_types)
+    """
+    Deprecated; use `compile_caster(parameter_type)(val)`
+    """
+    _warn_deprecated("cast_tuple")
+    return compile_caster(parameter_type)(val)
 
 
 def cast_ellipses_tuple(values, inner_type):
-    casted_list = [cast(inner_type, value) for value in values]
-    return tuple(casted_list)
+    """
+    Deprecated; use `compile_caster(Tuple[inner_type, ...])` on the comma separated values
+    """
+    _warn_deprecated("cast_ellipses_tuple")
+    return tuple(_compile_items_caster(inner_type)(values))
 
 
 def cast_tuple_items(values, inner_types):
+    """
+    Deprecated; use `compile_caster(Tuple[inner_types])` on the comma separated values
+    """
+    _warn_deprecated("cast_tuple_items")
     if len(values) != len(inner_types):
         raise ValidationError("invalid_tuple_length", values)
+    return tuple(
+        [
+            compile_caster(inner_type)(value)
+            for inner_type, value in zip(inner_types, values)
+        ]
+    )
+
+
+def retrieve_type(parameter_type):
+    if is_optional(parameter_type):
+        parameter_type = parameter_type.__args__[0]
 
-    casted_list = [
-        cast(inner_type, value) for inner_type, value in zip(inner_types, values)
-    ]
-    return tuple(casted_list)
+    if isinstance(parameter_type, tuple):
+        parameter_type = parameter_type[0]
+
+    return parameter_type
+
+
+def cast_bool(val):
+    val = str(val).lower()
+    if val in ("1", "true", "on"):
+        return True
+
+    elif val in ("0", "false", "off"):
+        return False
 
 
 def cast_enum(enum: EnumMeta, val: Any):
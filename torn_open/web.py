@@ -1,13 +1,42 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
 from tornado.web import Application as BaseApplication, url
 
-from torn_open.api_spec import create_api_spec
-from torn_open.handlers import OpenAPISpecHandler, RedocHandler
+from torn_open import api_spec as api_spec_module
+from torn_open.artifact import Artifact
+from torn_open.batch import BatchHandler
+from torn_open.concurrency import ConcurrencyLimit
+from torn_open.executors import ExecutorPool
+from torn_open.handlers import (
+    ConcurrencyLimitsHandler,
+    MetricsHandler,
+    OpenAPISpecHandler,
+    RedocHandler,
+    SpecDocument,
+)
+from torn_open.json_codecs import JSONCodec, DEFAULT_JSON_CODEC
+from torn_open.router import TrieRouter
+from torn_open.routing import get_path, register_handlers
+from torn_open.timing import RequestTiming, TimingHook
+
+if TYPE_CHECKING:
+    from torn_open.api_spec.core import TornOpenAPISpec
+
+API_SPEC_BUILD_MODES = ("eager", "lazy", "background")
+
+
+def _completed_future() -> Future:
+    future = Future()
+    future.set_result(None)
+    return future
 
 
 class Application(BaseApplication):
     """
     The Application class subclasses Tornado's Application class and adds additional options for customizing the OpenAPI and Redoc routes.
     On initialization, the Application class wil review the handlers and generate OpenAPI spec.
+    Generating the spec can be deferred with the `api_spec_build` option to reduce startup time.
 
     If you are using TornOpen on an existing Tornado application, you can simply replace the Tornado's Application class with TornOpen's Application class.
     TornOpen's Application is able to work with Tornado's RequestHandler.
@@ -20,6 +49,21 @@ class Application(BaseApplication):
         openapi_yaml_route: str = "/openapi.yaml",
         openapi_json_route: str = "/openapi.json",
         redoc_route: str = "/redoc",
+        json_codec: JSONCodec = DEFAULT_JSON_CODEC,
+        api_spec_build: str = "eager",
+        api_spec_cache_dir: Optional[str] = None,
+        api_spec_artifact: Optional[str] = None,
+        server_timing: bool = False,
+        request_timing_hooks: Sequence[TimingHook] = (),
+        metrics_route: Optional[str] = None,
+        metrics_workers: int = 1,
+        batch_route: Optional[str] = None,
+        batch_concurrency: int = 10,
+        batch_max_requests: int = 50,
+        tag_concurrency_limits: Optional[Dict[str, ConcurrencyLimit]] = None,
+        concurrency_limits_route: Optional[str] = None,
+        sync_method_executor: Optional[ExecutorPool] = None,
+        trie_routing: bool = False,
         **settings,
     ):
         """
@@ -28,24 +72,195 @@ class Application(BaseApplication):
             openapi_yaml_route: Route for openapi.yaml
             openapi_json_route: Route for openapi.json
             redoc_route: Route for redoc
+            json_codec: Codec used to encode and decode request bodies, responses, errors and the OpenAPI spec.
+                Use `torn_open.json_codecs.OrjsonCodec` or `torn_open.json_codecs.UjsonCodec` for faster JSON handling
+            api_spec_build: When to generate the OpenAPI spec. Handlers are always ready to serve requests on initialization.
+                - `eager`: on initialization
+                - `lazy`: on a background thread, when the spec is first requested or accessed through `api_spec`
+                - `background`: on a background thread, started on initialization
+            api_spec_cache_dir: Directory for persisting exception discovery and model schemas,
+                so that restarts skip the work for source files that did not change
+            api_spec_artifact: Directory written by `python -m torn_open build`. Handlers are loaded from the artifact
+                instead of being introspected, and the spec routes serve the prebuilt spec.
+                The spec is only generated if it is accessed through `api_spec`
+            server_timing: Add a `Server-Timing` header with the duration of each phase of requests to AnnotatedHandlers
+            request_timing_hooks: Callables that are called with the handler and its `torn_open.timing.RequestTimings`
+                when a request to an AnnotatedHandler is handled. Phases are not timed if `server_timing` is disabled
+                and there are no hooks
+            metrics_route: Route for request metrics of AnnotatedHandlers in the Prometheus text format, e.g. `/metrics`.
+                Metrics are not recorded if no route is given
+            metrics_workers: Number of processes that are forked after the application is created, e.g. with
+                `tornado.process.fork_processes`. Metrics of all the processes are served by each of them
+            batch_route: Route for running several requests to AnnotatedHandlers in one call, e.g. `/batch`.
+                The route is described in the OpenAPI spec
+            batch_concurrency: Maximum number of requests of a batch that are handled concurrently
+            batch_max_requests: Maximum number of requests in a batch
+            tag_concurrency_limits: Concurrency limits by tag, shared by the methods tagged with `tags`.
+                Methods limited with `limit_concurrency`, `adaptive_concurrency` or the `concurrency_limit` attribute
+                of their handler keep their own limit
+            concurrency_limits_route: Route for the current concurrency limits of AnnotatedHandlers, e.g. `/limits`
+            sync_method_executor: Pool that synchronous methods of AnnotatedHandlers run in, e.g.
+                `torn_open.executors.default_thread_pool`, instead of the IOLoop. Methods decorated with
+                `run_in_executor` run in their own pool
+            trie_routing: Find the handler of a request among the rules whose pattern starts with a prefix of its path,
+                looked up in a trie of path segments, instead of trying every rule in order. The first matching rule
+                still handles the request. Speeds up routing in applications with many rules
             **settings: [Settings](https://www.tornadoweb.org/en/stable/web.html#tornado.web.Application.settings) for Tornado's Application
         """
-        super().__init__(rules, **settings)
-        self.api_spec = create_api_spec(rules)
+        if api_spec_build not in API_SPEC_BUILD_MODES:
+            raise ValueError(
+                f"api_spec_build must be one of {', '.join(API_SPEC_BUILD_MODES)}"
+            )
+        request_timing = (
+            RequestTiming(server_timing, request_timing_hooks)
+            if server_timing or request_timing_hooks
+            else None
+        )
+        if batch_route:
+            if batch_concurrency < 1:
+                raise ValueError("batch_concurrency must be at least 1")
+            batch_options = {
+                "concurrency": batch_concurrency,
+                "max_requests": batch_max_requests,
+            }
+            rules = list(rules) + [url(batch_route, BatchHandler, batch_options)]
+        super().__init__(
+            rules, json_codec=json_codec, request_timing=request_timing, **settings
+        )
+        if trie_routing:
+            # The rules of the wildcard router include the static file handlers added by Tornado
+            self.wildcard_router = TrieRouter(self, self.wildcard_router.rules)
+            self.default_router.rules[-1].target = self.wildcard_router
+        self._artifact = Artifact(api_spec_artifact) if api_spec_artifact else None
+        if self._artifact:
+            self._annotated_handlers = self._artifact.load_handlers(rules)
+        else:
+            self._annotated_handlers = register_handlers(rules)
+        if sync_method_executor is not None:
+            for _, handler in self._annotated_handlers:
+                handler.handler_class_params.set_sync_method_executor(
+                    sync_method_executor
+                )
+        if tag_concurrency_limits:
+            for _, handler in self._annotated_handlers:
+                handler.handler_class_params.set_tag_concurrency_limits(
+                    tag_concurrency_limits
+                )
+        self._api_spec_cache_dir = api_spec_cache_dir
+        self._api_spec_future: Optional[Future] = None
+        if self._artifact is None:
+            self._build_api_spec_on_init(api_spec_build)
+        self._metrics = None
+        if metrics_route:
+            # Imported on use, as finding error types parses the handlers' source
+            from torn_open.metrics import Metrics
+
+            self._metrics = Metrics(
+                self._annotated_handlers, metrics_workers, self._executor_pools()
+            )
         self._add_torn_open_handlers(
             openapi_json_route, openapi_yaml_route, redoc_route
         )
+        if self._metrics:
+            self.add_handlers(
+                r".*",
+                [url(metrics_route, MetricsHandler, {"metrics": self._metrics})],
+            )
+        if concurrency_limits_route:
+            operations = self._concurrency_limit_operations()
+            self.add_handlers(
+                r".*",
+                [
+                    url(
+                        concurrency_limits_route,
+                        ConcurrencyLimitsHandler,
+                        {"operations": operations},
+                    )
+                ],
+            )
+
+    def _executor_pools(self) -> List[ExecutorPool]:
+        executor_pools = []
+        for _, handler in self._annotated_handlers:
+            for executor_pool in handler.handler_class_params.executor_pools.values():
+                if executor_pool is not None and executor_pool not in executor_pools:
+                    executor_pools.append(executor_pool)
+        return executor_pools
+
+    def _concurrency_limit_operations(self) -> List[Tuple[str, str, ConcurrencyLimit]]:
+        operations = []
+        for matcher, handler in self._annotated_handlers:
+            path = get_path(url(matcher, handler))
+            concurrency_limits = handler.handler_class_params.concurrency_limits
+            for method_name, concurrency_limit in concurrency_limits.items():
+                if concurrency_limit is not None:
+                    operations.append((path, method_name, concurrency_limit))
+        return operations
+
+    def log_request(self, handler):
+        super().log_request(handler)
+        if self._metrics is not None:
+            self._metrics.observe(handler)
+
+    def _build_api_spec_on_init(self, api_spec_build: str):
+        if api_spec_build == "eager":
+            self._api_spec_future = Future()
+            self._api_spec_future.set_result(self._build_api_spec())
+        elif api_spec_build == "background":
+            self.api_spec_future()
+
+    def _build_api_spec(self) -> "TornOpenAPISpec":
+        return api_spec_module.build_api_spec(
+            self._annotated_handlers, self._api_spec_cache_dir
+        )
+
+    def api_spec_future(self) -> Future:
+        """
+        Returns a future that resolves to the OpenAPI spec, starting the build if it has not started
+        """
+        if self._api_spec_future is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._api_spec_future = executor.submit(self._build_api_spec)
+            executor.shutdown(wait=False)
+        return self._api_spec_future
+
+    @property
+    def api_spec(self) -> "TornOpenAPISpec":
+        """
+        The OpenAPI spec. Blocks until the spec is built
+        """
+        return self.api_spec_future().result()
+
+    def _serialize_json_spec(self) -> bytes:
+        return self.settings["json_codec"].dumps(self.api_spec.to_dict())
+
+    def _serialize_yaml_spec(self) -> bytes:
+        return self.api_spec.to_yaml().encode("utf-8")
 
     def _add_torn_open_handlers(self, json_route, yaml_route, redoc_route):
+        if self._artifact:
+            serialize_json_spec = self._artifact.serialize_json_spec
+            serialize_yaml_spec = self._artifact.serialize_yaml_spec
+            api_spec_future = _completed_future
+        else:
+            serialize_json_spec = self._serialize_json_spec
+            serialize_yaml_spec = self._serialize_yaml_spec
+            api_spec_future = self.api_spec_future
+        json_spec = SpecDocument(
+            serialize_json_spec,
+            self.settings["json_codec"].content_type,
+            api_spec_future,
+        )
+        yaml_spec = SpecDocument(
+            serialize_yaml_spec,
+            "application/yaml; charset=UTF-8",
+            api_spec_future,
+        )
         self.add_handlers(
             r".*",
             [
-                url(
-                    json_route, OpenAPISpecHandler, {"get_spec": self.api_spec.to_dict}
-                ),
-                url(
-                    yaml_route, OpenAPISpecHandler, {"get_spec": self.api_spec.to_yaml}
-                ),
+                url(json_route, OpenAPISpecHandler, {"spec_document": json_spec}),
+                url(yaml_route, OpenAPISpecHandler, {"spec_document": yaml_spec}),
                 url(redoc_route, RedocHandler, {"openapi_route": json_route}),
             ],
         )